@@ -1,108 +1,941 @@
 """ETL Pipeline Module."""
 
 import logging
+from pathlib import Path
 from typing import Any
 
-from .extract import DataExtractor, extract_from_source
-from .load import DataLoader, create_data_summary, save_to_destination
-from .transform import DataTransformer, apply_business_rules, normalise_column_names
+import pandas as pd
+
+from .cache import DEFAULT_CACHE_BYTES, FrameCache
+from .checkpoint import CHECKPOINT_PHASES, CheckpointStore
+from .database import SQLitePool
+from .dedup import DEFAULT_DEDUP_BYTES, RowDeduplicator
+from .extract import (
+    DataExtractor,
+    extract_chunks_from_source,
+    extract_from_source,
+    extract_increment_from_source,
+)
+from .load import (
+    DataLoader,
+    MultiWriter,
+    StreamingWriter,
+    create_data_summary,
+    save_data_summary,
+    save_to_destination,
+    save_to_destinations,
+)
+from .metrics import MetricsRecorder, write_metrics
+from .pipelined import run_pipelined
+from .plan import TransformPlan
+from .rules import RuleRegistry, default_rules
+from .stats import FillStatistics, QuantileSketch, SummaryStatistics, fill_values_from_chunks
+from .transform import (
+    DataTransformer,
+    apply_business_rules,
+    compile_filters,
+    has_missing,
+    normalise_column_names,
+)
+from .watermark import WatermarkStore
 
 logger = logging.getLogger(__name__)
 
 
 class ETLPipeline:
-    """Main ETL Pipeline class that orchestrates the entire process."""
+    """Main ETL Pipeline class that orchestrates the entire process.
+
+    Args:
+        cache_dir: Optional directory for caching parsed source files, so that
+            repeated runs against an unchanged source skip CSV parsing
+        cache_max_bytes: Size limit for the cache directory
+        engine: CSV parser used for extraction (c, pyarrow, python)
+        memory_map: Memory-map uncompressed source files while parsing
+        rules: Business rules for the transform phase, as a RuleRegistry or
+            the path of a JSON rules file. Defaults to rules.default_rules.
+    """
 
-    def __init__(self) -> None:
-        self.extractor = DataExtractor()
+    def __init__(
+        self,
+        cache_dir: str | None = None,
+        cache_max_bytes: int = DEFAULT_CACHE_BYTES,
+        engine: str = "c",
+        memory_map: bool = False,
+        rules: RuleRegistry | str | None = None,
+    ) -> None:
+        self.extractor = DataExtractor(cache_dir, cache_max_bytes, engine, memory_map)
         self.transformer = DataTransformer()
+        if isinstance(rules, str):
+            rules = RuleRegistry.from_config(rules)
+        self.rules = rules or default_rules()
         self.loader = DataLoader()
+        self.metrics = MetricsRecorder()
+        self.checkpoints: CheckpointStore | None = None
         self.pipeline_summary: dict[str, Any] = {}
 
     def run_pipeline(
         self,
-        source_path: str,
+        source_path: str | list[str],
         output_path: str,
         source_type: str = "csv",
         output_format: str = "csv",
         apply_transforms: bool = True,
         filters: dict[str, Any] | None = None,
+        *,
+        chunk_size: int | None = None,
+        schema: dict[str, str] | None = None,
+        columns: list[str] | None = None,
+        max_workers: int | None = None,
+        fill_workers: int | None = None,
+        incremental: bool = False,
+        watermark_path: str | None = None,
+        pushdown: bool = False,
+        optimise: bool = False,
+        global_fill: bool = False,
+        dedup_keys: list[str] | None = None,
+        dedup_memory: int = DEFAULT_DEDUP_BYTES,
+        parquet_options: dict[str, Any] | None = None,
+        outputs: list[dict[str, Any]] | None = None,
+        metrics_path: str | None = None,
+        trace_memory: bool = False,
+        checkpoint_dir: str | None = None,
+        pipelined: bool = False,
     ) -> bool:
         """Run the complete ETL pipeline.
 
         Args:
-            source_path: Path to source data
+            source_path: Path to source data, a glob pattern, or a list of
+                either. Multiple files are combined with a source_file column.
             output_path: Path for output data
-            source_type: Type of source (csv, xlsx, json)
-            output_format: Output format (csv, parquet, json)
+            source_type: Type of source (csv, parquet)
+            output_format: Output format (csv, parquet, json, jsonl)
             apply_transforms: Whether to apply transformations
             filters: Optional filters to apply
+            chunk_size: If given, stream the source through the pipeline in
+                chunks of this many rows instead of loading it all at once.
+                Duplicates are removed across every chunk and file with a
+                RowDeduplicator; missing-value filling operates within each
+                chunk unless global_fill is set.
+            schema: Optional mapping of source column name to dtype, applied
+                while reading (e.g. {"region": "category", "date": "datetime"})
+            columns: Optional source columns to keep. Columns needed by the
+                business rules and filters are read as well; everything else
+                is skipped while parsing.
+            max_workers: Maximum number of source files read in parallel
+            fill_workers: Threads used to fill missing values in frames
+                with more than FILL_BLOCK_COLUMNS incomplete columns (see
+                DataTransformer). By default they are filled on one thread.
+            incremental: Treat the source as an append-only file and only
+                process rows added since the previous run, appending them to
+                the existing CSV or JSON Lines output. Duplicate removal and missing-value
+                filling then operate within each batch of new rows.
+            watermark_path: JSON file recording how far the source has been
+                processed, defaults to the output path plus ".watermark.json"
+            pushdown: Drop rows that cannot pass the filters or the business
+                rules while extracting, before cleaning. Parquet sources skip
+                whole row groups using their statistics. Files, or chunks
+                with chunk_size, that have missing values are read whole,
+                since values are filled from every row. Ignored with
+                dedup_keys.
+            optimise: Run the transform phase as an optimised TransformPlan,
+                filtering rows before duplicate removal and filling. As with
+                pushdown, filters stay after filling when the data has
+                missing values, and after duplicate removal with dedup_keys.
+                The optimised plan is recorded in the summary. Lookups and
+                expression filters have no plan step, so with them the
+                business rules are applied in turn instead.
+            global_fill: With chunk_size, first pass over the whole source to
+                compute the median and mode used for filling, then fill
+                every chunk with them. See stats.FillStatistics for the
+                accuracy of the median on columns with many distinct values.
+            dedup_keys: Columns, after normalisation, that identify a row for
+                duplicate removal (e.g. ["product_id", "customer_id", "date"]).
+                By default whole rows are compared.
+            dedup_memory: Bytes of row hashes kept in memory when removing
+                duplicates across chunks before they are spilled to disk
+            parquet_options: Arguments for DataLoader.load_to_parquet when the
+                output format is parquet, e.g. {"partition_cols": ["year",
+                "month", "region"], "row_group_size": 100_000,
+                "compression": "zstd"}. With partition_cols the output path
+                is a dataset directory, which incremental runs append to.
+            outputs: Further outputs written from the same transformed data,
+                each a dictionary with a path, a format and optional options,
+                e.g. [{"path": "sales.parquet", "format": "parquet"}]. All
+                outputs are written concurrently and the status and time of
+                each is recorded under pipeline_summary["load"]["outputs"].
+                Not supported with incremental.
+            metrics_path: File to write the run's metrics to, as Prometheus
+                text if it ends in .prom (e.g. for a node exporter textfile
+                collector) and as JSON otherwise. The metrics are always
+                recorded under pipeline_summary["metrics"].
+            trace_memory: Also record the peak memory Python allocates in
+                each phase with tracemalloc, which slows the run down
+            checkpoint_dir: Directory to save the extracted and transformed
+                frames in as each phase completes. A rerun with the same
+                source contents and configuration resumes after the last
+                completed phase, e.g. only retrying the load after a full
+                disk. Checkpoints are removed once the run succeeds, and
+                those of earlier configurations of the same output are
+                removed as stale. Not supported with chunk_size or
+                incremental.
+            pipelined: With chunk_size, read, transform and write chunks on
+                separate threads linked by bounded queues, so that reading
+                one chunk, transforming the one before and writing the one
+                before that overlap (see pipelined.run_pipelined). This needs
+                more than one core to pay off. Phase times in the metrics
+                then overlap as well.
 
         Returns:
             True if pipeline completed successfully, False otherwise
         """
+        self.transformer.fill_values = None
+        # The date format is guessed from the first chunk of each run
+        self.transformer.date_format = None
+        self.transformer.max_workers = fill_workers
+        self.transformer.step_timings = {}
+        self.rules.timings.clear()
+        self.metrics = MetricsRecorder(trace_memory)
+        self.checkpoints = CheckpointStore(checkpoint_dir) if checkpoint_dir else None
+        # Streamed runs remove duplicates across chunks and files; other runs
+        # only use the hash-based engine when duplicates are defined by keys
+        self.transformer.deduplicator = (
+            RowDeduplicator(dedup_keys, dedup_memory)
+            if apply_transforms and (dedup_keys or (chunk_size is not None and not incremental))
+            else None
+        )
+        read_columns = self._columns_to_read(columns, filters, apply_transforms, dedup_keys)
+        targets = _output_targets(output_path, output_format, parquet_options, outputs)
+        # Dropping rows before duplicates are removed by key would change
+        # which row of each key is kept
+        if pushdown and dedup_keys:
+            logger.warning("Predicates are not pushed down when duplicates are removed by key")
+        predicates = (
+            self._pushdown_predicates(filters)
+            if pushdown and apply_transforms and not dedup_keys
+            else None
+        )
+        if optimise and not self.rules.plannable():
+            logger.warning("Business rules cannot run in an optimised plan, applying them in turn")
+            optimise = False
+
         try:
-            logger.info("Starting ETL pipeline")
+            with self.metrics:
+                if incremental and outputs:
+                    msg = "Incremental runs write a single output"
+                    logger.error(msg)
+                    self.pipeline_summary["error"] = msg
+                    return False
+                if pipelined and (incremental or chunk_size is None):
+                    msg = "Pipelined runs need chunk_size and cannot be incremental"
+                    logger.error(msg)
+                    self.pipeline_summary["error"] = msg
+                    return False
+                if checkpoint_dir and (incremental or chunk_size is not None):
+                    msg = "Checkpoints are only saved by runs without chunk_size or incremental"
+                    logger.error(msg)
+                    self.pipeline_summary["error"] = msg
+                    return False
+                if incremental:
+                    return self._run_incremental(
+                        source_path,
+                        output_path,
+                        source_type=source_type,
+                        output_format=output_format,
+                        apply_transforms=apply_transforms,
+                        filters=filters,
+                        schema=schema,
+                        columns=read_columns,
+                        predicates=predicates,
+                        watermark_path=watermark_path or f"{output_path}.watermark.json",
+                        parquet_options=parquet_options,
+                        optimise=optimise,
+                    )
 
-            # Extract
-            logger.info("Phase 1: Extract")
-            df = extract_from_source(source_path, source_type)
-            self.pipeline_summary["extract"] = {
-                "source_path": source_path,
-                "rows_extracted": len(df),
-                "columns_extracted": len(df.columns),
-            }
+                if chunk_size is not None:
+                    return self._run_streaming(
+                        source_path,
+                        output_path,
+                        source_type=source_type,
+                        apply_transforms=apply_transforms,
+                        filters=filters,
+                        chunk_size=chunk_size,
+                        schema=schema,
+                        columns=read_columns,
+                        predicates=predicates,
+                        outputs=targets,
+                        optimise=optimise,
+                        global_fill=global_fill and apply_transforms,
+                        pipelined=pipelined,
+                    )
 
-            # Transform
-            logger.info("Phase 2: Transform")
-            if apply_transforms:
-                # Normalise column names
-                df = normalise_column_names(df)
+                return self._run_full(
+                    source_path,
+                    output_path,
+                    source_type=source_type,
+                    output_format=output_format,
+                    apply_transforms=apply_transforms,
+                    filters=filters,
+                    schema=schema,
+                    columns=read_columns,
+                    predicates=predicates,
+                    max_workers=max_workers,
+                    outputs=targets,
+                    optimise=optimise,
+                )
+        finally:
+            if self.transformer.deduplicator is not None:
+                self.transformer.deduplicator.close()
+            self._record_metrics(metrics_path)
 
-                # Apply business rules
-                df = apply_business_rules(df)
+    def _run_full(
+        self,
+        source_path: str | list[str],
+        output_path: str,
+        *,
+        source_type: str,
+        output_format: str,
+        apply_transforms: bool,
+        filters: dict[str, Any] | None,
+        schema: dict[str, str] | None,
+        columns: list[str] | None,
+        predicates: list[dict[str, Any]] | None,
+        max_workers: int | None,
+        outputs: list[dict[str, Any]],
+        optimise: bool = False,
+    ) -> bool:
+        """Run the pipeline with the whole source loaded into memory at once.
 
-                # Apply additional filters if provided
-                if filters:
-                    df = self.transformer.filter_data(df, filters)
+        Args:
+            source_path: Path to source data, a glob pattern, or a list of either
+            output_path: Path for output data
+            source_type: Type of source (csv, parquet)
+            output_format: Output format (csv, parquet, json, jsonl)
+            apply_transforms: Whether to apply transformations
+            filters: Optional filters to apply
+            schema: Optional mapping of source column name to dtype
+            columns: Optional source columns to read
+            predicates: Optional predicates applied while extracting
+            max_workers: Maximum number of source files read in parallel
+            outputs: Output specifications, the first for output_path,
+                written concurrently
+            optimise: Run the transform phase as an optimised TransformPlan
 
-                self.pipeline_summary["transform"] = {
-                    "transformations_applied": self.transformer.get_transformation_summary(),
-                    "final_rows": len(df),
-                    "final_columns": len(df.columns),
-                }
+        Returns:
+            True if pipeline completed successfully, False otherwise
+        """
+        try:
+            logger.info("Starting ETL pipeline")
+            checkpoint_key = None
+            if self.checkpoints is not None:
+                checkpoint_key = self._checkpoint_key(
+                    source_path,
+                    source_type=source_type,
+                    apply_transforms=apply_transforms,
+                    filters=filters,
+                    schema=schema,
+                    columns=columns,
+                    predicates=predicates,
+                    optimise=optimise,
+                )
+                self.checkpoints.collect_garbage(output_path, keep=checkpoint_key)
+            resumed = self._resume(checkpoint_key)
+            completed = resumed[0] if resumed is not None else None
+
+            if resumed is not None:
+                df = resumed[1]
             else:
-                self.pipeline_summary["transform"] = {
-                    "transformations_applied": ["None - transformations skipped"]
+                # Extract
+                logger.info("Phase 1: Extract")
+                with self.metrics.phase("extract") as phase:
+                    df = extract_from_source(
+                        source_path,
+                        source_type,
+                        schema,
+                        columns,
+                        predicates=predicates,
+                        max_workers=max_workers,
+                        extractor=self.extractor,
+                    )
+                    phase["rows"] += len(df)
+                self.pipeline_summary["extract"] = {
+                    "source_path": source_path,
+                    "rows_extracted": len(df),
+                    "columns_extracted": len(df.columns),
                 }
+                if predicates:
+                    self.pipeline_summary["extract"]["pushdown_predicates"] = len(predicates)
+                if self.extractor.cache is not None:
+                    self.pipeline_summary["extract"]["cache_hits"] = self.extractor.cache.hits
+                self._save_checkpoint(checkpoint_key, "extract", df, output_path)
+
+            if completed != "transform":
+                # Transform
+                logger.info("Phase 2: Transform")
+                if apply_transforms:
+                    with self.metrics.phase("transform", len(df)):
+                        df = self._transform(df, filters, optimise=optimise)
+                self._record_transform(apply_transforms, len(df), len(df.columns))
+                self._save_checkpoint(checkpoint_key, "transform", df, output_path)
 
             # Load
             logger.info("Phase 3: Load")
-            success = save_to_destination(df, output_path, output_format)
+            success = self._load_full(df, output_path, output_format, outputs)
+            if success and self.checkpoints is not None and checkpoint_key is not None:
+                self.checkpoints.discard(checkpoint_key)
+            return success
+
+        except Exception as e:
+            logger.exception("ETL pipeline failed")
+            self.pipeline_summary["error"] = str(e)
+            return False
+
+    def run_prepared(
+        self,
+        df: pd.DataFrame,
+        output_path: str,
+        output_format: str = "csv",
+        filters: dict[str, Any] | None = None,
+        *,
+        parquet_options: dict[str, Any] | None = None,
+        outputs: list[dict[str, Any]] | None = None,
+        metrics_path: str | None = None,
+    ) -> bool:
+        """Apply the business rules and filters to cleaned data and load it.
+
+        This is the second half of run_pipeline, for data extracted and
+        cleaned once on behalf of several pipelines, as the batch runner does
+        for jobs reading the same source. Duplicate removal and filling are
+        skipped; everything else matches run_pipeline without chunk_size.
+
+        Args:
+            df: Extracted DataFrame with normalised column names, duplicates
+                removed and missing values filled. It is left unchanged.
+            output_path: Path for output data
+            output_format: Output format (csv, parquet, json, jsonl, sqlite)
+            filters: Optional filters to apply
+            parquet_options: Arguments for DataLoader.load_to_parquet
+            outputs: Further outputs written from the same transformed data
+            metrics_path: File to write the run's metrics to
+
+        Returns:
+            True if pipeline completed successfully, False otherwise
+        """
+        self.transformer.fill_values = None
+        # The date format is guessed from the first chunk of each run
+        self.transformer.date_format = None
+        self.transformer.deduplicator = None
+        self.transformer.step_timings = {}
+        self.rules.timings.clear()
+        self.metrics = MetricsRecorder()
+        targets = _output_targets(output_path, output_format, parquet_options, outputs)
+
+        try:
+            with self.metrics:
+                with self.metrics.phase("transform", len(df)):
+                    df = self._transform(df, filters, cleaned=True)
+                self._record_transform(True, len(df), len(df.columns))
+                return self._load_full(df, output_path, output_format, targets)
+        except Exception as e:
+            logger.exception("ETL pipeline failed")
+            self.pipeline_summary["error"] = str(e)
+            return False
+        finally:
+            self._record_metrics(metrics_path)
+
+    def _checkpoint_key(self, source_path: str | list[str], **config: Any) -> str:
+        """Build the checkpoint key of a run from its source and configuration.
+
+        Args:
+            source_path: Path to source data, a glob pattern, or a list of either
+            **config: Arguments of the run that change the extracted or
+                transformed frames
 
-            if success:
-                # Create data summary
-                summary_path = output_path.replace(f".{output_format}", "_summary.json")
+        Returns:
+            Key from CheckpointStore.make_key
+        """
+        if self.checkpoints is None:
+            msg = "Checkpoints are not enabled for this run"
+            raise ValueError(msg)
+        deduplicator = self.transformer.deduplicator
+        key = self.checkpoints.make_key(
+            source_path,
+            **config,
+            rules=self.rules.rules,
+            dedup_keys=deduplicator.key_columns if deduplicator is not None else None,
+            engine=self.extractor.engine,
+        )
+        self.pipeline_summary["checkpoint"] = {"key": key, "resumed_from": None}
+        return key
+
+    def _resume(self, key: str | None) -> tuple[str, pd.DataFrame] | None:
+        """Load the last checkpoint of a run and restore its pipeline summary.
+
+        Args:
+            key: Checkpoint key of the run, or None without checkpoints
+
+        Returns:
+            Tuple of the last completed phase and its frame, or None to start
+            from extract
+        """
+        if self.checkpoints is None or key is None:
+            return None
+        checkpoint = self.checkpoints.latest(key)
+        if checkpoint is None:
+            return None
+        phase, df, summary = checkpoint
+        self.pipeline_summary.update(summary)
+        self.pipeline_summary["checkpoint"]["resumed_from"] = phase
+        return phase, df
+
+    def _save_checkpoint(
+        self, key: str | None, phase: str, df: pd.DataFrame, output_path: str
+    ) -> None:
+        """Save the frame a phase produced, if the run keeps checkpoints."""
+        if self.checkpoints is None or key is None:
+            return
+        # The summaries of this phase and the ones before it
+        completed = CHECKPOINT_PHASES[: CHECKPOINT_PHASES.index(phase) + 1]
+        summary = {name: self.pipeline_summary[name] for name in completed}
+        with self.metrics.phase("checkpoint", len(df)):
+            self.checkpoints.save(key, phase, df, summary, output_path)
+
+    def _load_full(
+        self,
+        df: pd.DataFrame,
+        output_path: str,
+        output_format: str,
+        outputs: list[dict[str, Any]],
+    ) -> bool:
+        """Write a transformed DataFrame to every output and summarise it.
+
+        Args:
+            df: Transformed DataFrame
+            output_path: Path of the main output
+            output_format: Format of the main output
+            outputs: Output specifications, the first for output_path,
+                written concurrently
+
+        Returns:
+            True if every output was written, False otherwise
+        """
+        with self.metrics.phase("load", len(df)):
+            results = save_to_destinations(df, outputs)
+
+        if all(result["status"] == "success" for result in results.values()):
+            # Create data summary
+            summary_path = _summary_path(output_path, output_format)
+            with self.metrics.phase("summary", len(df)):
                 create_data_summary(df, summary_path)
 
-                self.pipeline_summary["load"] = {
-                    "output_path": output_path,
-                    "summary_path": summary_path,
-                    "final_rows": len(df),
-                    "status": "success",
-                }
+            self.pipeline_summary["load"] = {
+                "output_path": output_path,
+                "summary_path": summary_path,
+                "final_rows": len(df),
+                "status": "success",
+                "outputs": results,
+            }
+
+            logger.info("ETL pipeline completed successfully")
+            return True
+        self.pipeline_summary["load"] = {"status": "failed", "outputs": results}
+        logger.error("ETL pipeline failed during load phase")
+        return False
 
-                logger.info("ETL pipeline completed successfully")
-                return True
-            self.pipeline_summary["load"] = {"status": "failed"}
-            logger.error("ETL pipeline failed during load phase")
+    def _columns_to_read(
+        self,
+        columns: list[str] | None,
+        filters: dict[str, Any] | None,
+        apply_transforms: bool,
+        dedup_keys: list[str] | None = None,
+    ) -> list[str] | None:
+        """Work out which source columns the pipeline needs to read.
+
+        Args:
+            columns: Columns requested by the caller, or None for all
+            filters: Optional filters to apply
+            apply_transforms: Whether transformations will be applied
+            dedup_keys: Optional columns identifying a row for duplicate removal
+
+        Returns:
+            List of column names to read, or None to read every column
+        """
+        if columns is None:
+            return None
+        if not apply_transforms:
+            return list(columns)
+        required = [
+            *columns,
+            *self.rules.input_columns(),
+            *(filters or {}),
+            *(dedup_keys or []),
+        ]
+        return list(dict.fromkeys(required))
+
+    def _pushdown_predicates(self, filters: dict[str, Any] | None) -> list[dict[str, Any]]:
+        """Collect the predicates that can be checked while extracting.
+
+        Args:
+            filters: Optional filters to apply
+
+        Returns:
+            Predicates from the business rules and filters, leaving out those
+            on columns whose raw values are converted during transformation
+        """
+        written = set(self.rules.output_columns())
+        predicates = self.rules.pushdown_predicates() + compile_filters(filters or {})
+        return [p for p in predicates if p["column"] not in written]
+
+    def _transform(
+        self,
+        df: pd.DataFrame,
+        filters: dict[str, Any] | None,
+        *,
+        optimise: bool = False,
+        cleaned: bool = False,
+    ) -> pd.DataFrame:
+        """Apply the transform phase to a DataFrame or a single chunk of one.
+
+        Args:
+            df: Extracted DataFrame
+            filters: Optional filters to apply
+            optimise: Run the business rules and filters as one optimised plan
+            cleaned: Duplicates were already removed and missing values
+                filled, so only the business rules and filters are applied
+
+        Returns:
+            Transformed DataFrame
+        """
+        # Normalise column names
+        df = normalise_column_names(df)
+
+        if optimise:
+            plan = self.transformer.lazy() if cleaned else self.transformer.lazy().clean()
+            plan = self.rules.to_plan(plan).filter(filters or {})
+            self.transformer.transformation_log.append(
+                "Optimised plan: " + " -> ".join(plan.describe(df.columns, missing=has_missing(df)))
+            )
+            return plan.execute(df)
+
+        # Apply business rules, with any fill values from a first pass, the
+        # duplicates seen in earlier chunks and the date format they used
+        rules_transformer = DataTransformer(
+            date_format=self.transformer.date_format,
+            max_workers=self.transformer.max_workers,
+            fill_values=self.transformer.fill_values,
+            deduplicator=self.transformer.deduplicator,
+        )
+        rules_transformer.step_timings = self.transformer.step_timings
+        if cleaned:
+            df = self.rules.apply(df, rules_transformer)
+        else:
+            df = apply_business_rules(df, rules_transformer, self.rules)
+        self.transformer.date_format = rules_transformer.date_format
+
+        # Apply additional filters if provided
+        if filters:
+            df = self.transformer.filter_data(df, filters)
+
+        return df
+
+    def _run_streaming(
+        self,
+        source_path: str | list[str],
+        output_path: str,
+        *,
+        source_type: str,
+        apply_transforms: bool,
+        filters: dict[str, Any] | None,
+        chunk_size: int,
+        schema: dict[str, str] | None,
+        columns: list[str] | None,
+        predicates: list[dict[str, Any]] | None,
+        outputs: list[dict[str, Any]],
+        optimise: bool = False,
+        global_fill: bool = False,
+        pipelined: bool = False,
+    ) -> bool:
+        """Run the pipeline one chunk at a time, keeping memory use bounded.
+
+        Args:
+            source_path: Path to source data, a glob pattern, or a list of either
+            output_path: Path for output data
+            source_type: Type of source (csv)
+            apply_transforms: Whether to apply transformations
+            filters: Optional filters to apply
+            chunk_size: Number of rows per chunk
+            schema: Optional mapping of source column name to dtype
+            columns: Optional source columns to read
+            predicates: Optional predicates applied while extracting
+            outputs: Output specifications, the first for output_path,
+                written concurrently
+            optimise: Transform each chunk with an optimised TransformPlan
+            global_fill: Compute fill values over the whole source in a first
+                pass and fill every chunk with them
+            pipelined: Read, transform and write chunks concurrently
+
+        Returns:
+            True if pipeline completed successfully, False otherwise
+        """
+        try:
+            logger.info("Starting streaming ETL pipeline with chunks of %d rows", chunk_size)
+            if global_fill:
+                first_pass = extract_chunks_from_source(
+                    source_path,
+                    source_type,
+                    chunk_size,
+                    schema,
+                    columns,
+                    extractor=self.extractor,
+                )
+                # The statistics see every row left once duplicates are removed,
+                # as the fill does, through a deduplicator of their own. No
+                # rows are pushed down, since filling happens before filtering.
+                deduplicator = self.transformer.deduplicator or RowDeduplicator()
+                with (
+                    self.metrics.phase("fill_statistics"),
+                    RowDeduplicator(
+                        deduplicator.key_columns, deduplicator.memory_budget
+                    ) as first_pass_deduplicator,
+                ):
+                    self.transformer.fill_values = fill_values_from_chunks(
+                        first_pass_deduplicator.drop_duplicates(normalise_column_names(chunk))
+                        for chunk in first_pass
+                    )
+                self.transformer.transformation_log.append(
+                    f"Computed fill values for {len(self.transformer.fill_values)} columns "
+                    "over the whole source"
+                )
+
+            chunks = extract_chunks_from_source(
+                source_path,
+                source_type,
+                chunk_size,
+                schema,
+                columns,
+                predicates=predicates,
+                extractor=self.extractor,
+            )
+
+            if not DataLoader().validate_output_path(output_path):
+                logger.error("Invalid output path: %s", output_path)
+                self.pipeline_summary["load"] = {"status": "failed"}
+                return False
+
+            extracted = {"rows": 0, "columns": 0, "chunks": 0}
+            # The data summary is gathered chunk by chunk as it is written
+            statistics = SummaryStatistics()
+
+            def transform(chunk: pd.DataFrame) -> pd.DataFrame:
+                extracted["rows"] += len(chunk)
+                extracted["columns"] = len(chunk.columns)
+                extracted["chunks"] += 1
+                if not apply_transforms:
+                    return chunk
+                with self.metrics.phase("transform", len(chunk)):
+                    return self._transform(chunk, filters, optimise=optimise)
+
+            def load(df: pd.DataFrame) -> None:
+                with self.metrics.phase("load", len(df)):
+                    writer.write(df)
+                with self.metrics.phase("summary", len(df)):
+                    statistics.update(df)
+
+            with MultiWriter(outputs) as writer:
+                timed_chunks = self.metrics.timed_iter(chunks, "extract")
+                if pipelined:
+                    run_pipelined(timed_chunks, [transform], load)
+                else:
+                    for chunk in timed_chunks:
+                        load(transform(chunk))
+
+            self.pipeline_summary["extract"] = {
+                "source_path": source_path,
+                "rows_extracted": extracted["rows"],
+                "columns_extracted": extracted["columns"],
+                "chunks": extracted["chunks"],
+            }
+            if pipelined:
+                self.pipeline_summary["extract"]["pipelined"] = True
+            self._record_transform(apply_transforms, writer.rows_written, len(writer.columns))
+            if not writer.succeeded:
+                self.pipeline_summary["load"] = {"status": "failed", "outputs": writer.results}
+                logger.error("ETL pipeline failed during load phase")
+                return False
+            summary_path = _summary_path(output_path, outputs[0]["format"])
+            save_data_summary(statistics, summary_path)
+            self.pipeline_summary["load"] = {
+                "output_path": output_path,
+                "summary_path": summary_path,
+                "final_rows": writer.rows_written,
+                "status": "success",
+                "outputs": writer.results,
+            }
+
+            logger.info("Streaming ETL pipeline completed successfully")
+            return True
+
+        except Exception as e:
+            logger.exception("ETL pipeline failed")
+            self.pipeline_summary["error"] = str(e)
             return False
 
+    def _run_incremental(
+        self,
+        source_path: str | list[str],
+        output_path: str,
+        *,
+        source_type: str,
+        output_format: str,
+        apply_transforms: bool,
+        filters: dict[str, Any] | None,
+        schema: dict[str, str] | None,
+        columns: list[str] | None,
+        predicates: list[dict[str, Any]] | None,
+        watermark_path: str,
+        optimise: bool = False,
+        parquet_options: dict[str, Any] | None = None,
+    ) -> bool:
+        """Run the pipeline over the rows appended to the source since last run.
+
+        Args:
+            source_path: Path to a single append-only source file
+            output_path: Path for output data
+            source_type: Type of source (csv)
+            output_format: Output format, which must support appending (csv,
+                jsonl, or parquet partitioned with parquet_options)
+            apply_transforms: Whether to apply transformations
+            filters: Optional filters to apply
+            schema: Optional mapping of source column name to dtype
+            columns: Optional source columns to read
+            predicates: Optional predicates applied while extracting
+            watermark_path: JSON file recording the source watermarks
+            optimise: Transform new rows with an optimised TransformPlan
+            parquet_options: Arguments for DataLoader.load_to_parquet
+
+        Returns:
+            True if pipeline completed successfully, False otherwise
+        """
+        try:
+            logger.info("Starting incremental ETL pipeline")
+            # A missing output means there is nothing to append to, so start over
+            store = WatermarkStore(watermark_path)
+            previous = None
+            if isinstance(source_path, str) and Path(output_path).exists():
+                previous = store.get(source_path)
+
+            with self.metrics.phase("extract") as phase:
+                df, watermark = extract_increment_from_source(
+                    source_path,
+                    source_type,
+                    previous,
+                    schema,
+                    columns,
+                    predicates=predicates,
+                    extractor=self.extractor,
+                )
+                phase["rows"] += len(df)
+            self.pipeline_summary["extract"] = {
+                "source_path": source_path,
+                "rows_extracted": len(df),
+                "columns_extracted": len(df.columns),
+                "is_delta": watermark["is_delta"],
+                "watermark_offset": watermark["offset"],
+            }
+
+            if apply_transforms:
+                with self.metrics.phase("transform", len(df)):
+                    df = self._transform(df, filters, optimise=optimise)
+            self._record_transform(apply_transforms, len(df), len(df.columns))
+
+            with (
+                self.metrics.phase("load", len(df)),
+                StreamingWriter(
+                    output_path,
+                    output_format,
+                    append=watermark["is_delta"],
+                    parquet_options=parquet_options,
+                ) as writer,
+            ):
+                writer.write(df)
+
+            # The summary covers the whole output, adding this run's rows to
+            # the statistics of earlier runs
+            summary_path = _summary_path(output_path, output_format)
+            statistics = store.get_summary() if watermark["is_delta"] else None
+            if statistics is None:
+                if watermark["is_delta"]:
+                    logger.warning(
+                        "No summary statistics of earlier runs, %s only covers new rows",
+                        summary_path,
+                    )
+                statistics = SummaryStatistics()
+            with self.metrics.phase("summary", len(df)):
+                statistics.update(df)
+                save_data_summary(statistics, summary_path)
+            store.set_summary(statistics)
+            store.set(watermark["source"], watermark)
+
+            self.pipeline_summary["load"] = {
+                "output_path": output_path,
+                "summary_path": summary_path,
+                "rows_appended": len(df),
+                "total_rows_processed": watermark["rows"],
+                "status": "success",
+            }
+            logger.info("Incremental ETL pipeline completed successfully")
+            return True
+
         except Exception as e:
             logger.exception("ETL pipeline failed")
             self.pipeline_summary["error"] = str(e)
             return False
 
+    def _record_transform(self, apply_transforms: bool, rows: int, columns: int) -> None:
+        """Record the transform phase in the pipeline summary.
+
+        Args:
+            apply_transforms: Whether transformations were applied
+            rows: Number of rows after transformation
+            columns: Number of columns after transformation
+        """
+        if apply_transforms:
+            self.pipeline_summary["transform"] = {
+                "transformations_applied": self.transformer.get_transformation_summary(),
+                "final_rows": rows,
+                "final_columns": columns,
+            }
+            self.pipeline_summary["transform"]["rule_timings"] = {
+                name: round(seconds, 6) for name, seconds in self.rules.timings.items()
+            }
+            if self.transformer.deduplicator is not None:
+                self.pipeline_summary["transform"]["duplicates_removed"] = (
+                    self.transformer.deduplicator.duplicates_removed
+                )
+        else:
+            self.pipeline_summary["transform"] = {
+                "transformations_applied": ["None - transformations skipped"]
+            }
+
+    def _record_metrics(self, metrics_path: str | None) -> None:
+        """Record the run's metrics in the pipeline summary and write them.
+
+        Business rules are reported as steps named rule:<name>. Failing to
+        write the metrics file is logged without failing the run.
+
+        Args:
+            metrics_path: Optional file to write the metrics to
+        """
+        steps = dict(self.transformer.step_timings)
+        for name, seconds in self.rules.timings.items():
+            steps[f"rule:{name}"] = {"wall_seconds": seconds}
+        self.pipeline_summary["metrics"] = self.metrics.summary(steps)
+        if metrics_path is None:
+            return
+        try:
+            write_metrics(self.pipeline_summary["metrics"], metrics_path)
+        except OSError:
+            logger.exception("Could not write metrics to %s", metrics_path)
+
     def get_pipeline_summary(self) -> dict[str, Any]:
         """Get summary of the pipeline execution.
 
@@ -112,9 +945,35 @@ class ETLPipeline:
         return self.pipeline_summary.copy()
 
 
+def _output_targets(
+    output_path: str,
+    output_format: str,
+    parquet_options: dict[str, Any] | None,
+    outputs: list[dict[str, Any]] | None,
+) -> list[dict[str, Any]]:
+    """Output specifications of a run, the main output first."""
+    return [
+        {
+            "path": output_path,
+            "format": output_format,
+            "options": parquet_options if output_format == "parquet" else None,
+        },
+        *(outputs or []),
+    ]
+
+
+def _summary_path(output_path: str, output_format: str) -> str:
+    """Path of the data summary written next to an output file or dataset."""
+    base_path = output_path.removesuffix(".gz")
+    summary_path = base_path.replace(f".{output_format}", "_summary.json")
+    if summary_path == base_path:
+        summary_path = f"{base_path}_summary.json"
+    return summary_path
+
+
 # Convenience function for quick pipeline execution
 def run_etl(
-    source_path: str,
+    source_path: str | list[str],
     output_path: str,
     source_type: str = "csv",
     output_format: str = "csv",
@@ -123,10 +982,10 @@ def run_etl(
     """Convenience function to run ETL pipeline.
 
     Args:
-        source_path: Path to source data
+        source_path: Path to source data, a glob pattern, or a list of either
         output_path: Path for output data
         source_type: Type of source (csv, xlsx, json)
-        output_format: Output format (csv, parquet, json)
+        output_format: Output format (csv, parquet, json, jsonl)
         **kwargs: Additional arguments for pipeline configuration
 
     Returns:
@@ -137,14 +996,30 @@ def run_etl(
 
 
 __all__ = [
+    "CheckpointStore",
     "DataExtractor",
     "DataLoader",
     "DataTransformer",
     "ETLPipeline",
+    "FillStatistics",
+    "FrameCache",
+    "MetricsRecorder",
+    "MultiWriter",
+    "QuantileSketch",
+    "RowDeduplicator",
+    "RuleRegistry",
+    "SQLitePool",
+    "StreamingWriter",
+    "SummaryStatistics",
+    "TransformPlan",
+    "WatermarkStore",
     "apply_business_rules",
     "create_data_summary",
+    "extract_chunks_from_source",
     "extract_from_source",
     "normalise_column_names",
     "run_etl",
+    "run_pipelined",
     "save_to_destination",
+    "save_to_destinations",
 ]
@@ -0,0 +1,440 @@
+"""Run a manifest of ETL jobs on a pool of worker processes.
+
+A manifest is a JSON (or, with PyYAML installed, YAML) file holding a list
+of jobs, or an object with a "jobs" list and optional "defaults" applied to
+every job, "max_workers" and "memory_budget". Each job gives the arguments
+of ETLPipeline and ETLPipeline.run_pipeline, plus an optional name and
+memory_bytes estimate:
+
+    {
+        "defaults": {"source_path": "example_data.csv"},
+        "jobs": [
+            {"name": "all", "output_path": "outputs/all.csv"},
+            {"name": "electronics", "output_path": "outputs/electronics.csv",
+             "filters": {"category": ["Electronics"]}}
+        ]
+    }
+
+Run it from the command line with:
+
+    python -m test_repo_trial_bt.batch manifest.json --report outputs/report.json
+"""
+
+import argparse
+import inspect
+import json
+import logging
+import multiprocessing
+import os
+import time
+from collections.abc import Sequence
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import Any
+
+import pandas as pd
+
+from . import ETLPipeline
+from .dedup import DEFAULT_DEDUP_BYTES, RowDeduplicator
+from .extract import extract_from_source, resolve_source_paths
+from .transform import DataTransformer, normalise_column_names
+
+logger = logging.getLogger(__name__)
+
+# Keys of a job that configure the batch rather than the pipeline
+BATCH_KEYS = ("name", "memory_bytes")
+
+# Estimated bytes of memory a job needs per byte of source file, by source
+# type. Parsed text columns take several times their size on disk, and
+# Parquet is compressed as well.
+MEMORY_PER_SOURCE_BYTE = {"csv": 4, "parquet": 10}
+
+# Jobs only share an extraction when they run the whole source through the
+# standard transform in one piece; any of these keys rules that out. Shared
+# jobs skip extraction, so they would also never save checkpoints.
+UNSHARED_KEYS = ("chunk_size", "incremental", "pushdown", "optimise", "checkpoint_dir")
+
+
+def load_manifest(manifest_path: str) -> dict[str, Any]:
+    """Read a job manifest.
+
+    Args:
+        manifest_path: JSON file, or YAML file if it ends in .yaml or .yml
+
+    Returns:
+        Manifest as a dictionary with a jobs list
+    """
+    with open(Path(manifest_path)) as f:
+        if Path(manifest_path).suffix in (".yaml", ".yml"):
+            import yaml  # noqa: PLC0415
+
+            manifest = yaml.safe_load(f)
+        else:
+            manifest = json.load(f)
+    return {"jobs": manifest} if isinstance(manifest, list) else manifest
+
+
+def build_jobs(manifest: dict[str, Any]) -> list[dict[str, Any]]:
+    """Merge the defaults into each job of a manifest and check the jobs.
+
+    Args:
+        manifest: Manifest with a jobs list and optional defaults
+
+    Returns:
+        One dictionary of arguments per job, each with a unique name
+    """
+    allowed = set(BATCH_KEYS) | _parameters(ETLPipeline) | _parameters(ETLPipeline.run_pipeline)
+    jobs = []
+    for index, spec in enumerate(manifest.get("jobs", [])):
+        job = {**manifest.get("defaults", {}), **spec}
+        job.setdefault("name", f"job-{index + 1}")
+        unknown = sorted(set(job) - allowed)
+        missing = [key for key in ("source_path", "output_path") if key not in job]
+        if unknown or missing:
+            msg = f"Job {job['name']} has unknown keys {unknown} or is missing {missing}"
+            raise ValueError(msg)
+        jobs.append(job)
+
+    for key in ("name", "output_path"):
+        values = [job[key] for job in jobs]
+        duplicates = sorted({value for value in values if values.count(value) > 1})
+        if duplicates:
+            msg = f"Jobs need a unique {key}, repeated: {duplicates}"
+            raise ValueError(msg)
+    return jobs
+
+
+def group_jobs(jobs: list[dict[str, Any]]) -> list[list[dict[str, Any]]]:
+    """Group the jobs that can share one extraction and cleaning step.
+
+    Jobs share when they read the same columns of the same source in the
+    same way and remove duplicates by the same keys. Each job's source
+    columns are worked out as run_pipeline would, so a job's output is the
+    same whether it shares or not.
+
+    Args:
+        jobs: Jobs from build_jobs
+
+    Returns:
+        Groups of jobs in manifest order; jobs that cannot share are alone
+    """
+    groups: dict[str, list[dict[str, Any]]] = {}
+    for job in jobs:
+        key = _sharing_key(job)
+        groups.setdefault(key or f"unshared:{job['name']}", []).append(job)
+    return list(groups.values())
+
+
+def estimate_memory(jobs: list[dict[str, Any]]) -> int:
+    """Estimate the bytes of memory a group of jobs needs while running.
+
+    Jobs may give their own memory_bytes; otherwise the estimate scales the
+    size of the source files by MEMORY_PER_SOURCE_BYTE. A shared group
+    holds one copy of the source plus the output of one job at a time.
+
+    Args:
+        jobs: A group from group_jobs
+
+    Returns:
+        Estimated bytes, 0 when the source files cannot be found
+    """
+    estimates = []
+    for job in jobs:
+        if "memory_bytes" in job:
+            estimates.append(int(job["memory_bytes"]))
+            continue
+        try:
+            paths = resolve_source_paths(job["source_path"])
+        except (FileNotFoundError, ValueError):
+            paths = []
+        factor = MEMORY_PER_SOURCE_BYTE.get(job.get("source_type", "csv"), 4)
+        sizes = [Path(path).stat().st_size for path in paths if Path(path).is_file()]
+        estimates.append(factor * sum(sizes))
+    return max(estimates) * (2 if len(jobs) > 1 else 1)
+
+
+def run_batch(
+    manifest: str | dict[str, Any],
+    *,
+    max_workers: int | None = None,
+    memory_budget: int | None = None,
+    report_path: str | None = None,
+) -> dict[str, Any]:
+    """Run every job of a manifest across a pool of worker processes.
+
+    Each group of jobs sharing a source runs in one worker, which extracts
+    and cleans the source once and then applies each job's rules, filters
+    and outputs with ETLPipeline.run_prepared. Groups start as soon as a
+    worker is free and their estimated memory fits in what the running
+    groups leave of the budget; a group larger than the whole budget runs
+    on its own.
+
+    Args:
+        manifest: Path of a manifest file, or the manifest itself
+        max_workers: Worker processes, defaulting to the manifest's
+            max_workers or else the number of CPUs
+        memory_budget: Bytes of memory the running groups may use together,
+            defaulting to the manifest's memory_budget or else no limit
+        report_path: Optional JSON file to write the report to
+
+    Returns:
+        Report with the status, time and pipeline summary of each job, the
+        groups that shared an extraction, and the counts of jobs that
+        succeeded and failed
+    """
+    if isinstance(manifest, str):
+        manifest = load_manifest(manifest)
+    jobs = build_jobs(manifest)
+    groups = group_jobs(jobs)
+    workers = max_workers or manifest.get("max_workers") or os.cpu_count() or 1
+    budget = memory_budget or manifest.get("memory_budget")
+    logger.info("Running %d jobs in %d groups on %d workers", len(jobs), len(groups), workers)
+
+    start = time.perf_counter()
+    results = _schedule(groups, workers, budget)
+    report: dict[str, Any] = {
+        "jobs": {result["name"]: result for group in results for result in group["jobs"]},
+        "groups": [
+            {**group, "jobs": [result["name"] for result in group["jobs"]]} for group in results
+        ],
+        "seconds": round(time.perf_counter() - start, 6),
+    }
+    statuses = [job["status"] for job in report["jobs"].values()]
+    report["succeeded"] = statuses.count("success")
+    report["failed"] = len(statuses) - report["succeeded"]
+
+    if report_path is not None:
+        Path(report_path).parent.mkdir(parents=True, exist_ok=True)
+        with open(report_path, "w") as f:
+            json.dump(report, f, indent=2, default=str)
+        logger.info("Batch report written to %s", report_path)
+    return report
+
+
+def run_group(jobs: list[dict[str, Any]]) -> dict[str, Any]:
+    """Run a group of jobs in the current process.
+
+    A group of one job runs the whole pipeline. A larger group extracts and
+    cleans the shared source once, then transforms and loads for each job.
+
+    Args:
+        jobs: A group from group_jobs
+
+    Returns:
+        The group's shared step, if any, and the result of each job
+    """
+    start = time.perf_counter()
+    if len(jobs) == 1:
+        return {"shared": False, "jobs": [_run_job(jobs[0])]}
+
+    try:
+        df, extract_summary, log = _prepare(jobs)
+    except Exception as e:
+        logger.exception("Shared extraction failed")
+        failed = [
+            {"name": job["name"], "status": "failed", "seconds": 0.0, "error": str(e)}
+            for job in jobs
+        ]
+        return {"shared": True, "error": str(e), "jobs": failed}
+
+    group = {
+        "shared": True,
+        "source_path": jobs[0]["source_path"],
+        "rows_extracted": extract_summary["rows_extracted"],
+        "transformations_applied": log,
+        "seconds": round(time.perf_counter() - start, 6),
+    }
+    group["jobs"] = [_run_job(job, df, extract_summary) for job in jobs]
+    return group
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Run a manifest from the command line.
+
+    Args:
+        argv: Command-line arguments, defaulting to sys.argv
+
+    Returns:
+        Exit status, 1 if any job failed
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("manifest", help="JSON or YAML job manifest")
+    parser.add_argument("--workers", type=int, help="worker processes")
+    parser.add_argument("--memory-budget", type=float, help="bytes, e.g. 8e9")
+    parser.add_argument("--report", help="JSON file for the batch report")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    report = run_batch(
+        args.manifest,
+        max_workers=args.workers,
+        memory_budget=int(args.memory_budget) if args.memory_budget else None,
+        report_path=args.report,
+    )
+    logger.info(
+        "%d jobs succeeded and %d failed in %.1f s",
+        report["succeeded"],
+        report["failed"],
+        report["seconds"],
+    )
+    return 1 if report["failed"] else 0
+
+
+def _schedule(
+    groups: list[list[dict[str, Any]]], workers: int, budget: int | None
+) -> list[dict[str, Any]]:
+    """Run the groups on a process pool within the memory budget."""
+    pending = [(index, jobs, estimate_memory(jobs)) for index, jobs in enumerate(groups)]
+    running: dict[Future[dict[str, Any]], tuple[int, list[dict[str, Any]], int]] = {}
+    results: dict[int, dict[str, Any]] = {}
+    # Workers are spawned rather than forked, as forking a process that
+    # runs threads (loader pools, SQLite connections) can deadlock
+    context = multiprocessing.get_context("spawn")
+
+    with ProcessPoolExecutor(workers, mp_context=context) as pool:
+        while pending or running:
+            while pending and len(running) < workers:
+                in_use = sum(estimate for _, _, estimate in running.values())
+                fits = [
+                    position
+                    for position, (_, _, estimate) in enumerate(pending)
+                    if budget is None or not running or in_use + estimate <= budget
+                ]
+                if not fits:
+                    break
+                index, jobs, estimate = pending.pop(fits[0])
+                running[pool.submit(run_group, jobs)] = (index, jobs, estimate)
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                index, jobs, _ = running.pop(future)
+                results[index] = _group_result(future, jobs)
+    return [results[i] for i in range(len(groups))]
+
+
+def _group_result(future: "Future[dict[str, Any]]", jobs: list[dict[str, Any]]) -> dict[str, Any]:
+    """Collect a group's result, failing its jobs if the worker itself failed."""
+    try:
+        return future.result()
+    except Exception as e:
+        logger.exception("Worker running %s failed", [job["name"] for job in jobs])
+        failed = [
+            {"name": job["name"], "status": "failed", "seconds": 0.0, "error": str(e)}
+            for job in jobs
+        ]
+        return {"shared": len(jobs) > 1, "error": str(e), "jobs": failed}
+
+
+def _prepare(jobs: list[dict[str, Any]]) -> tuple[pd.DataFrame, dict[str, Any], list[str]]:
+    """Extract and clean the source shared by a group of jobs."""
+    job = jobs[0]
+    pipeline = ETLPipeline(**_pipeline_arguments(job))
+    df = extract_from_source(
+        job["source_path"],
+        job.get("source_type", "csv"),
+        job.get("schema"),
+        _read_columns(job),
+        max_workers=job.get("max_workers"),
+        extractor=pipeline.extractor,
+    )
+    extract_summary = {
+        "source_path": job["source_path"],
+        "rows_extracted": len(df),
+        "columns_extracted": len(df.columns),
+        "shared_with": [other["name"] for other in jobs],
+    }
+
+    dedup_keys = job.get("dedup_keys")
+    deduplicator = (
+        RowDeduplicator(dedup_keys, job.get("dedup_memory", DEFAULT_DEDUP_BYTES))
+        if dedup_keys
+        else None
+    )
+    cleaner = DataTransformer(max_workers=job.get("fill_workers"), deduplicator=deduplicator)
+    try:
+        df = cleaner.clean_data(normalise_column_names(df))
+    finally:
+        if deduplicator is not None:
+            deduplicator.close()
+    return df, extract_summary, cleaner.get_transformation_summary()
+
+
+def _run_job(
+    job: dict[str, Any],
+    df: pd.DataFrame | None = None,
+    extract_summary: dict[str, Any] | None = None,
+) -> dict[str, Any]:
+    """Run one job, on prepared data if given, and describe the outcome."""
+    start = time.perf_counter()
+    try:
+        pipeline = ETLPipeline(**_pipeline_arguments(job))
+        arguments = _run_arguments(job)
+        if df is None:
+            success = pipeline.run_pipeline(**arguments)
+        else:
+            pipeline.pipeline_summary["extract"] = dict(extract_summary or {})
+            success = pipeline.run_prepared(
+                df,
+                arguments["output_path"],
+                arguments.get("output_format", "csv"),
+                arguments.get("filters"),
+                parquet_options=arguments.get("parquet_options"),
+                outputs=arguments.get("outputs"),
+                metrics_path=arguments.get("metrics_path"),
+            )
+        summary = pipeline.get_pipeline_summary()
+    except Exception as e:
+        logger.exception("Job %s failed", job["name"])
+        success, summary = False, {"error": str(e)}
+
+    result = {
+        "name": job["name"],
+        "status": "success" if success else "failed",
+        "seconds": round(time.perf_counter() - start, 6),
+        "summary": summary,
+    }
+    if "error" in summary:
+        result["error"] = summary["error"]
+    return result
+
+
+def _sharing_key(job: dict[str, Any]) -> str | None:
+    """Describe what a job's extraction depends on, or None if it cannot share."""
+    if not job.get("apply_transforms", True) or any(job.get(key) for key in UNSHARED_KEYS):
+        return None
+    source = job["source_path"]
+    described = {
+        "source_path": [source] if isinstance(source, str) else list(source),
+        "source_type": job.get("source_type", "csv"),
+        "schema": job.get("schema"),
+        "columns": _read_columns(job),
+        "dedup_keys": job.get("dedup_keys"),
+        **_pipeline_arguments({**job, "rules": None}),
+    }
+    return json.dumps(described, sort_keys=True, default=str)
+
+
+def _read_columns(job: dict[str, Any]) -> list[str] | None:
+    pipeline = ETLPipeline(rules=job.get("rules"))
+    return pipeline._columns_to_read(
+        job.get("columns"),
+        job.get("filters"),
+        apply_transforms=True,
+        dedup_keys=job.get("dedup_keys"),
+    )
+
+
+def _pipeline_arguments(job: dict[str, Any]) -> dict[str, Any]:
+    return {key: job[key] for key in _parameters(ETLPipeline) if key in job}
+
+
+def _run_arguments(job: dict[str, Any]) -> dict[str, Any]:
+    return {key: job[key] for key in _parameters(ETLPipeline.run_pipeline) if key in job}
+
+
+def _parameters(function: Any) -> set[str]:
+    return set(inspect.signature(function).parameters) - {"self"}
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
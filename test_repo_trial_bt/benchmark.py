@@ -0,0 +1,537 @@
+"""Benchmarks of the ETL phases on synthetic data shaped like example_data.csv.
+
+Run from the command line, for example:
+
+    python -m test_repo_trial_bt.benchmark --rows 1000000 \
+        --baseline .benchmarks/baseline.json
+
+The exit status is 1 if any benchmark is slower than its baseline by more
+than the threshold, and 2 without any baseline for the number of rows, so
+a missing baseline never passes for a successful check. Pass
+--update-baseline to record the run as the new baseline instead.
+"""
+
+import argparse
+import functools
+import gc
+import importlib.util
+import json
+import logging
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from collections.abc import Callable, Sequence
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from . import run_etl
+from .extract import extract_from_source
+from .load import save_to_destination
+from .transform import (
+    BUSINESS_RULE_FILTERS,
+    DataTransformer,
+    apply_business_rules,
+    normalise_column_names,
+)
+
+logger = logging.getLogger(__name__)
+
+# Products of example_data.csv, with their category and price. Products
+# beyond these repeat them as numbered editions.
+CATALOGUE = (
+    ("Wireless Headphones", "Electronics", 99.99),
+    ("Coffee Maker", "Appliances", 149.50),
+    ("Notebook Set", "Office Supplies", 12.99),
+    ("Smartphone", "Electronics", 699.99),
+    ("Desk Chair", "Furniture", 299.99),
+    ("Water Bottle", "Sports", 19.99),
+    ("Laptop", "Electronics", 1299.99),
+    ("Coffee Beans", "Food", 24.99),
+    ("Pen Set", "Office Supplies", 8.99),
+    ("Monitor", "Electronics", 399.99),
+    ("Table Lamp", "Furniture", 79.99),
+    ("Yoga Mat", "Sports", 49.99),
+    ("Backpack", "Sports", 89.99),
+    ("Tablet", "Electronics", 499.99),
+    ("Blender", "Appliances", 199.99),
+    ("Stapler", "Office Supplies", 15.99),
+    ("Gaming Mouse", "Electronics", 79.99),
+    ("Office Desk", "Furniture", 599.99),
+    ("Protein Powder", "Sports", 39.99),
+    ("Printer", "Electronics", 249.99),
+    ("Microwave", "Appliances", 179.99),
+    ("Folder Set", "Office Supplies", 6.99),
+    ("Keyboard", "Electronics", 129.99),
+    ("Bookshelf", "Furniture", 199.99),
+)
+
+# Regions of example_data.csv and the sales rep covering each
+SALES_REPS = {
+    "North": "John Smith",
+    "South": "Jane Doe",
+    "East": "Bob Johnson",
+    "West": "Alice Brown",
+}
+
+# Quantities ordered and how often each occurs
+QUANTITY_WEIGHTS = {1: 0.55, 2: 0.2, 3: 0.08, 4: 0.06, 5: 0.05, 8: 0.03, 10: 0.03}
+
+# Columns left complete by the generator; any other column may have nulls
+KEY_COLUMNS = ("product_id", "date", "customer_id")
+
+FIRST_DATE = np.datetime64("2024-01-15", "D")
+
+# Rows generated at a time when writing a synthetic source file
+DEFAULT_GENERATOR_CHUNK_ROWS = 1_000_000
+
+# Exit status of the command line when there is no baseline to compare with
+EXIT_NO_BASELINE = 2
+
+# A benchmark regresses when it is this much slower than its baseline...
+DEFAULT_THRESHOLD = 0.2
+# ...and at least this many seconds slower, so timer noise on very short
+# benchmarks is not reported
+MIN_REGRESSION_SECONDS = 0.01
+
+# Groups of benchmarks run by run_benchmarks
+BENCHMARK_GROUPS = ("extract", "transform", "load", "pipeline")
+
+# Output formats benchmarked by the load group, where their dependencies exist
+LOAD_FORMATS = ("csv", "parquet", "json", "jsonl", "sqlite")
+
+
+def generate_sales_data(
+    rows: int,
+    *,
+    seed: int = 0,
+    part: int = 0,
+    duplicate_rate: float = 0.01,
+    null_rate: float = 0.01,
+    negative_rate: float = 0.01,
+    products: int = len(CATALOGUE),
+    customers: int = 10_000,
+    days: int = 365,
+) -> pd.DataFrame:
+    """Generate sales data with the columns of example_data.csv.
+
+    The same arguments always give the same frame. Rows are independent of
+    each other apart from the injected duplicates, which copy an earlier row
+    of the same frame.
+
+    Args:
+        rows: Number of rows
+        seed: Seed of the random generator
+        part: Index of this frame within a larger dataset, so that each
+            part of a file written in chunks gets different rows
+        duplicate_rate: Fraction of rows that repeat an earlier row
+        null_rate: Fraction of values missing in each column other than
+            product_id, date and customer_id
+        negative_rate: Fraction of rows with a negative quantity
+        products: Number of distinct products
+        customers: Number of distinct customers
+        days: Number of distinct dates, starting on 2024-01-15
+
+    Returns:
+        DataFrame of synthetic sales
+    """
+    rng = np.random.default_rng([seed, part])
+    catalogue = _catalogue(products)
+    product = rng.integers(0, products, rows)
+    region = rng.integers(0, len(SALES_REPS), rows)
+    quantity = rng.choice(
+        np.array(list(QUANTITY_WEIGHTS)), rows, p=np.array(list(QUANTITY_WEIGHTS.values()))
+    )
+    quantity[rng.random(rows) < negative_rate] *= -1
+    # Lookup tables hold Python strings, as read_csv would produce
+    customer_ids = np.array(
+        [f"C{i + 1:0{_width(customers)}d}" for i in range(customers)], dtype=object
+    )
+    regions = np.array(list(SALES_REPS), dtype=object)
+    sales_reps = np.array(list(SALES_REPS.values()), dtype=object)
+
+    df = pd.DataFrame(
+        {
+            "product_id": catalogue["product_id"].take(product),
+            "product_name": catalogue["product_name"].take(product),
+            "category": catalogue["category"].take(product),
+            "quantity": pd.array(quantity, dtype="Int64"),
+            "price": catalogue["price"].take(product),
+            "date": FIRST_DATE + rng.integers(0, days, rows).astype("timedelta64[D]"),
+            "customer_id": customer_ids.take(rng.integers(0, customers, rows)),
+            "region": regions.take(region),
+            "sales_rep": sales_reps.take(region),
+        }
+    )
+    for column in df.columns.drop(list(KEY_COLUMNS)):
+        df[column] = df[column].mask(rng.random(rows) < null_rate)
+
+    return df.take(_duplicate_index(rng, rows, duplicate_rate)).reset_index(drop=True)
+
+
+def write_sales_data(
+    output_path: str,
+    rows: int,
+    *,
+    chunk_rows: int = DEFAULT_GENERATOR_CHUNK_ROWS,
+    **options: Any,
+) -> str:
+    """Write synthetic sales data to a CSV file, one chunk at a time.
+
+    Memory use is bounded by chunk_rows, so files of 1e8 rows can be
+    written. Duplicates are injected within each chunk.
+
+    Args:
+        output_path: Path of the CSV file, compressed if it ends in .gz
+        rows: Number of rows
+        chunk_rows: Rows generated and written at a time
+        **options: Arguments for generate_sales_data, e.g. seed or null_rate
+
+    Returns:
+        The output path
+    """
+    Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+    for part, start in enumerate(range(0, max(rows, 1), chunk_rows)):
+        chunk = generate_sales_data(min(chunk_rows, rows - start), part=part, **options)
+        chunk.to_csv(
+            output_path,
+            mode="w" if part == 0 else "a",
+            header=part == 0,
+            index=False,
+            date_format="%Y-%m-%d",
+        )
+    logger.info("Wrote %d synthetic rows to %s", rows, output_path)
+    return output_path
+
+
+def run_benchmarks(
+    rows: int,
+    workdir: str,
+    *,
+    repeats: int = 3,
+    groups: Sequence[str] = BENCHMARK_GROUPS,
+    chunk_size: int | None = None,
+    **options: Any,
+) -> dict[str, dict[str, Any]]:
+    """Time each phase of the pipeline on a synthetic source.
+
+    The extract group times extract_from_source, the transform group each
+    DataTransformer step and apply_business_rules, the load group each
+    output format and the pipeline group run_etl end to end. The source is
+    generated once and reused while it exists in workdir.
+
+    Args:
+        rows: Rows of the synthetic source
+        workdir: Directory for the source and the outputs
+        repeats: Times each benchmark runs; the fastest is kept
+        groups: Groups of benchmarks to run
+        chunk_size: Chunk size for the end-to-end run, e.g. for sources
+            larger than memory
+        **options: Arguments for generate_sales_data
+
+    Returns:
+        Dictionary of benchmark name to its rows, fastest and median seconds,
+        and rows per second
+    """
+    unknown = set(groups) - set(BENCHMARK_GROUPS)
+    if unknown:
+        msg = f"Unknown benchmark groups: {sorted(unknown)}. Use {list(BENCHMARK_GROUPS)}"
+        raise ValueError(msg)
+
+    work = Path(workdir)
+    source = work / f"sales_{rows}_{_options_key(options)}.csv"
+    if not source.exists():
+        write_sales_data(str(source), rows, **options)
+
+    benchmarks: dict[str, Callable[[], Any]] = {}
+    if "extract" in groups:
+        benchmarks["extract"] = lambda: extract_from_source(str(source))
+    if "transform" in groups or "load" in groups:
+        df = normalise_column_names(extract_from_source(str(source)))
+        if "transform" in groups:
+            benchmarks.update(_transform_benchmarks(df))
+        if "load" in groups:
+            benchmarks.update(_load_benchmarks(df, work / "outputs"))
+    if "pipeline" in groups:
+        benchmarks["pipeline:run_etl"] = lambda: _run_etl(
+            str(source), str(work / "outputs" / "pipeline.csv"), chunk_size
+        )
+
+    results = {}
+    for name, benchmark in benchmarks.items():
+        seconds = _time(benchmark, repeats)
+        results[name] = {
+            "rows": rows,
+            "seconds": round(min(seconds), 6),
+            "median_seconds": round(statistics.median(seconds), 6),
+            "rows_per_second": round(rows / min(seconds), 1) if min(seconds) > 0 else None,
+        }
+        logger.info("Benchmark %s took %.4f s", name, min(seconds))
+    return results
+
+
+def compare_to_baseline(
+    results: dict[str, dict[str, Any]],
+    baseline: dict[str, dict[str, Any]],
+    threshold: float = DEFAULT_THRESHOLD,
+    min_seconds: float = MIN_REGRESSION_SECONDS,
+) -> list[dict[str, Any]]:
+    """Find the benchmarks that are slower than their baseline.
+
+    Args:
+        results: Results from run_benchmarks
+        baseline: Earlier results for the same number of rows
+        threshold: Fraction by which a benchmark may be slower
+        min_seconds: Seconds by which a benchmark must be slower as well
+
+    Returns:
+        One dictionary per regression with the benchmark name, baseline
+        and current seconds, and the ratio between them
+    """
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        before, after = baseline[name]["seconds"], result["seconds"]
+        if after > before * (1 + threshold) and after - before > min_seconds:
+            regressions.append(
+                {
+                    "benchmark": name,
+                    "baseline_seconds": before,
+                    "seconds": after,
+                    "ratio": round(after / before, 3) if before > 0 else None,
+                }
+            )
+    return regressions
+
+
+def load_baseline(baseline_path: str, rows: int) -> dict[str, dict[str, Any]]:
+    """Read the baseline results for a number of rows.
+
+    Args:
+        baseline_path: JSON file written by save_baseline
+        rows: Rows of the benchmark run
+
+    Returns:
+        Baseline results, empty if the file or the row count is missing
+    """
+    path = Path(baseline_path)
+    if not path.exists():
+        return {}
+    with open(path) as f:
+        baselines = json.load(f)
+    result: dict[str, dict[str, Any]] = baselines.get("results", {}).get(str(rows), {})
+    return result
+
+
+def save_baseline(results: dict[str, dict[str, Any]], baseline_path: str, rows: int) -> None:
+    """Record results as the baseline for a number of rows.
+
+    Baselines for other row counts in the file are kept. The file also
+    records the Python and pandas versions and the machine, because timings
+    are only comparable on the same setup.
+
+    Args:
+        results: Results from run_benchmarks
+        baseline_path: JSON file to update
+        rows: Rows of the benchmark run
+    """
+    path = Path(baseline_path)
+    baselines: dict[str, Any] = {}
+    if path.exists():
+        with open(path) as f:
+            baselines = json.load(f)
+    baselines["environment"] = environment()
+    baselines.setdefault("results", {})[str(rows)] = results
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(baselines, f, indent=2)
+    logger.info("Saved baseline for %d rows to %s", rows, baseline_path)
+
+
+def environment() -> dict[str, str]:
+    """Describe the setup benchmarks ran on."""
+    return {
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+    }
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Run the benchmarks from the command line.
+
+    Args:
+        argv: Command-line arguments, defaulting to sys.argv
+
+    Returns:
+        Exit status, 1 if a benchmark regressed past the threshold and 2 if
+        there is no baseline to compare with
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=float, default=100_000, help="rows, e.g. 1e6")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--groups", nargs="+", choices=BENCHMARK_GROUPS, default=BENCHMARK_GROUPS)
+    parser.add_argument("--chunk-size", type=int, help="chunk size of the end-to-end run")
+    parser.add_argument("--workdir", help="directory for the source and outputs")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--duplicate-rate", type=float, default=0.01)
+    parser.add_argument("--null-rate", type=float, default=0.01)
+    parser.add_argument("--negative-rate", type=float, default=0.01)
+    parser.add_argument("--products", type=int, default=len(CATALOGUE))
+    parser.add_argument("--customers", type=int, default=10_000)
+    parser.add_argument("--baseline", help="JSON file of baseline results")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument("--min-seconds", type=float, default=MIN_REGRESSION_SECONDS)
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+    rows = int(args.rows)
+    baseline: dict[str, dict[str, Any]] = {}
+    if args.baseline is not None and not args.update_baseline:
+        baseline = load_baseline(args.baseline, rows)
+        if not baseline:
+            print(
+                f"No baseline for {rows} rows in {args.baseline}; record one with"
+                " --update-baseline",
+                file=sys.stderr,
+            )
+            return EXIT_NO_BASELINE
+    options = {
+        "seed": args.seed,
+        "duplicate_rate": args.duplicate_rate,
+        "null_rate": args.null_rate,
+        "negative_rate": args.negative_rate,
+        "products": args.products,
+        "customers": args.customers,
+    }
+    with tempfile.TemporaryDirectory(prefix="etl-benchmark-") as temporary:
+        results = run_benchmarks(
+            rows,
+            args.workdir or temporary,
+            repeats=args.repeats,
+            groups=args.groups,
+            chunk_size=args.chunk_size,
+            **options,
+        )
+
+    print(f"{'benchmark':<28} {'seconds':>10} {'rows/s':>14}")
+    for name, result in results.items():
+        print(f"{name:<28} {result['seconds']:>10.4f} {result['rows_per_second'] or 0:>14,.0f}")
+
+    if args.baseline is None:
+        return 0
+    if args.update_baseline:
+        save_baseline(results, args.baseline, rows)
+        return 0
+    regressions = compare_to_baseline(results, baseline, args.threshold, args.min_seconds)
+    for regression in regressions:
+        print(
+            f"REGRESSION {regression['benchmark']}: {regression['baseline_seconds']:.4f} s"
+            f" -> {regression['seconds']:.4f} s (x{regression['ratio']})"
+        )
+    return 1 if regressions else 0
+
+
+def _catalogue(products: int) -> dict[str, np.ndarray]:
+    """Build the product_id, name, category and price of every product."""
+    base = np.arange(products) % len(CATALOGUE)
+    edition = np.arange(products) // len(CATALOGUE)
+    names = np.array([name for name, _, _ in CATALOGUE], dtype=object).take(base)
+    numbered = edition > 0
+    names[numbered] = names[numbered] + " " + (edition[numbered] + 1).astype(str).astype(object)
+    return {
+        "product_id": np.array(
+            [f"P{i + 1:0{_width(products)}d}" for i in range(products)], dtype=object
+        ),
+        "product_name": names,
+        "category": np.array([category for _, category, _ in CATALOGUE], dtype=object).take(base),
+        "price": np.array([price for _, _, price in CATALOGUE]).take(base),
+    }
+
+
+def _duplicate_index(rng: np.random.Generator, rows: int, duplicate_rate: float) -> np.ndarray:
+    """Pick the row each output row copies, repeating earlier rows at duplicate_rate."""
+    index = np.arange(rows)
+    positions = np.flatnonzero(rng.random(rows) < duplicate_rate)
+    positions = positions[positions > 0]
+    index[positions] = (rng.random(len(positions)) * positions).astype(np.int64)
+    # A copy of a row that was itself replaced must copy what replaced it;
+    # every row points at an earlier one, so following pointers terminates
+    while True:
+        resolved = index.take(index)
+        if np.array_equal(resolved, index):
+            return index
+        index = resolved
+
+
+def _width(count: int) -> int:
+    """Digits of the identifiers of count items, at least three as in example_data.csv."""
+    return max(3, len(str(count)))
+
+
+def _options_key(options: dict[str, Any]) -> str:
+    return "_".join(f"{key}-{value}" for key, value in sorted(options.items())) or "default"
+
+
+def _transform_benchmarks(df: pd.DataFrame) -> dict[str, Callable[[], Any]]:
+    cleaned = DataTransformer().clean_data(df)
+    derived = DataTransformer().add_calculated_columns(cleaned)
+    return {
+        "transform:remove_duplicates": lambda: DataTransformer().remove_duplicates(df),
+        "transform:fill_missing_values": lambda: DataTransformer().fill_missing_values(df),
+        "transform:add_calculated_columns": lambda: DataTransformer().add_calculated_columns(
+            cleaned
+        ),
+        "transform:filter_data": lambda: DataTransformer().filter_data(
+            derived, BUSINESS_RULE_FILTERS
+        ),
+        "transform:apply_business_rules": lambda: apply_business_rules(df),
+    }
+
+
+def _load_benchmarks(df: pd.DataFrame, output_dir: Path) -> dict[str, Callable[[], Any]]:
+    benchmarks: dict[str, Callable[[], Any]] = {}
+    for format_type in LOAD_FORMATS:
+        if format_type == "parquet" and importlib.util.find_spec("pyarrow") is None:
+            logger.warning("Skipped the parquet benchmark: pyarrow is not installed")
+            continue
+        output_path = str(output_dir / f"output.{format_type}")
+        benchmarks[f"load:{format_type}"] = functools.partial(_save, df, output_path, format_type)
+    return benchmarks
+
+
+def _save(df: pd.DataFrame, output_path: str, format_type: str) -> None:
+    _check(save_to_destination(df, output_path, format_type), output_path)
+
+
+def _run_etl(source_path: str, output_path: str, chunk_size: int | None) -> None:
+    _check(run_etl(source_path, output_path, chunk_size=chunk_size), output_path)
+
+
+def _check(success: bool, output_path: str) -> None:
+    """Stop a benchmark whose run failed rather than timing the failure."""
+    if not success:
+        msg = f"Benchmark failed to write {output_path}"
+        raise RuntimeError(msg)
+
+
+def _time(benchmark: Callable[[], Any], repeats: int) -> list[float]:
+    seconds = []
+    for _ in range(max(repeats, 1)):
+        gc.collect()
+        start = time.perf_counter()
+        benchmark()
+        seconds.append(time.perf_counter() - start)
+    return seconds
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,153 @@
+import hashlib
+import importlib.util
+import json
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import Any
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Default upper bound on the total size of cached frames (1 GiB)
+DEFAULT_CACHE_BYTES = 1024**3
+
+CACHE_SUFFIX = ".feather"
+
+
+def file_fingerprint(file_path: str) -> dict[str, Any]:
+    """Identify the exact contents of a file.
+
+    Args:
+        file_path: Path to the file
+
+    Returns:
+        Dictionary with the resolved path, size, modification time and a
+        BLAKE2 hash of the file contents
+    """
+    path = Path(file_path).resolve()
+    stat = path.stat()
+    with open(path, "rb") as f:
+        digest = hashlib.file_digest(f, "blake2b").hexdigest()
+    return {
+        "path": str(path),
+        "size_bytes": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "content_hash": digest,
+    }
+
+
+class FrameCache:
+    """Size-bounded, least-recently-used store of DataFrames on local disk.
+
+    Frames are stored in the Arrow IPC (Feather) format, which keeps dtypes
+    such as categoricals and datetimes and loads far faster than CSV parsing.
+    Caching is skipped with a warning when pyarrow is not installed.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int = DEFAULT_CACHE_BYTES) -> None:
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.enabled = importlib.util.find_spec("pyarrow") is not None
+        if not self.enabled:
+            logger.warning("pyarrow is not installed, frame cache in %s is disabled", cache_dir)
+
+    def make_key(self, file_path: str, **options: Any) -> str:
+        """Build a cache key for a file parsed with the given options.
+
+        Args:
+            file_path: Path to the source file
+            **options: Anything else that changes the parsed result, such as
+                the schema or the columns read
+
+        Returns:
+            Hex digest identifying the file contents and parse options
+        """
+        parts = {"source": file_fingerprint(file_path), "options": options}
+        payload = json.dumps(parts, sort_keys=True, default=repr)
+        return hashlib.blake2b(payload.encode(), digest_size=20).hexdigest()
+
+    def get(self, key: str) -> pd.DataFrame | None:
+        """Load a cached frame.
+
+        Args:
+            key: Cache key from make_key
+
+        Returns:
+            The cached DataFrame, or None if it is not cached
+        """
+        path = self._path_for(key)
+        if not self.enabled or not path.exists():
+            self.misses += 1
+            return None
+
+        try:
+            data = pd.read_feather(path)
+        except Exception:
+            logger.warning("Discarding unreadable cache entry %s", path)
+            path.unlink(missing_ok=True)
+            self.misses += 1
+            return None
+
+        # The modification time doubles as the last-used time for eviction
+        os.utime(path)
+        self.hits += 1
+        return data
+
+    def put(self, key: str, df: pd.DataFrame) -> None:
+        """Store a frame, then evict old entries if over the size limit.
+
+        Args:
+            key: Cache key from make_key
+            df: DataFrame to store
+        """
+        if not self.enabled:
+            return
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        # Write to a temporary file first so readers never see a partial entry
+        fd, tmp_name = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        os.close(fd)
+        try:
+            df.reset_index(drop=True).to_feather(tmp_name)
+            os.replace(tmp_name, self._path_for(key))
+        except Exception:
+            logger.warning("Could not cache frame under %s", key, exc_info=True)
+            Path(tmp_name).unlink(missing_ok=True)
+            return
+
+        self.evict()
+
+    def evict(self) -> int:
+        """Remove least recently used entries until within max_bytes.
+
+        Returns:
+            Number of entries removed
+        """
+        entries = []
+        for path in self.cache_dir.glob(f"*{CACHE_SUFFIX}"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+
+        if removed:
+            logger.info("Evicted %d entries from cache %s", removed, self.cache_dir)
+        return removed
+
+    def _path_for(self, key: str) -> Path:
+        return self.cache_dir / f"{key}{CACHE_SUFFIX}"
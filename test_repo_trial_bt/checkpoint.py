@@ -0,0 +1,201 @@
+import hashlib
+import importlib.util
+import json
+import logging
+import os
+import shutil
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import pandas as pd
+
+from .cache import CACHE_SUFFIX, file_fingerprint
+from .extract import resolve_source_paths
+
+logger = logging.getLogger(__name__)
+
+# Checkpoints of runs that have not been resumed for this long are removed (7 days)
+DEFAULT_CHECKPOINT_AGE = 7 * 24 * 3600
+
+# Phases that leave a checkpoint, in the order they run
+CHECKPOINT_PHASES = ("extract", "transform")
+
+MANIFEST_NAME = "checkpoint.json"
+
+
+class CheckpointStore:
+    """Frames saved after each phase of a run, so a failed run can resume.
+
+    Each run is identified by a key built from the fingerprints of its
+    source files and its configuration, so a checkpoint is only resumed by
+    a run that would compute the same frame. A run's checkpoints live in a
+    directory named after the key, next to a manifest recording the output
+    path and the pipeline summary of each completed phase. Frames are
+    stored in the Arrow IPC (Feather) format, as in FrameCache.
+    Checkpointing is skipped with a warning when pyarrow is not installed.
+
+    Args:
+        checkpoint_dir: Directory holding the checkpoints of every run
+        max_age: Seconds after which checkpoints not used by any run are
+            removed
+    """
+
+    def __init__(self, checkpoint_dir: str, max_age: float = DEFAULT_CHECKPOINT_AGE) -> None:
+        self.checkpoint_dir = Path(checkpoint_dir)
+        self.max_age = max_age
+        self.enabled = importlib.util.find_spec("pyarrow") is not None
+        if not self.enabled:
+            logger.warning(
+                "pyarrow is not installed, checkpoints in %s are disabled", checkpoint_dir
+            )
+
+    def make_key(self, source_path: str | list[str], **config: Any) -> str:
+        """Build the key of a run.
+
+        Args:
+            source_path: Path to source data, a glob pattern, or a list of either
+            **config: Everything else that changes the extracted or
+                transformed frames, such as the filters and business rules
+
+        Returns:
+            Hex digest identifying the source contents and configuration
+        """
+        sources = [file_fingerprint(path) for path in resolve_source_paths(source_path)]
+        payload = json.dumps({"sources": sources, "config": config}, sort_keys=True, default=repr)
+        return hashlib.blake2b(payload.encode(), digest_size=20).hexdigest()
+
+    def latest(self, key: str) -> tuple[str, pd.DataFrame, dict[str, Any]] | None:
+        """Load the checkpoint of the last phase a run completed.
+
+        Args:
+            key: Run key from make_key
+
+        Returns:
+            Tuple of the phase, its frame and the pipeline summary recorded
+            with it, or None if the run has no usable checkpoint
+        """
+        manifest = self._manifest(key)
+        if not self.enabled or manifest is None:
+            return None
+        for phase in reversed(CHECKPOINT_PHASES):
+            if phase not in manifest["phases"]:
+                continue
+            path = self._run_dir(key) / f"{phase}{CACHE_SUFFIX}"
+            try:
+                df = pd.read_feather(path)
+            except Exception:
+                logger.warning("Discarding unreadable checkpoint %s", path)
+                continue
+            # The manifest's modification time is the last-used time for expiry
+            os.utime(self._run_dir(key) / MANIFEST_NAME)
+            logger.info("Resuming from the %s checkpoint of run %s", phase, key)
+            return phase, df, manifest["phases"][phase]
+        return None
+
+    def save(
+        self, key: str, phase: str, df: pd.DataFrame, summary: dict[str, Any], output_path: str
+    ) -> None:
+        """Save the frame a phase produced.
+
+        Args:
+            key: Run key from make_key
+            phase: Phase that produced the frame, one of CHECKPOINT_PHASES
+            df: Frame to save
+            summary: Pipeline summary so far, restored when resuming
+            output_path: Output path of the run, used to find its stale
+                checkpoints
+        """
+        if not self.enabled:
+            return
+        run_dir = self._run_dir(key)
+        run_dir.mkdir(parents=True, exist_ok=True)
+        try:
+            _write_atomic(run_dir / f"{phase}{CACHE_SUFFIX}", df.reset_index(drop=True).to_feather)
+        except Exception:
+            logger.warning("Could not save the %s checkpoint of run %s", phase, key, exc_info=True)
+            return
+
+        manifest = self._manifest(key) or {
+            "output_path": str(Path(output_path).resolve()),
+            "phases": {},
+        }
+        manifest["phases"][phase] = summary
+        text = json.dumps(manifest, indent=2, default=str)
+        _write_atomic(run_dir / MANIFEST_NAME, lambda path: Path(path).write_text(text))
+        logger.info("Saved the %s checkpoint of run %s", phase, key)
+
+    def discard(self, key: str) -> None:
+        """Remove every checkpoint of a run, e.g. once it has completed.
+
+        Args:
+            key: Run key from make_key
+        """
+        shutil.rmtree(self._run_dir(key), ignore_errors=True)
+
+    def collect_garbage(self, output_path: str | None = None, keep: str | None = None) -> int:
+        """Remove stale checkpoints.
+
+        Checkpoints are stale when no run has used them for max_age seconds,
+        or when they were written for output_path by a run with another key:
+        its source or configuration has changed since, so it can never be
+        resumed.
+
+        Args:
+            output_path: Output path whose checkpoints from other runs are stale
+            keep: Key of the current run, whose checkpoints are kept
+
+        Returns:
+            Number of runs whose checkpoints were removed
+        """
+        if not self.checkpoint_dir.is_dir():
+            return 0
+        target = None if output_path is None else str(Path(output_path).resolve())
+        removed = 0
+        for run_dir in self.checkpoint_dir.iterdir():
+            if not run_dir.is_dir() or run_dir.name == keep:
+                continue
+            manifest = self._manifest(run_dir.name)
+            expired = _age(run_dir) > self.max_age
+            replaced = manifest is not None and manifest["output_path"] == target
+            # A directory without a manifest may belong to a run saving its
+            # first checkpoint, so it is only removed once expired
+            if expired or replaced:
+                shutil.rmtree(run_dir, ignore_errors=True)
+                removed += 1
+
+        if removed:
+            logger.info("Removed the checkpoints of %d runs from %s", removed, self.checkpoint_dir)
+        return removed
+
+    def _manifest(self, key: str) -> dict[str, Any] | None:
+        try:
+            with open(self._run_dir(key) / MANIFEST_NAME) as f:
+                manifest: dict[str, Any] = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        return manifest
+
+    def _run_dir(self, key: str) -> Path:
+        return self.checkpoint_dir / key
+
+
+def _age(run_dir: Path) -> float:
+    """Seconds since a run's checkpoints were last saved or resumed."""
+    manifest = run_dir / MANIFEST_NAME
+    stat = manifest.stat() if manifest.exists() else run_dir.stat()
+    return time.time() - stat.st_mtime
+
+
+def _write_atomic(path: Path, write: Callable[[str], Any]) -> None:
+    """Write a file through a temporary file so readers never see a partial one."""
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    os.close(fd)
+    try:
+        write(tmp_name)
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
@@ -0,0 +1,230 @@
+import atexit
+import contextlib
+import logging
+import sqlite3
+import threading
+import time
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Rows sent to the database per executemany call
+DEFAULT_SQL_BATCH_ROWS = 10_000
+
+# Pragmas applied to every pooled SQLite connection. WAL with synchronous
+# NORMAL only syncs at checkpoints, and a 64 MiB page cache (negative values
+# are KiB) keeps index pages of large tables in memory during bulk inserts.
+SQLITE_PRAGMAS: dict[str, Any] = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "temp_store": "MEMORY",
+    "cache_size": -64_000,
+}
+
+# SQL column types for pandas dtype kinds; anything else is stored as TEXT
+SQL_TYPES = {"i": "INTEGER", "u": "INTEGER", "b": "INTEGER", "f": "REAL"}
+
+IF_EXISTS = ("append", "replace", "fail")
+
+
+class SQLitePool:
+    """Pool of SQLite connections, reused across loads to the same database.
+
+    Opening a connection and applying the pragmas is done once per pooled
+    connection rather than once per load. Connections may be used from any
+    thread, but only by one thread at a time.
+
+    Args:
+        max_idle: Idle connections kept per database
+        pragmas: Pragmas to apply on top of SQLITE_PRAGMAS
+        timeout: Seconds to wait for another connection's write lock
+    """
+
+    def __init__(
+        self, max_idle: int = 4, pragmas: dict[str, Any] | None = None, timeout: float = 30.0
+    ) -> None:
+        self.max_idle = max_idle
+        self.pragmas = {**SQLITE_PRAGMAS, **(pragmas or {})}
+        self.timeout = timeout
+        self.connections_opened = 0
+        self._idle: dict[str, list[sqlite3.Connection]] = {}
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def connection(self, database: str) -> Iterator[sqlite3.Connection]:
+        """Borrow a connection to a database, returning it to the pool after.
+
+        Args:
+            database: Path of the SQLite database file
+
+        Yields:
+            Open connection with the pool's pragmas applied
+        """
+        key = str(Path(database).resolve())
+        with self._lock:
+            idle = self._idle.get(key)
+            connection = idle.pop() if idle else None
+        if connection is None:
+            connection = self._connect(database)
+        try:
+            yield connection
+        finally:
+            with self._lock:
+                idle = self._idle.setdefault(key, [])
+                if len(idle) < self.max_idle:
+                    idle.append(connection)
+                    connection = None
+            if connection is not None:
+                connection.close()
+
+    def close(self) -> None:
+        """Close every idle connection."""
+        with self._lock:
+            connections = [c for idle in self._idle.values() for c in idle]
+            self._idle = {}
+        for connection in connections:
+            connection.close()
+
+    def _connect(self, database: str) -> sqlite3.Connection:
+        Path(database).parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(database, timeout=self.timeout, check_same_thread=False)
+        for name, value in self.pragmas.items():
+            connection.execute(f"PRAGMA {name} = {value}")
+        self.connections_opened += 1
+        logger.info("Opened SQLite connection to %s", database)
+        return connection
+
+
+# Shared by every DataLoader that is not given a pool of its own
+DEFAULT_SQLITE_POOL = SQLitePool()
+atexit.register(DEFAULT_SQLITE_POOL.close)
+
+
+def insert_frame(
+    connection: Any,
+    df: pd.DataFrame,
+    table: str,
+    *,
+    primary_key: list[str] | None = None,
+    batch_size: int = DEFAULT_SQL_BATCH_ROWS,
+    if_exists: str = "append",
+    placeholder: str = "?",
+) -> dict[str, Any]:
+    """Insert a DataFrame into a table in one transaction.
+
+    Rows are sent in batches with executemany and committed once at the end,
+    or rolled back if any batch fails. The table is created if it does not
+    exist, and when replacing it is dropped in the same transaction, so a
+    failed insert leaves the old table in place.
+
+    Args:
+        connection: DB-API connection, e.g. from sqlite3.connect
+        df: DataFrame to insert
+        table: Name of the table
+        primary_key: Columns of the table's primary key. Rows whose key is
+            already in the table replace the existing row (upsert).
+        batch_size: Rows per executemany call
+        if_exists: append to the table, replace it, or fail if it exists
+        placeholder: Parameter placeholder of the driver, "?" for qmark
+            drivers such as sqlite3 or "%s" for format drivers
+
+    Returns:
+        Dictionary with the rows inserted, batches sent and seconds taken
+    """
+    if if_exists not in IF_EXISTS:
+        msg = f"if_exists must be one of {IF_EXISTS}, got {if_exists}"
+        raise ValueError(msg)
+    missing = [column for column in primary_key or [] if column not in df.columns]
+    if missing:
+        msg = f"Primary key columns not found: {missing}"
+        raise ValueError(msg)
+
+    start = time.perf_counter()
+    columns = _sql_values(df)
+    statement = insert_statement(table, list(df.columns), primary_key, placeholder)
+    cursor = connection.cursor()
+    batches = 0
+    try:
+        # sqlite3 only opens a transaction by itself before an INSERT, which
+        # would leave the DROP and CREATE committed on their own
+        if isinstance(connection, sqlite3.Connection) and not connection.in_transaction:
+            cursor.execute("BEGIN")
+        if if_exists == "replace":
+            cursor.execute(f"DROP TABLE IF EXISTS {_quote(table)}")
+        if_not_exists = "" if if_exists == "fail" else " IF NOT EXISTS"
+        cursor.execute(create_table_statement(df, table, primary_key, if_not_exists))
+        for offset in range(0, len(df), batch_size):
+            batch = [column[offset : offset + batch_size] for column in columns]
+            cursor.executemany(statement, list(zip(*batch, strict=True)))
+            batches += 1
+        connection.commit()
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        cursor.close()
+
+    return {"rows": len(df), "batches": batches, "seconds": time.perf_counter() - start}
+
+
+def create_table_statement(
+    df: pd.DataFrame, table: str, primary_key: list[str] | None = None, if_not_exists: str = ""
+) -> str:
+    """Build the CREATE TABLE statement for a DataFrame's columns."""
+    definitions = [
+        f"{_quote(column)} {SQL_TYPES.get(dtype.kind, 'TEXT')}"
+        for column, dtype in df.dtypes.items()
+    ]
+    if primary_key:
+        definitions.append(f"PRIMARY KEY ({', '.join(map(_quote, primary_key))})")
+    return f"CREATE TABLE{if_not_exists} {_quote(table)} ({', '.join(definitions)})"
+
+
+def insert_statement(
+    table: str, columns: list[str], primary_key: list[str] | None = None, placeholder: str = "?"
+) -> str:
+    """Build the INSERT statement, an upsert when a primary key is given."""
+    names = ", ".join(map(_quote, columns))
+    values = ", ".join([placeholder] * len(columns))
+    statement = f"INSERT INTO {_quote(table)} ({names}) VALUES ({values})"
+    if not primary_key:
+        return statement
+    updates = [f"{_quote(c)} = excluded.{_quote(c)}" for c in columns if c not in primary_key]
+    conflict = f" ON CONFLICT ({', '.join(map(_quote, primary_key))})"
+    return (
+        statement
+        + conflict
+        + (f" DO UPDATE SET {', '.join(updates)}" if updates else " DO NOTHING")
+    )
+
+
+def _sql_values(df: pd.DataFrame) -> list[np.ndarray]:
+    """Convert each column to an object array of values a driver can bind.
+
+    Missing values become None and datetimes ISO 8601 strings. Converting
+    whole columns once is much faster than converting row by row.
+    """
+    columns = []
+    for _, series in df.items():
+        if isinstance(series.dtype, pd.DatetimeTZDtype):
+            values = series.dt.strftime("%Y-%m-%dT%H:%M:%S%z").to_numpy(dtype=object)
+        elif pd.api.types.is_datetime64_dtype(series.dtype):
+            # Several times faster than strftime
+            text = np.datetime_as_string(series.to_numpy(), unit="s")
+            values = text.astype(object)
+        else:
+            values = series.to_numpy(dtype=object)
+        values[series.isna().to_numpy()] = None
+        columns.append(values)
+    return columns
+
+
+def _quote(name: Any) -> str:
+    """Quote an identifier for SQL."""
+    escaped = str(name).replace('"', '""')
+    return f'"{escaped}"'
@@ -0,0 +1,209 @@
+import logging
+import shutil
+import tempfile
+from pathlib import Path
+from types import TracebackType
+from typing import Self
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Default memory budget for the hashes of rows seen so far (256 MiB)
+DEFAULT_DEDUP_BYTES = 256 * 1024**2
+
+# Number of hash partitions spilled to disk; a power of two
+SPILL_PARTITIONS = 16
+
+# Spill files per partition before they are merged into one
+MAX_SPILL_RUNS = 8
+
+
+def row_hashes(df: pd.DataFrame, key_columns: list[str] | None = None) -> np.ndarray:
+    """Hash each row, or the key columns of each row, to a 64-bit integer.
+
+    Args:
+        df: Input DataFrame
+        key_columns: Columns identifying a row. None uses every column.
+
+    Returns:
+        Array of one uint64 hash per row
+    """
+    keys = df if key_columns is None else df[key_columns]
+    # A column read as integers in one chunk and as floats in another, because
+    # that chunk has missing values, must hash the same
+    integers = {
+        column: "float64"
+        for column, dtype in keys.dtypes.items()
+        if pd.api.types.is_integer_dtype(dtype) and isinstance(dtype, np.dtype)
+    }
+    if integers:
+        keys = keys.astype(integers)
+    return pd.util.hash_pandas_object(keys, index=False).to_numpy()
+
+
+class RowDeduplicator:
+    """Remove rows already seen, across any number of frames or chunks.
+
+    Rows are identified by a 64-bit hash of their values, or of the key
+    columns only. The hashes seen so far are kept in a sorted array. When
+    that array outgrows the memory budget it is split into hash partitions
+    and spilled to disk, and later lookups read back only the partitions
+    the new hashes fall into. Two different rows are mistaken for
+    duplicates only if their hashes collide, which for n rows has a
+    probability of about n**2 / 2**65.
+
+    Args:
+        key_columns: Columns identifying a row, e.g. ["product_id",
+            "customer_id", "date"]. None compares whole rows.
+        memory_budget: Bytes of hashes kept in memory before spilling
+        spill_dir: Directory for spilled partitions. A temporary directory,
+            removed by close, is used if not given.
+    """
+
+    def __init__(
+        self,
+        key_columns: list[str] | None = None,
+        memory_budget: int = DEFAULT_DEDUP_BYTES,
+        spill_dir: str | None = None,
+    ) -> None:
+        self.key_columns = key_columns
+        self.memory_budget = memory_budget
+        self.spill_dir = Path(spill_dir) if spill_dir is not None else None
+        self._own_spill_dir = spill_dir is None
+        self.seen = np.empty(0, dtype=np.uint64)
+        self.spilled: dict[int, list[Path]] = {}
+        self.spills = 0
+        self.rows_seen = 0
+        self.duplicates_removed = 0
+
+    def unique_mask(self, df: pd.DataFrame) -> np.ndarray:
+        """Find the rows of df not seen in this or any earlier frame.
+
+        The rows found are remembered, so a later frame repeating them has
+        them marked as duplicates.
+
+        Args:
+            df: Input DataFrame
+
+        Returns:
+            Boolean mask of the rows to keep
+        """
+        hashes = row_hashes(df, self.key_columns)
+        mask = ~pd.Series(hashes).duplicated().to_numpy()
+        mask[mask] = ~self._contains(hashes[mask])
+        self._add(hashes[mask])
+
+        self.rows_seen += len(df)
+        self.duplicates_removed += len(df) - int(mask.sum())
+        return mask
+
+    def drop_duplicates(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Drop the rows of df that were already seen.
+
+        Args:
+            df: Input DataFrame
+
+        Returns:
+            DataFrame of first occurrences only
+        """
+        mask = self.unique_mask(df)
+        if mask.all():
+            return df.copy(deep=False)
+        return df.take(np.flatnonzero(mask))
+
+    def close(self) -> None:
+        """Forget the rows seen and remove any spill files."""
+        for paths in self.spilled.values():
+            for path in paths:
+                path.unlink(missing_ok=True)
+        if self._own_spill_dir and self.spill_dir is not None:
+            shutil.rmtree(self.spill_dir, ignore_errors=True)
+            self.spill_dir = None
+        self.spilled = {}
+        self.seen = np.empty(0, dtype=np.uint64)
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def _contains(self, hashes: np.ndarray) -> np.ndarray:
+        """Check which hashes were seen, in memory or in spilled partitions."""
+        found = _isin_sorted(hashes, self.seen)
+        if self.spilled:
+            partitions = _partition(hashes)
+            for partition, paths in self.spilled.items():
+                selected = np.flatnonzero(partitions == partition)
+                if len(selected) == 0:
+                    continue
+                for path in paths:
+                    found[selected] |= _isin_sorted(hashes[selected], np.load(path, mmap_mode="r"))
+        return found
+
+    def _add(self, hashes: np.ndarray) -> None:
+        # Both arrays are sorted, so the stable sort only merges two runs
+        merged = np.concatenate([self.seen, np.sort(hashes)])
+        self.seen = np.sort(merged, kind="stable")
+        if self.seen.nbytes > self.memory_budget:
+            self._spill()
+
+    def _spill(self) -> None:
+        """Write the in-memory hashes to disk, one file per hash partition."""
+        if self.spill_dir is None:
+            self.spill_dir = Path(tempfile.mkdtemp(prefix="dedup-"))
+        self.spill_dir.mkdir(parents=True, exist_ok=True)
+
+        # Partitions are the top bits of the hash, so each one is a
+        # contiguous slice of the sorted array
+        bounds = np.searchsorted(self.seen, _partition_starts(), side="left")
+        bounds = np.append(bounds, len(self.seen))
+        for partition in range(SPILL_PARTITIONS):
+            block = self.seen[bounds[partition] : bounds[partition + 1]]
+            if len(block) == 0:
+                continue
+            paths = self.spilled.setdefault(partition, [])
+            path = self.spill_dir / f"partition-{partition:02d}-{self.spills:05d}.npy"
+            np.save(path, block)
+            paths.append(path)
+            if len(paths) > MAX_SPILL_RUNS:
+                self._merge_runs(partition)
+
+        logger.info("Spilled %d row hashes to %s", len(self.seen), self.spill_dir)
+        self.spills += 1
+        self.seen = np.empty(0, dtype=np.uint64)
+
+    def _merge_runs(self, partition: int) -> None:
+        paths = self.spilled[partition]
+        merged = np.sort(np.concatenate([np.load(path) for path in paths]), kind="stable")
+        target = paths[-1].with_name(f"partition-{partition:02d}-merged-{self.spills:05d}.npy")
+        np.save(target, merged)
+        for path in paths:
+            path.unlink()
+        self.spilled[partition] = [target]
+
+
+def _partition(hashes: np.ndarray) -> np.ndarray:
+    shift = np.uint64(64 - SPILL_PARTITIONS.bit_length() + 1)
+    return (hashes >> shift).astype(np.int64)
+
+
+def _partition_starts() -> np.ndarray:
+    shift = np.uint64(64 - SPILL_PARTITIONS.bit_length() + 1)
+    return np.arange(SPILL_PARTITIONS, dtype=np.uint64) << shift
+
+
+def _isin_sorted(values: np.ndarray, sorted_values: np.ndarray) -> np.ndarray:
+    """Vectorised membership test against a sorted array."""
+    if len(sorted_values) == 0:
+        return np.zeros(len(values), dtype=bool)
+    positions = np.searchsorted(sorted_values, values)
+    positions[positions == len(sorted_values)] = 0
+    return np.asarray(sorted_values[positions] == values)
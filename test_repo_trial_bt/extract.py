@@ -1,37 +1,560 @@
+import glob
+import hashlib
+import io
 import logging
+import multiprocessing
+import os
+from collections.abc import Iterable, Iterator, Sequence
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
-from typing import Any
+from typing import IO, Any
 
+import numpy as np
 import pandas as pd
 
+from .cache import DEFAULT_CACHE_BYTES, FrameCache
+from .transform import column_lookup, has_missing, pushdown_mask
+
 logger = logging.getLogger(__name__)
 
+# Schema types that are parsed as dates while reading rather than set as a dtype
+DATETIME_TYPES = {"date", "datetime", "datetime64", "datetime64[ns]"}
+
+# Column recording which file each row came from in multi-file extracts
+SOURCE_FILE_COLUMN = "source_file"
+
+# Bytes before a watermark that are hashed to detect a rewritten source
+WATERMARK_TAIL_BYTES = 1024
+
+# Parsers accepted by pandas.read_csv. "pyarrow" parses with multiple threads.
+PARSE_ENGINES = ("c", "pyarrow", "python")
+
+# Source types that can be extracted
+SOURCE_TYPES = ("csv", "parquet")
+
+# Rows parsed at a time when filtering a CSV file while it is read
+PUSHDOWN_CHUNK_ROWS = 100_000
+
+# File suffixes that pandas.read_csv decompresses on the fly
+COMPRESSION_SUFFIXES = {
+    ".gz": "gzip",
+    ".bz2": "bz2",
+    ".zst": "zstd",
+    ".xz": "xz",
+    ".zip": "zip",
+}
+
+
+def compression_for(file_path: str) -> str | None:
+    """Get the compression of a file from its suffix.
+
+    Args:
+        file_path: Path to the file
+
+    Returns:
+        Compression name as understood by pandas, or None if uncompressed
+    """
+    return COMPRESSION_SUFFIXES.get(Path(file_path).suffix.lower())
+
+
+def _read_csv(
+    file_path: str,
+    options: dict[str, Any],
+    predicates: list[dict[str, Any]] | None = None,
+) -> pd.DataFrame:
+    """Read a single CSV file; module level so process pools can pickle it.
+
+    With predicates the file is parsed in chunks and rows that cannot pass
+    them are dropped from each chunk, so they are never held all at once.
+    The pyarrow engine cannot read in chunks, so it reads the whole file and
+    the rows are dropped afterwards. Missing values are filled from every
+    row, so if any are found no rows are dropped.
+    """
+    data: pd.DataFrame
+    if not predicates:
+        data = pd.read_csv(file_path, **options)
+        return data
+    if options.get("engine") == "pyarrow":
+        data = pd.read_csv(file_path, **options)
+        if has_missing(data):
+            return data
+        return data.take(np.flatnonzero(pushdown_mask(data, predicates)))
+
+    frames = []
+    with pd.read_csv(file_path, chunksize=PUSHDOWN_CHUNK_ROWS, **options) as reader:
+        for chunk in reader:
+            if has_missing(chunk):
+                break
+            frames.append(chunk.take(np.flatnonzero(pushdown_mask(chunk, predicates))))
+        else:
+            return concat_frames(frames, ignore_index=False)
+    logger.info("%s has missing values, reading every row", file_path)
+    return _read_csv(file_path, options)
+
 
 class DataExtractor:
-    """Class for extracting data from various sources."""
+    """Class for extracting data from various sources.
+
+    CSV files may be compressed with gzip, bz2, zstd, xz or zip, which is
+    detected from the file suffix (e.g. "sales.csv.gz") and decompressed
+    while reading.
+
+    Args:
+        cache_dir: Optional directory for caching parsed files. Repeat reads
+            of an unchanged file with the same options skip CSV parsing.
+        cache_max_bytes: Size limit for the cache directory
+        engine: CSV parser to use (c, pyarrow, python). The pyarrow parser is
+            multithreaded but cannot read in chunks, so chunked reads always
+            use the C parser.
+        memory_map: Memory-map uncompressed files instead of reading them
+            through a buffered file handle (C parser only)
+    """
 
-    def __init__(self) -> None:
-        self.supported_formats = [".csv", ".xlsx", ".json"]
+    def __init__(
+        self,
+        cache_dir: str | None = None,
+        cache_max_bytes: int = DEFAULT_CACHE_BYTES,
+        engine: str = "c",
+        memory_map: bool = False,
+    ) -> None:
+        if engine not in PARSE_ENGINES:
+            msg = f"Unsupported parse engine: {engine}"
+            raise ValueError(msg)
 
-    def extract_csv(self, file_path: str, **kwargs: Any) -> pd.DataFrame:
+        self.supported_formats = [".csv", ".xlsx", ".json", ".parquet"]
+        self.cache = FrameCache(cache_dir, cache_max_bytes) if cache_dir else None
+        self.engine = engine
+        self.memory_map = memory_map
+
+    def extract_csv(
+        self,
+        file_path: str,
+        schema: dict[str, str] | None = None,
+        columns: Iterable[str] | None = None,
+        predicates: list[dict[str, Any]] | None = None,
+        **kwargs: Any,
+    ) -> pd.DataFrame:
         """Extract data from CSV file.
 
         Args:
             file_path: Path to the CSV file
+            schema: Optional mapping of column name to dtype (e.g. "category",
+                "string", "int64", "datetime"). Columns not in the schema
+                are still read, with inferred dtypes.
+            columns: Optional column names to read; other columns are skipped
+                while parsing
+            predicates: Optional predicates from compile_filters. Rows that
+                cannot pass them are dropped as the file is read (see
+                pushdown_mask), unless the file has missing values.
+            **kwargs: Additional arguments for pandas.read_csv
+
+        Returns:
+            DataFrame containing the extracted data
+        """
+        try:
+            logger.info("Extracting data from %s", file_path)
+            cache_key = None
+            if self.cache is not None:
+                cache_key = self.cache.make_key(
+                    file_path,
+                    engine=self.engine,
+                    schema=schema,
+                    columns=sorted(columns) if columns is not None else None,
+                    predicates=predicates,
+                    **kwargs,
+                )
+                cached = self.cache.get(cache_key)
+                if cached is not None:
+                    logger.info("Loaded %d rows for %s from cache", len(cached), file_path)
+                    return cached
+
+            options = {**self.build_read_options(schema, columns), **kwargs}
+            options = self.build_engine_options(file_path, options)
+            data = _read_csv(file_path, options, predicates)
+            logger.info("Successfully extracted %d rows from %s", len(data), file_path)
+            if self.cache is not None and cache_key is not None:
+                self.cache.put(cache_key, data)
+            return data
+        except Exception:
+            logger.exception("Error extracting data from %s", file_path)
+            raise
+
+    def extract_csv_chunks(
+        self,
+        file_path: str,
+        chunk_size: int,
+        schema: dict[str, str] | None = None,
+        columns: Iterable[str] | None = None,
+        *,
+        predicates: list[dict[str, Any]] | None = None,
+        **kwargs: Any,
+    ) -> Iterator[pd.DataFrame]:
+        """Extract data from CSV file in chunks of a fixed number of rows.
+
+        Args:
+            file_path: Path to the CSV file
+            chunk_size: Maximum number of rows per chunk
+            schema: Optional mapping of column name to dtype, as for extract_csv
+            columns: Optional column names to read, as for extract_csv
+            predicates: Optional predicates, as for extract_csv. Chunks then
+                hold at most chunk_size rows before filtering, and chunks
+                with missing values are not filtered.
+            **kwargs: Additional arguments for pandas.read_csv
+
+        Yields:
+            DataFrames of at most chunk_size rows each
+        """
+        try:
+            logger.info("Extracting data from %s in chunks of %d rows", file_path, chunk_size)
+            total_rows = 0
+            options = {**self.build_read_options(schema, columns), **kwargs}
+            options = self.build_engine_options(file_path, options, engine="c")
+            with pd.read_csv(file_path, chunksize=chunk_size, **options) as reader:
+                for chunk in reader:
+                    if predicates and not has_missing(chunk):
+                        chunk = chunk.take(np.flatnonzero(pushdown_mask(chunk, predicates)))  # noqa: PLW2901
+                    total_rows += len(chunk)
+                    yield chunk
+            logger.info("Successfully extracted %d rows from %s", total_rows, file_path)
+        except Exception:
+            logger.exception("Error extracting data from %s", file_path)
+            raise
+
+    def extract_csv_files(
+        self,
+        file_paths: Sequence[str],
+        schema: dict[str, str] | None = None,
+        columns: Iterable[str] | None = None,
+        *,
+        max_workers: int | None = None,
+        use_processes: bool = False,
+        predicates: list[dict[str, Any]] | None = None,
+        **kwargs: Any,
+    ) -> pd.DataFrame:
+        """Extract and combine data from several CSV files in parallel.
+
+        Args:
+            file_paths: Paths to the CSV files
+            schema: Optional mapping of column name to dtype, as for extract_csv
+            columns: Optional column names to read, as for extract_csv
+            max_workers: Maximum number of files read at once, defaults to the
+                executor's own default
+            use_processes: Read files in a process pool rather than threads.
+                Processes avoid the GIL but pay to send each frame back, and
+                do not use the cache.
+            predicates: Optional predicates, as for extract_csv. Missing
+                values are filled from the rows of every file, so if any
+                file has them no rows are dropped from the others either.
+            **kwargs: Additional arguments for pandas.read_csv
+
+        Returns:
+            DataFrame with the rows of every file in order, plus a source_file
+            column naming the file each row came from
+        """
+        try:
+            logger.info("Extracting data from %d files", len(file_paths))
+
+            def read_files(
+                paths: Sequence[str], predicates: list[dict[str, Any]] | None
+            ) -> list[pd.DataFrame]:
+                return self._read_files(
+                    paths,
+                    schema=schema,
+                    columns=columns,
+                    max_workers=max_workers,
+                    use_processes=use_processes,
+                    predicates=predicates,
+                    **kwargs,
+                )
+
+            frames = read_files(file_paths, predicates)
+            # A file is only read whole when it has missing values
+            if predicates and any(has_missing(frame) for frame in frames):
+                filtered = [i for i, frame in enumerate(frames) if not has_missing(frame)]
+                logger.info("Reading %d filtered files again in full", len(filtered))
+                full = read_files([file_paths[i] for i in filtered], None)
+                for i, frame in zip(filtered, full, strict=True):
+                    frames[i] = frame
+        except Exception:
+            logger.exception("Error extracting data from %d files", len(file_paths))
+            raise
+
+        for path, frame in zip(file_paths, frames, strict=True):
+            frame[SOURCE_FILE_COLUMN] = path
+        data = concat_frames(frames)
+        data[SOURCE_FILE_COLUMN] = data[SOURCE_FILE_COLUMN].astype("category")
+        logger.info("Successfully extracted %d rows from %d files", len(data), len(file_paths))
+        return data
+
+    def _read_files(
+        self,
+        file_paths: Sequence[str],
+        *,
+        schema: dict[str, str] | None,
+        columns: Iterable[str] | None,
+        max_workers: int | None,
+        use_processes: bool,
+        predicates: list[dict[str, Any]] | None,
+        **kwargs: Any,
+    ) -> list[pd.DataFrame]:
+        if use_processes:
+            options = {**self.build_read_options(schema, columns), **kwargs}
+            file_options = [self.build_engine_options(path, options) for path in file_paths]
+            # Spawned workers avoid forking a process that may already hold threads
+            context = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(max_workers, mp_context=context) as pool:
+                return list(
+                    pool.map(_read_csv, file_paths, file_options, [predicates] * len(file_paths))
+                )
+        with ThreadPoolExecutor(max_workers) as pool:
+            return list(
+                pool.map(
+                    lambda path: self.extract_csv(path, schema, columns, predicates, **kwargs),
+                    file_paths,
+                )
+            )
+
+    def extract_csv_incremental(
+        self,
+        file_path: str,
+        watermark: dict[str, Any] | None = None,
+        schema: dict[str, str] | None = None,
+        columns: Iterable[str] | None = None,
+        predicates: list[dict[str, Any]] | None = None,
+        **kwargs: Any,
+    ) -> tuple[pd.DataFrame, dict[str, Any]]:
+        """Extract the rows appended to a CSV file since a watermark.
+
+        Only bytes after the watermark are read and parsed. A trailing partial
+        line, for example one still being written, is left for the next run.
+        If the next run finds the file unchanged, with the same size and
+        modification time, the line is taken to be the final row of a file
+        that does not end in a newline and is read. If the header, or the
+        bytes just before the watermark, no longer match then the file was
+        rewritten and it is read again from the start.
+
+        Args:
+            file_path: Path to the CSV file
+            watermark: Watermark returned by a previous call, or None to read
+                the whole file
+            schema: Optional mapping of column name to dtype, as for extract_csv
+            columns: Optional column names to read, as for extract_csv
+            predicates: Optional predicates, as for extract_csv. New rows
+                are not filtered if any of them have missing values.
             **kwargs: Additional arguments for pandas.read_csv
 
+        Returns:
+            Tuple of the new rows and the updated watermark. The watermark's
+            is_delta flag is False when the whole file was read.
+        """
+        if compression_for(file_path) is not None:
+            msg = f"Incremental extraction needs an uncompressed source: {file_path}"
+            raise ValueError(msg)
+
+        try:
+            with open(file_path, "rb") as f:
+                header = f.readline()
+                header_hash = hashlib.blake2b(header).hexdigest()
+                size = f.seek(0, io.SEEK_END)
+                state = {"size": size, "mtime_ns": os.fstat(f.fileno()).st_mtime_ns}
+
+                is_delta = (
+                    watermark is not None
+                    and watermark["header_hash"] == header_hash
+                    and len(header) <= watermark["offset"] <= size
+                    and _tail_hash(f, watermark["offset"]) == watermark["tail_hash"]
+                )
+                start = watermark["offset"] if watermark is not None and is_delta else len(header)
+
+                complete = _line_end(f, start, size)
+                # The same partial line as last time, in an unchanged file
+                settled = is_delta and watermark is not None and watermark.get("pending") == state
+                pending = complete < size and not settled
+                end = complete if pending else size
+                logger.info("Extracting bytes %d-%d of %s", start, end, file_path)
+
+                # The header and new bytes are parsed straight from the file
+                f.seek(start)
+                stream = io.BufferedReader(_ByteRange(f, header, end))
+                options = {**self.build_read_options(schema, columns), **kwargs}
+                options = self.build_engine_options(io.BytesIO(header), options)
+                data: pd.DataFrame = pd.read_csv(stream, **options)
+                tail_hash = _tail_hash(f, end)
+
+            rows_read = len(data)
+            if predicates and not has_missing(data):
+                data = data.take(np.flatnonzero(pushdown_mask(data, predicates)))
+            rows_before = watermark["rows"] if watermark is not None and is_delta else 0
+            new_watermark = {
+                "source": str(Path(file_path).resolve()),
+                "offset": end,
+                "rows": rows_before + rows_read,
+                "header_hash": header_hash,
+                "tail_hash": tail_hash,
+                "is_delta": is_delta,
+                # File state when a partial line was left unread
+                "pending": state if pending else None,
+            }
+            logger.info("Successfully extracted %d new rows from %s", len(data), file_path)
+            return data, new_watermark
+        except Exception:
+            logger.exception("Error extracting data from %s", file_path)
+            raise
+
+    def extract_parquet(
+        self,
+        file_path: str,
+        schema: dict[str, str] | None = None,
+        columns: Iterable[str] | None = None,
+        predicates: list[dict[str, Any]] | None = None,
+    ) -> pd.DataFrame:
+        """Extract data from Parquet file.
+
+        Predicates are passed to pyarrow, which skips whole row groups whose
+        column statistics show that no row can pass, before filtering the
+        rest. They are ignored if the column statistics show that the read
+        columns have missing values, which are filled from every row.
+
+        Args:
+            file_path: Path to the Parquet file
+            schema: Optional mapping of column name to dtype, applied after
+                reading. Columns not in the schema keep their stored types.
+            columns: Optional column names to read
+            predicates: Optional predicates from compile_filters
+
         Returns:
             DataFrame containing the extracted data
         """
+        import pyarrow.dataset as ds  # noqa: PLC0415
+
         try:
             logger.info("Extracting data from %s", file_path)
-            data: pd.DataFrame = pd.read_csv(file_path, **kwargs)
+            dataset = ds.dataset(file_path, format="parquet")
+            projection = _projection(dataset.schema.names, columns)
+            if predicates and _has_nulls(dataset, projection):
+                logger.info("%s has missing values, reading every row", file_path)
+                predicates = None
+            table = dataset.to_table(
+                columns=projection,
+                filter=_arrow_filter(dataset.schema.names, predicates),
+            )
+            data = _apply_schema(table.to_pandas(), schema)
             logger.info("Successfully extracted %d rows from %s", len(data), file_path)
             return data
         except Exception:
             logger.exception("Error extracting data from %s", file_path)
             raise
 
+    def extract_parquet_chunks(
+        self,
+        file_path: str,
+        chunk_size: int,
+        schema: dict[str, str] | None = None,
+        columns: Iterable[str] | None = None,
+        *,
+        predicates: list[dict[str, Any]] | None = None,
+    ) -> Iterator[pd.DataFrame]:
+        """Extract data from Parquet file in batches of at most chunk_size rows.
+
+        Args:
+            file_path: Path to the Parquet file
+            chunk_size: Maximum number of rows per chunk
+            schema: Optional mapping of column name to dtype, as for extract_parquet
+            columns: Optional column names to read
+            predicates: Optional predicates, as for extract_parquet
+
+        Yields:
+            DataFrames of at most chunk_size rows each
+        """
+        import pyarrow.dataset as ds  # noqa: PLC0415
+
+        try:
+            logger.info("Extracting data from %s in chunks of %d rows", file_path, chunk_size)
+            dataset = ds.dataset(file_path, format="parquet")
+            projection = _projection(dataset.schema.names, columns)
+            if predicates and _has_nulls(dataset, projection):
+                logger.info("%s has missing values, reading every row", file_path)
+                predicates = None
+            batches = dataset.to_batches(
+                columns=projection,
+                filter=_arrow_filter(dataset.schema.names, predicates),
+                batch_size=chunk_size,
+            )
+            total_rows = 0
+            for batch in batches:
+                total_rows += batch.num_rows
+                yield _apply_schema(batch.to_pandas(), schema)
+            logger.info("Successfully extracted %d rows from %s", total_rows, file_path)
+        except Exception:
+            logger.exception("Error extracting data from %s", file_path)
+            raise
+
+    def build_read_options(
+        self, schema: dict[str, str] | None, columns: Iterable[str] | None = None
+    ) -> dict[str, Any]:
+        """Translate a column schema into pandas.read_csv arguments.
+
+        Args:
+            schema: Mapping of column name to dtype, or None
+            columns: Column names to read, or None to read every column.
+                The schema only sets dtypes and never limits the columns.
+
+        Returns:
+            Dictionary of keyword arguments for pandas.read_csv
+        """
+        options: dict[str, Any] = {}
+        wanted = set(columns) if columns is not None else None
+        if wanted is not None:
+            # A callable skips columns absent from the file instead of raising
+            options["usecols"] = wanted.__contains__
+
+        if schema:
+            selected = {
+                column: dtype
+                for column, dtype in schema.items()
+                if wanted is None or column in wanted
+            }
+            dtypes = {c: t for c, t in selected.items() if t.lower() not in DATETIME_TYPES}
+            dates = [c for c, t in selected.items() if t.lower() in DATETIME_TYPES]
+            if dtypes:
+                options["dtype"] = dtypes
+            if dates:
+                options["parse_dates"] = dates
+
+        return options
+
+    def build_engine_options(
+        self,
+        source: str | IO[bytes],
+        options: dict[str, Any],
+        engine: str | None = None,
+    ) -> dict[str, Any]:
+        """Add the parse engine and memory-mapping settings for one source.
+
+        Args:
+            source: Path to the file, or a binary buffer holding its contents
+            options: Keyword arguments for pandas.read_csv built so far
+            engine: Parser to use instead of the configured one
+
+        Returns:
+            Dictionary of keyword arguments for pandas.read_csv
+        """
+        engine = engine or self.engine
+        options = {"engine": engine, **options}
+
+        if engine == "c" and self.memory_map and isinstance(source, str):
+            options.setdefault("memory_map", compression_for(source) is None)
+
+        usecols = options.get("usecols")
+        if engine == "pyarrow" and callable(usecols):
+            # The pyarrow parser only takes a list, so match against the header
+            header = pd.read_csv(source, nrows=0).columns
+            if not isinstance(source, str):
+                source.seek(0)
+            options["usecols"] = [column for column in header if usecols(column)]
+
+        return options
+
     def validate_file_exists(self, file_path: str) -> bool:
         """Validate that the file exists.
 
@@ -60,27 +583,371 @@ class DataExtractor:
             "size_bytes": Path(file_path).stat().st_size,
             "suffix": Path(file_path).suffix,
             "name": Path(file_path).name,
+            "compression": compression_for(file_path),
         }
 
 
-def extract_from_source(source_path: str, source_type: str = "csv") -> pd.DataFrame:
-    """Helper function to extract data from a source.
+class _ByteRange(io.RawIOBase):
+    """Read-only stream of a prefix, then a file from its position to end."""
+
+    def __init__(self, f: IO[bytes], prefix: bytes, end: int) -> None:
+        super().__init__()
+        self.f = f
+        self.prefix = prefix
+        self.end = end
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        view = memoryview(buffer).cast("B")
+        if self.prefix:
+            data, self.prefix = self.prefix[: len(view)], self.prefix[len(view) :]
+        else:
+            data = self.f.read(max(0, min(len(view), self.end - self.f.tell())))
+        view[: len(data)] = data
+        return len(data)
+
+
+def _line_end(f: IO[bytes], start: int, size: int) -> int:
+    """Find the offset just after the last newline between start and size.
+
+    The file is searched backwards in blocks, so only the final line is read.
+
+    Returns:
+        Offset after the last newline, or start if there is none
+    """
+    end = size
+    while end > start:
+        block_start = max(start, end - WATERMARK_TAIL_BYTES)
+        f.seek(block_start)
+        newline = f.read(end - block_start).rfind(b"\n")
+        if newline >= 0:
+            return block_start + newline + 1
+        end = block_start
+    return start
+
+
+def _tail_hash(f: IO[bytes], offset: int) -> str:
+    """Hash the bytes just before an offset in a binary file."""
+    start = max(0, offset - WATERMARK_TAIL_BYTES)
+    f.seek(start)
+    return hashlib.blake2b(f.read(offset - start)).hexdigest()
+
+
+def _projection(names: list[str], columns: Iterable[str] | None) -> list[str] | None:
+    """Columns of a Parquet file to read, in file order, or None for all."""
+    if columns is None:
+        return None
+    wanted = set(columns)
+    return [name for name in names if name in wanted]
+
+
+def _has_nulls(dataset: Any, columns: list[str] | None) -> bool:
+    """Check Parquet column statistics for missing values in the read columns.
+
+    Columns without a null count are assumed to have missing values.
+    """
+    import pyarrow.parquet as pq  # noqa: PLC0415
+
+    for path in dataset.files:
+        metadata = pq.read_metadata(path, filesystem=dataset.filesystem)
+        for group in range(metadata.num_row_groups):
+            row_group = metadata.row_group(group)
+            for index in range(row_group.num_columns):
+                column = row_group.column(index)
+                if columns is not None and column.path_in_schema not in columns:
+                    continue
+                statistics = column.statistics
+                if statistics is None or not statistics.has_null_count or statistics.null_count:
+                    return True
+    return False
+
+
+def _arrow_filter(names: list[str], predicates: list[dict[str, Any]] | None) -> Any:
+    """Build a pyarrow filter expression equivalent to pushdown_mask."""
+    import pyarrow.compute as pc  # noqa: PLC0415
+
+    lookup = column_lookup(pd.Index(names))
+    expression = None
+    for predicate in predicates or []:
+        column = lookup.get(predicate["column"])
+        if column is None:
+            continue
+        field, value = pc.field(column), predicate["value"]
+        if predicate["op"] == ">=":
+            condition = field >= value
+        elif predicate["op"] == "<=":
+            condition = field <= value
+        elif predicate["op"] == "in":
+            condition = field.isin(value)
+        else:
+            condition = field == value
+        # Missing values are kept because clean_data may fill them
+        condition = condition | field.is_null()
+        expression = condition if expression is None else expression & condition
+    return expression
+
+
+def _apply_schema(data: pd.DataFrame, schema: dict[str, str] | None) -> pd.DataFrame:
+    """Cast already-parsed columns to the dtypes of a schema."""
+    selected = {c: t for c, t in (schema or {}).items() if c in data.columns}
+    dtypes = {c: t for c, t in selected.items() if t.lower() not in DATETIME_TYPES}
+    if dtypes:
+        data = data.astype(dtypes)
+    for column, dtype in selected.items():
+        if dtype.lower() in DATETIME_TYPES:
+            data[column] = pd.to_datetime(data[column])
+    return data
+
+
+def concat_frames(frames: list[pd.DataFrame], ignore_index: bool = True) -> pd.DataFrame:
+    """Concatenate frames, keeping columns that are categorical in every frame.
+
+    pandas falls back to object dtype when categoricals with different
+    categories are concatenated, which would undo a categorical schema.
 
     Args:
-        source_path: Path to the data source
-        source_type: Type of source (csv, xlsx, json)
+        frames: DataFrames to concatenate
+        ignore_index: Give the result a fresh index instead of keeping the
+            frames' own index labels
 
     Returns:
-        DataFrame containing the extracted data
+        Concatenated DataFrame
+    """
+    if not frames:
+        return pd.DataFrame()
+    categorical = [
+        column
+        for column in frames[0].columns
+        if all(
+            column in frame.columns and isinstance(frame[column].dtype, pd.CategoricalDtype)
+            for frame in frames
+        )
+    ]
+    data = pd.concat(frames, ignore_index=ignore_index)
+    for column in categorical:
+        data[column] = pd.api.types.union_categoricals([frame[column] for frame in frames])
+    return data
+
+
+def resolve_source_paths(source_path: str | Sequence[str]) -> list[str]:
+    """Expand a path, glob pattern, or list of either into file paths.
+
+    Args:
+        source_path: Path, glob pattern (e.g. "data/sales_*.csv") or a list
+            of paths and patterns
+
+    Returns:
+        List of file paths, with each glob's matches in sorted order. Paths
+        without wildcards are returned as given, whether or not they exist.
     """
-    extractor = DataExtractor()
+    patterns = [source_path] if isinstance(source_path, str) else list(source_path)
+    paths: list[str] = []
+    for pattern in patterns:
+        if is_glob_pattern(pattern):
+            paths.extend(sorted(glob.glob(pattern)))
+        else:
+            paths.append(pattern)
+    return paths
+
+
+def is_glob_pattern(path: str) -> bool:
+    """Check whether a path contains glob wildcards.
 
-    if not extractor.validate_file_exists(source_path):
+    Args:
+        path: Path to check
+
+    Returns:
+        True if the path contains *, ? or [ wildcards
+    """
+    return any(char in path for char in "*?[")
+
+
+def _validate_source(
+    extractor: DataExtractor, source_path: str | Sequence[str], source_type: str
+) -> list[str]:
+    """Resolve and validate a source before extraction.
+
+    Args:
+        extractor: Extractor used to check the files
+        source_path: Path, glob pattern or list of either
+        source_type: Type of source
+
+    Returns:
+        List of file paths to read
+    """
+    paths = resolve_source_paths(source_path)
+    if not paths:
         msg = f"Source file not found: {source_path}"
         raise FileNotFoundError(msg)
 
-    if source_type.lower() == "csv":
-        return extractor.extract_csv(source_path)
+    for path in paths:
+        if not extractor.validate_file_exists(path):
+            msg = f"Source file not found: {path}"
+            raise FileNotFoundError(msg)
+
+    if source_type.lower() not in SOURCE_TYPES:
+        msg = f"Unsupported source type: {source_type}"
+        raise ValueError(msg)
+
+    if source_type.lower() != "csv" and _is_multi_source(source_path):
+        msg = f"Multi-file sources must be CSV, got {source_type}"
+        raise ValueError(msg)
+
+    return paths
+
+
+def _is_multi_source(source_path: str | Sequence[str]) -> bool:
+    return not isinstance(source_path, str) or is_glob_pattern(source_path)
+
+
+def extract_from_source(
+    source_path: str | Sequence[str],
+    source_type: str = "csv",
+    schema: dict[str, str] | None = None,
+    columns: Iterable[str] | None = None,
+    *,
+    predicates: list[dict[str, Any]] | None = None,
+    max_workers: int | None = None,
+    use_processes: bool = False,
+    extractor: DataExtractor | None = None,
+) -> pd.DataFrame:
+    """Helper function to extract data from a source.
+
+    Args:
+        source_path: Path to the data source, a glob pattern, or a list of
+            either. Multiple files are read in parallel and tagged with a
+            source_file column.
+        source_type: Type of source (csv, parquet)
+        schema: Optional mapping of column name to dtype
+        columns: Optional column names to read
+        predicates: Optional predicates from compile_filters; rows that
+            cannot pass them are dropped while reading
+        max_workers: Maximum number of files read at once
+        use_processes: Read files in a process pool rather than threads
+        extractor: Optional configured extractor to use, e.g. one with a cache
+
+    Returns:
+        DataFrame containing the extracted data
+    """
+    extractor = extractor or DataExtractor()
+    paths = _validate_source(extractor, source_path, source_type)
+
+    if source_type.lower() == "parquet":
+        return extractor.extract_parquet(paths[0], schema, columns, predicates)
+
+    if not _is_multi_source(source_path):
+        return extractor.extract_csv(paths[0], schema, columns, predicates)
+
+    return extractor.extract_csv_files(
+        paths,
+        schema,
+        columns,
+        max_workers=max_workers,
+        use_processes=use_processes,
+        predicates=predicates,
+    )
+
+
+def extract_chunks_from_source(
+    source_path: str | Sequence[str],
+    source_type: str = "csv",
+    chunk_size: int = 100_000,
+    schema: dict[str, str] | None = None,
+    columns: Iterable[str] | None = None,
+    *,
+    predicates: list[dict[str, Any]] | None = None,
+    extractor: DataExtractor | None = None,
+) -> Iterator[pd.DataFrame]:
+    """Helper function to extract data from a source in chunks.
+
+    The source is validated up front so that a missing file or unsupported
+    type fails immediately rather than on the first iteration.
+
+    Args:
+        source_path: Path to the data source, a glob pattern, or a list of
+            either. Multiple files are streamed one after another and tagged
+            with a source_file column.
+        source_type: Type of source (csv, parquet)
+        chunk_size: Maximum number of rows per chunk
+        schema: Optional mapping of column name to dtype
+        columns: Optional column names to read
+        predicates: Optional predicates from compile_filters
+        extractor: Optional configured extractor to use
+
+    Returns:
+        Iterator of DataFrame chunks
+    """
+    extractor = extractor or DataExtractor()
+    paths = _validate_source(extractor, source_path, source_type)
+
+    if chunk_size < 1:
+        msg = f"chunk_size must be a positive integer, got {chunk_size}"
+        raise ValueError(msg)
+
+    if source_type.lower() == "parquet":
+        return extractor.extract_parquet_chunks(
+            paths[0], chunk_size, schema, columns, predicates=predicates
+        )
+
+    if not _is_multi_source(source_path):
+        return extractor.extract_csv_chunks(
+            paths[0], chunk_size, schema, columns, predicates=predicates
+        )
+
+    return _tagged_chunks(extractor, paths, chunk_size, schema, columns, predicates=predicates)
+
+
+def extract_increment_from_source(
+    source_path: str | Sequence[str],
+    source_type: str = "csv",
+    watermark: dict[str, Any] | None = None,
+    schema: dict[str, str] | None = None,
+    columns: Iterable[str] | None = None,
+    *,
+    predicates: list[dict[str, Any]] | None = None,
+    extractor: DataExtractor | None = None,
+) -> tuple[pd.DataFrame, dict[str, Any]]:
+    """Helper function to extract the rows appended to a source since a watermark.
+
+    Args:
+        source_path: Path to a single append-only data source
+        source_type: Type of source (csv)
+        watermark: Watermark from the previous extract, or None to read everything
+        schema: Optional mapping of column name to dtype
+        columns: Optional column names to read
+        predicates: Optional predicates from compile_filters
+        extractor: Optional configured extractor to use
+
+    Returns:
+        Tuple of the new rows and the updated watermark
+    """
+    if _is_multi_source(source_path):
+        msg = f"Incremental extraction needs a single source file, got {source_path}"
+        raise ValueError(msg)
+
+    extractor = extractor or DataExtractor()
+    paths = _validate_source(extractor, source_path, source_type)
+    if source_type.lower() != "csv":
+        msg = f"Incremental extraction needs a CSV source, got {source_type}"
+        raise ValueError(msg)
+    return extractor.extract_csv_incremental(paths[0], watermark, schema, columns, predicates)
+
 
-    msg = f"Unsupported source type: {source_type}"
-    raise ValueError(msg)
+def _tagged_chunks(
+    extractor: DataExtractor,
+    paths: list[str],
+    chunk_size: int,
+    schema: dict[str, str] | None,
+    columns: Iterable[str] | None,
+    *,
+    predicates: list[dict[str, Any]] | None,
+) -> Iterator[pd.DataFrame]:
+    for path in paths:
+        chunks = extractor.extract_csv_chunks(
+            path, chunk_size, schema, columns, predicates=predicates
+        )
+        for chunk in chunks:
+            chunk[SOURCE_FILE_COLUMN] = path
+            yield chunk
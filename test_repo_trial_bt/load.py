@@ -1,19 +1,40 @@
+import contextlib
+import functools
+import gzip
 import json
 import logging
+import shutil
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any
+from types import TracebackType
+from typing import IO, Any, Self
 
 import pandas as pd
 
+from .database import DEFAULT_SQL_BATCH_ROWS, DEFAULT_SQLITE_POOL, SQLitePool, insert_frame
+from .stats import SummaryStatistics
+
 logger = logging.getLogger(__name__)
 
+# Rows serialised per write to JSON Lines output, which bounds the size of the
+# string built in memory whatever the size of the frame
+DEFAULT_JSON_BATCH_ROWS = 10_000
+
 
 class DataLoader:
-    """Class for loading data to various destinations."""
+    """Class for loading data to various destinations.
 
-    def __init__(self) -> None:
-        self.supported_formats = [".csv", ".xlsx", ".json", ".parquet"]
+    Args:
+        sqlite_pool: Pool of SQLite connections used by load_to_sqlite,
+            shared by every loader if not given
+    """
+
+    def __init__(self, sqlite_pool: SQLitePool | None = None) -> None:
+        self.supported_formats = [".csv", ".xlsx", ".json", ".jsonl", ".parquet", ".db"]
         self.load_summary: dict[str, Any] = {}
+        self.sqlite_pool = sqlite_pool or DEFAULT_SQLITE_POOL
 
     def load_to_csv(self, df: pd.DataFrame, output_path: str, **kwargs: Any) -> bool:
         """Load DataFrame to CSV file.
@@ -52,12 +73,41 @@ class DataLoader:
             self.load_summary[output_path] = {"status": "failed", "error": str(e)}
             return False
 
-    def load_to_parquet(self, df: pd.DataFrame, output_path: str, **kwargs: Any) -> bool:
-        """Load DataFrame to Parquet file.
+    def load_to_parquet(
+        self,
+        df: pd.DataFrame,
+        output_path: str,
+        *,
+        partition_cols: list[str] | None = None,
+        row_group_size: int | None = None,
+        compression: str | None = "snappy",
+        use_dictionary: bool | list[str] = True,
+        write_statistics: bool | list[str] = True,
+        append: bool = False,
+        **kwargs: Any,
+    ) -> bool:
+        """Load DataFrame to a Parquet file or a partitioned Parquet dataset.
+
+        With partition_cols the output path is a directory of hive-style
+        partitions (e.g. year=2024/month=1/region=North/), so readers can skip
+        whole partitions, and the column statistics of each row group let
+        them skip row groups as well.
 
         Args:
             df: DataFrame to save
-            output_path: Path where to save the Parquet file
+            output_path: Path where to save the Parquet file, or the root
+                directory of the dataset when partitioning
+            partition_cols: Columns to partition the dataset by, e.g.
+                ["year", "month", "region"]
+            row_group_size: Maximum rows per row group, the pyarrow default
+                if not given
+            compression: Compression codec, e.g. snappy, zstd, gzip or None
+            use_dictionary: Dictionary-encode all columns, or only those listed
+            write_statistics: Write min/max statistics for all columns, or
+                only those listed
+            append: Add new partition files to an existing dataset instead of
+                replacing it. Files already written are left untouched.
+                Requires partition_cols.
             **kwargs: Additional arguments for pandas.to_parquet
 
         Returns:
@@ -70,16 +120,34 @@ class DataLoader:
             output_dir = Path(output_path).parent
             output_dir.mkdir(parents=True, exist_ok=True)
 
+            options = {
+                "compression": compression,
+                "use_dictionary": use_dictionary,
+                "write_statistics": write_statistics,
+                **kwargs,
+            }
+            if row_group_size is not None:
+                options["row_group_size"] = row_group_size
+
             # Save to Parquet
-            df.to_parquet(output_path, index=False, **kwargs)
+            if partition_cols:
+                partitions = write_parquet_dataset(
+                    df, output_path, partition_cols, append=append, **options
+                )
+            else:
+                _write_parquet_file(df, output_path, append=append, **options)
 
             # Update load summary
             self.load_summary[output_path] = {
                 "rows": len(df),
                 "columns": len(df.columns),
                 "format": "parquet",
+                "compression": compression,
                 "status": "success",
             }
+            if partition_cols:
+                self.load_summary[output_path]["partition_cols"] = list(partition_cols)
+                self.load_summary[output_path]["partitions"] = partitions
 
             logger.info("Successfully loaded data to %s", output_path)
             return True
@@ -89,12 +157,26 @@ class DataLoader:
             self.load_summary[output_path] = {"status": "failed", "error": str(e)}
             return False
 
-    def load_to_json(self, df: pd.DataFrame, output_path: str, **kwargs: Any) -> bool:
+    def load_to_json(
+        self,
+        df: pd.DataFrame,
+        output_path: str,
+        *,
+        lines: bool = False,
+        batch_size: int = DEFAULT_JSON_BATCH_ROWS,
+        compression: str | None = "infer",
+        **kwargs: Any,
+    ) -> bool:
         """Load DataFrame to JSON file.
 
         Args:
             df: DataFrame to save
             output_path: Path where to save the JSON file
+            lines: Write JSON Lines, one record per line, in batches of
+                batch_size rows instead of a single indented array
+            batch_size: Rows serialised at a time when writing JSON Lines
+            compression: Compression of JSON Lines output, gzip or None.
+                infer uses gzip for paths ending .gz.
             **kwargs: Additional arguments for pandas.to_json
 
         Returns:
@@ -108,13 +190,18 @@ class DataLoader:
             output_dir.mkdir(parents=True, exist_ok=True)
 
             # Save to JSON
-            df.to_json(output_path, orient="records", indent=2, **kwargs)
+            if lines:
+                write_json_lines(
+                    df, output_path, batch_size=batch_size, compression=compression, **kwargs
+                )
+            else:
+                df.to_json(output_path, orient="records", indent=2, **kwargs)
 
             # Update load summary
             self.load_summary[output_path] = {
                 "rows": len(df),
                 "columns": len(df.columns),
-                "format": "json",
+                "format": "jsonl" if lines else "json",
                 "status": "success",
             }
 
@@ -126,6 +213,116 @@ class DataLoader:
             self.load_summary[output_path] = {"status": "failed", "error": str(e)}
             return False
 
+    def load_to_sqlite(
+        self,
+        df: pd.DataFrame,
+        database: str,
+        table: str | None = None,
+        *,
+        primary_key: list[str] | None = None,
+        batch_size: int = DEFAULT_SQL_BATCH_ROWS,
+        if_exists: str = "replace",
+    ) -> bool:
+        """Load DataFrame to a SQLite table with batched inserts.
+
+        Uses a pooled connection with bulk-load pragmas and inserts every
+        row in one transaction. See load_to_database for other databases.
+
+        Args:
+            df: DataFrame to save
+            database: Path of the SQLite database file
+            table: Name of the table, defaulting to the database file's stem
+            primary_key: Columns of the table's primary key. Rows whose key
+                is already in the table are updated (upsert).
+            batch_size: Rows per executemany call
+            if_exists: replace the table, append to it, or fail if it exists
+
+        Returns:
+            True if successful, False otherwise
+        """
+        table = table or Path(database).stem
+        try:
+            logger.info("Loading %d rows to %s in %s", len(df), table, database)
+            with self.sqlite_pool.connection(database) as connection:
+                stats = insert_frame(
+                    connection,
+                    df,
+                    table,
+                    primary_key=primary_key,
+                    batch_size=batch_size,
+                    if_exists=if_exists,
+                )
+            self._record_database_load(database, table, df, stats, "sqlite")
+            logger.info("Successfully loaded data to %s in %s", table, database)
+            return True
+
+        except Exception as e:
+            logger.exception("Error loading data to %s", database)
+            self.load_summary[database] = {"status": "failed", "error": str(e)}
+            return False
+
+    def load_to_database(
+        self,
+        df: pd.DataFrame,
+        connection: Any,
+        table: str,
+        *,
+        primary_key: list[str] | None = None,
+        batch_size: int = DEFAULT_SQL_BATCH_ROWS,
+        if_exists: str = "append",
+        placeholder: str = "?",
+    ) -> bool:
+        """Load DataFrame to a table through any DB-API connection.
+
+        Upserts use INSERT ... ON CONFLICT, which SQLite and PostgreSQL support.
+
+        Args:
+            df: DataFrame to save
+            connection: Open DB-API connection, which is left open
+            table: Name of the table
+            primary_key: Columns of the table's primary key, for upserts
+            batch_size: Rows per executemany call
+            if_exists: append to the table, replace it, or fail if it exists
+            placeholder: Parameter placeholder of the driver, e.g. "%s"
+
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            logger.info("Loading %d rows to %s", len(df), table)
+            stats = insert_frame(
+                connection,
+                df,
+                table,
+                primary_key=primary_key,
+                batch_size=batch_size,
+                if_exists=if_exists,
+                placeholder=placeholder,
+            )
+            self._record_database_load(table, table, df, stats, "database")
+            logger.info("Successfully loaded data to %s", table)
+            return True
+
+        except Exception as e:
+            logger.exception("Error loading data to %s", table)
+            self.load_summary[table] = {"status": "failed", "error": str(e)}
+            return False
+
+    def _record_database_load(
+        self, key: str, table: str, df: pd.DataFrame, stats: dict[str, Any], format_type: str
+    ) -> None:
+        seconds = stats["seconds"]
+        self.load_summary[key] = {
+            "rows": len(df),
+            "columns": len(df.columns),
+            "format": format_type,
+            "table": table,
+            "batches": stats["batches"],
+            "seconds": round(seconds, 6),
+            "rows_per_second": round(len(df) / seconds) if seconds > 0 else None,
+            "status": "success",
+        }
+
     def get_load_summary(self) -> dict[str, Any]:
         """Get summary of all load operations.
 
@@ -150,36 +347,512 @@ class DataLoader:
             return False
 
 
-def save_to_destination(df: pd.DataFrame, output_path: str, format_type: str = "csv") -> bool:
+class StreamingWriter:
+    """Write a sequence of DataFrame chunks to a single output file.
+
+    Produces the same file that the matching DataLoader method would write for
+    the concatenated chunks, while only holding one chunk in memory at a time.
+
+    Args:
+        output_path: Path of the output file. JSON Lines output to a path
+            ending .gz is gzip-compressed.
+        format_type: Type of format (csv, parquet, json, jsonl, sqlite)
+        append: Add to an existing output file instead of replacing it. Only
+            formats listed in appendable_formats, and partitioned Parquet
+            datasets, support this.
+        parquet_options: Arguments for DataLoader.load_to_parquet, such as
+            partition_cols, row_group_size, compression, use_dictionary and
+            write_statistics. With partition_cols every chunk adds files to
+            a partitioned dataset.
+        sqlite_options: Arguments for DataLoader.load_to_sqlite, such as
+            table, primary_key and batch_size. if_exists applies to the
+            first chunk of an output that is not appended to. Each chunk is
+            inserted in its own transaction.
+    """
+
+    supported_formats = ("csv", "parquet", "json", "jsonl", "sqlite")
+    appendable_formats = ("csv", "jsonl", "sqlite")
+
+    def __init__(
+        self,
+        output_path: str,
+        format_type: str = "csv",
+        append: bool = False,
+        *,
+        parquet_options: dict[str, Any] | None = None,
+        sqlite_options: dict[str, Any] | None = None,
+    ) -> None:
+        self.output_path = output_path
+        self.format_type = format_type.lower()
+        if self.format_type not in self.supported_formats:
+            msg = f"Unsupported format type: {format_type}"
+            raise ValueError(msg)
+        self.parquet_options = dict(parquet_options or {})
+        self.partition_cols = self.parquet_options.pop("partition_cols", None)
+        self.sqlite_options = dict(sqlite_options or {})
+        partitioned = self.format_type == "parquet" and bool(self.partition_cols)
+        if append and not (self.format_type in self.appendable_formats or partitioned):
+            msg = f"Cannot append to {format_type} output: {output_path}"
+            raise ValueError(msg)
+
+        self.append = append and Path(output_path).exists()
+        self.rows_written = 0
+        self.columns: list[str] = []
+        self._file: IO[str] | None = None
+        self._parquet_writer: Any = None
+        self._parquet_schema: Any = None
+        self._chunks_written = 0
+        self._closed = False
+
+    def write(self, df: pd.DataFrame) -> None:
+        """Append a chunk to the output.
+
+        Args:
+            df: DataFrame chunk to append
+        """
+        if self._closed:
+            msg = f"Writer for {self.output_path} is already closed"
+            raise ValueError(msg)
+
+        if self._chunks_written == 0:
+            Path(self.output_path).parent.mkdir(parents=True, exist_ok=True)
+            self.columns = df.columns.tolist()
+
+        if self.format_type == "csv":
+            self._write_csv(df)
+        elif self.format_type == "parquet":
+            self._write_parquet(df)
+        elif self.format_type == "jsonl":
+            self._write_json_lines(df)
+        elif self.format_type == "sqlite":
+            self._write_sqlite(df)
+        else:
+            self._write_json(df)
+
+        self._chunks_written += 1
+        self.rows_written += len(df)
+
+    def close(self) -> None:
+        """Finalise the output file."""
+        if self._closed:
+            return
+        self._closed = True
+
+        if self.format_type == "json":
+            if self._file is None:
+                self._file = open(self.output_path, "w")  # noqa: SIM115
+                self._file.write("[\n")
+            self._file.write("\n]")
+        if self.format_type == "jsonl" and self._file is None:
+            # No chunks were written, emit an empty file like DataLoader would
+            self._file = _open_text(self.output_path, "a" if self.append else "w")
+        if self._file is not None:
+            self._file.close()
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+        elif self.format_type == "parquet" and self.partition_cols:
+            # Partitions are only created for rows, so just make the root
+            Path(self.output_path).mkdir(parents=True, exist_ok=True)
+        elif self.format_type == "parquet":
+            # No chunks were written, emit an empty file like DataLoader would
+            pd.DataFrame(columns=self.columns).to_parquet(self.output_path, index=False)
+        logger.info("Streamed %d rows to %s", self.rows_written, self.output_path)
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def _write_csv(self, df: pd.DataFrame) -> None:
+        first = self._chunks_written == 0
+        if first and self.append:
+            with open(self.output_path) as f:
+                existing = f.readline().rstrip("\r\n")
+            header = df.iloc[:0].to_csv(index=False).rstrip("\r\n")
+            if existing != header:
+                msg = f"Columns do not match existing output {self.output_path}"
+                raise ValueError(msg)
+        new_file = first and not self.append
+        df.to_csv(self.output_path, index=False, mode="w" if new_file else "a", header=new_file)
+
+    def _write_parquet(self, df: pd.DataFrame) -> None:
+        import pyarrow as pa  # noqa: PLC0415
+        import pyarrow.parquet as pq  # noqa: PLC0415
+
+        # Later chunks are cast to the first chunk's schema so that a column
+        # which happens to be all-null in one chunk does not break the file
+        if self.partition_cols:
+            if self._parquet_schema is None:
+                self._parquet_schema = pa.Schema.from_pandas(df, preserve_index=False)
+            write_parquet_dataset(
+                df,
+                self.output_path,
+                self.partition_cols,
+                append=self.append or self._chunks_written > 0,
+                schema=self._parquet_schema,
+                **self.parquet_options,
+            )
+            return
+
+        options = dict(self.parquet_options)
+        row_group_size = options.pop("row_group_size", None)
+        table = pa.Table.from_pandas(df, schema=self._parquet_schema, preserve_index=False)
+        if self._parquet_writer is None:
+            self._parquet_schema = table.schema
+            self._parquet_writer = pq.ParquetWriter(self.output_path, table.schema, **options)
+        self._parquet_writer.write_table(table, row_group_size=row_group_size)
+
+    def _write_sqlite(self, df: pd.DataFrame) -> None:
+        options = dict(self.sqlite_options)
+        table = options.pop("table", None) or Path(self.output_path).stem
+        # The first chunk replaces the table, or does what if_exists asks,
+        # unless appending to it; later chunks always append
+        if_exists = options.pop("if_exists", "replace")
+        first = self._chunks_written == 0 and not self.append
+        with DEFAULT_SQLITE_POOL.connection(self.output_path) as connection:
+            insert_frame(
+                connection, df, table, if_exists=if_exists if first else "append", **options
+            )
+
+    def _write_json_lines(self, df: pd.DataFrame) -> None:
+        if self._file is None:
+            if self.append:
+                with _open_text(self.output_path, "r") as f:
+                    first = f.readline()
+                if first and list(json.loads(first)) != [str(c) for c in df.columns]:
+                    msg = f"Columns do not match existing output {self.output_path}"
+                    raise ValueError(msg)
+            self._file = _open_text(self.output_path, "a" if self.append else "w")
+        _write_json_batches(self._file, df, DEFAULT_JSON_BATCH_ROWS)
+
+    def _write_json(self, df: pd.DataFrame) -> None:
+        if self._file is None:
+            self._file = open(self.output_path, "w")  # noqa: SIM115
+            self._file.write("[")
+        # Strip the enclosing brackets so the records of every chunk end up in
+        # one JSON array, formatted exactly as DataLoader.load_to_json does
+        body = df.to_json(orient="records", indent=2)[1:-1].strip("\n")
+        if body:
+            self._file.write(",\n" if self.rows_written else "\n")
+            self._file.write(body)
+
+
+def write_parquet_dataset(
+    df: pd.DataFrame,
+    root_path: str,
+    partition_cols: list[str],
+    *,
+    append: bool = False,
+    **kwargs: Any,
+) -> int:
+    """Write a DataFrame as a hive-partitioned Parquet dataset.
+
+    Each call writes new, uniquely named files into the partition
+    directories, so appending never rewrites files already in the dataset.
+
+    Args:
+        df: DataFrame to save
+        root_path: Root directory of the dataset
+        partition_cols: Columns to partition by, in directory order
+        append: Add to an existing dataset instead of replacing it
+        **kwargs: Additional arguments for pandas.to_parquet, such as
+            compression, row_group_size, use_dictionary and write_statistics
+
+    Returns:
+        Number of partitions written to
+    """
+    missing = [column for column in partition_cols if column not in df.columns]
+    if missing:
+        msg = f"Partition columns not found: {missing}"
+        raise ValueError(msg)
+
+    root = Path(root_path)
+    if root.exists() and append:
+        import pyarrow.dataset as ds  # noqa: PLC0415
+
+        existing = ds.dataset(root, format="parquet", partitioning="hive").schema.names
+        if existing and set(existing) != set(df.columns):
+            msg = f"Columns do not match existing output {root_path}"
+            raise ValueError(msg)
+    elif root.is_dir():
+        # Replace the whole dataset, as writing a single file would
+        shutil.rmtree(root)
+    elif root.exists():
+        root.unlink()
+
+    df.to_parquet(root, index=False, partition_cols=partition_cols, **kwargs)
+    return int(df.groupby(partition_cols, observed=True, dropna=False).ngroups)
+
+
+class MultiWriter:
+    """Write a sequence of DataFrame chunks to several outputs at once.
+
+    Each chunk is handed to one StreamingWriter per output, on a thread pool
+    when there is more than one. An output that fails is closed and skipped
+    for the remaining chunks while the others carry on. results records the
+    status, rows and seconds spent writing for each output.
+
+    Args:
+        outputs: Output specifications, see save_to_destinations. Options
+            of parquet and sqlite outputs are passed to StreamingWriter as
+            parquet_options and sqlite_options; other formats take none.
+        max_workers: Maximum number of outputs written at the same time
+    """
+
+    def __init__(self, outputs: list[dict[str, Any]], max_workers: int | None = None) -> None:
+        specs = output_specs(outputs)
+        self.writers = {
+            spec["path"]: StreamingWriter(
+                spec["path"],
+                spec["format"],
+                parquet_options=spec["options"] if spec["format"] == "parquet" else None,
+                sqlite_options=spec["options"] if spec["format"] == "sqlite" else None,
+            )
+            for spec in specs
+        }
+        self.results: dict[str, dict[str, Any]] = {
+            spec["path"]: {"format": spec["format"], "status": "success", "rows": 0, "seconds": 0.0}
+            for spec in specs
+        }
+        self.rows_written = 0
+        self.columns: list[str] = []
+        self._pool = ThreadPoolExecutor(max_workers or len(specs)) if len(specs) > 1 else None
+
+    @property
+    def succeeded(self) -> bool:
+        """Whether every output has been written without error so far."""
+        return all(result["status"] == "success" for result in self.results.values())
+
+    def write(self, df: pd.DataFrame) -> None:
+        """Append a chunk to every output still being written.
+
+        Args:
+            df: DataFrame chunk to append
+        """
+        if self.rows_written == 0:
+            self.columns = df.columns.tolist()
+        self._each(lambda writer: writer.write(df))
+        self.rows_written += len(df)
+
+    def close(self) -> None:
+        """Finalise every output still being written."""
+        self._each(lambda writer: writer.close())
+        for path, writer in self.writers.items():
+            self.results[path]["rows"] = writer.rows_written
+            self.results[path]["seconds"] = round(self.results[path]["seconds"], 6)
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def _each(self, action: Callable[[StreamingWriter], None]) -> None:
+        """Run action on the writer of every output that has not failed."""
+        paths = [path for path, result in self.results.items() if result["status"] == "success"]
+
+        def run(path: str) -> None:
+            start = time.perf_counter()
+            try:
+                action(self.writers[path])
+            except Exception as e:
+                logger.exception("Error streaming data to %s", path)
+                self.results[path].update(status="failed", error=str(e))
+                with contextlib.suppress(Exception):
+                    self.writers[path].close()
+            finally:
+                self.results[path]["seconds"] += time.perf_counter() - start
+
+        if self._pool is None:
+            for path in paths:
+                run(path)
+        else:
+            list(self._pool.map(run, paths))
+
+
+def write_json_lines(
+    df: pd.DataFrame,
+    output_path: str,
+    *,
+    batch_size: int = DEFAULT_JSON_BATCH_ROWS,
+    compression: str | None = "infer",
+    append: bool = False,
+    **kwargs: Any,
+) -> None:
+    """Write a DataFrame as JSON Lines, serialising batch_size rows at a time.
+
+    Args:
+        df: DataFrame to save
+        output_path: Path of the output file
+        batch_size: Rows serialised per write
+        compression: gzip or None. infer uses gzip for paths ending .gz.
+        append: Add to the end of an existing file
+        **kwargs: Additional arguments for pandas.to_json
+    """
+    with _open_text(output_path, "a" if append else "w", compression) as f:
+        _write_json_batches(f, df, batch_size, **kwargs)
+
+
+def _write_json_batches(f: IO[str], df: pd.DataFrame, batch_size: int, **kwargs: Any) -> None:
+    for start in range(0, len(df), batch_size):
+        batch = df.iloc[start : start + batch_size]
+        f.write(batch.to_json(orient="records", lines=True, **kwargs))
+
+
+def _open_text(path: str, mode: str, compression: str | None = "infer") -> IO[str]:
+    """Open a text file for JSON Lines, gzip-compressed if asked or inferred."""
+    if compression == "infer":
+        compression = "gzip" if path.endswith(".gz") else None
+    if compression == "gzip":
+        return gzip.open(path, f"{mode}t", encoding="utf-8")  # type: ignore[return-value]
+    if compression is None:
+        return open(path, mode, encoding="utf-8")
+    msg = f"Unsupported compression for JSON Lines output: {compression}"
+    raise ValueError(msg)
+
+
+def _write_parquet_file(df: pd.DataFrame, output_path: str, *, append: bool, **kwargs: Any) -> None:
+    """Write a single Parquet file, which cannot be appended to."""
+    if append:
+        msg = f"Appending to Parquet output needs partition_cols: {output_path}"
+        raise ValueError(msg)
+    df.to_parquet(output_path, index=False, **kwargs)
+
+
+def save_to_destination(
+    df: pd.DataFrame,
+    output_path: str,
+    format_type: str = "csv",
+    *,
+    loader: DataLoader | None = None,
+    **kwargs: Any,
+) -> bool:
     """Helper function to save DataFrame to specified destination.
 
     Args:
         df: DataFrame to save
         output_path: Path where to save the file
-        format_type: Type of format (csv, parquet, json)
+        format_type: Type of format (csv, parquet, json, jsonl, sqlite)
+        loader: DataLoader to use, whose load_summary records the outcome
+        **kwargs: Additional arguments for the matching DataLoader method,
+            e.g. partition_cols for parquet
 
     Returns:
         True if successful, False otherwise
     """
-    loader = DataLoader()
+    loader = loader or DataLoader()
 
     if not loader.validate_output_path(output_path):
         logger.error("Invalid output path: %s", output_path)
         return False
 
-    if format_type.lower() == "csv":
-        return loader.load_to_csv(df, output_path)
-    if format_type.lower() == "parquet":
-        return loader.load_to_parquet(df, output_path)
-    if format_type.lower() == "json":
-        return loader.load_to_json(df, output_path)
-    logger.error("Unsupported format type: %s", format_type)
-    return False
+    methods: dict[str, Callable[..., bool]] = {
+        "csv": loader.load_to_csv,
+        "parquet": loader.load_to_parquet,
+        "json": loader.load_to_json,
+        "jsonl": functools.partial(loader.load_to_json, lines=True),
+        "sqlite": loader.load_to_sqlite,
+    }
+    if format_type.lower() not in methods:
+        logger.error("Unsupported format type: %s", format_type)
+        return False
+    return methods[format_type.lower()](df, output_path, **kwargs)
+
+
+def save_to_destinations(
+    df: pd.DataFrame, outputs: list[dict[str, Any]], *, max_workers: int | None = None
+) -> dict[str, dict[str, Any]]:
+    """Save one DataFrame to several destinations concurrently.
+
+    Each output is written on its own thread of a pool, so a slow or failing
+    output does not hold up or stop the others. The frame is only read.
+
+    Args:
+        df: DataFrame to save
+        outputs: Output specifications, each a dictionary with a path, a
+            format (csv, parquet, json, jsonl, sqlite) and optional options for the
+            matching DataLoader method, e.g. {"path": "sales", "format":
+            "parquet", "options": {"partition_cols": ["year"]}}
+        max_workers: Maximum number of outputs written at the same time,
+            one per output if not given
+
+    Returns:
+        Dictionary of output path to the format, status, rows and seconds
+        taken by that output, with an error message if it failed
+    """
+    specs = output_specs(outputs)
+    with ThreadPoolExecutor(max_workers or len(specs)) as pool:
+        results = list(pool.map(lambda spec: _save_timed(df, spec), specs))
+    return {spec["path"]: result for spec, result in zip(specs, results, strict=True)}
+
+
+def output_specs(outputs: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Validate output specifications and fill in their defaults.
+
+    Args:
+        outputs: Output specifications, see save_to_destinations
+
+    Returns:
+        Specifications with a lower-case format and an options dictionary
+    """
+    specs = []
+    for output in outputs:
+        if "path" not in output or "format" not in output:
+            msg = f"Outputs need a path and a format, got {output}"
+            raise ValueError(msg)
+        specs.append(
+            {
+                "path": str(output["path"]),
+                "format": output["format"].lower(),
+                "options": dict(output.get("options") or {}),
+            }
+        )
+    paths = [spec["path"] for spec in specs]
+    if not specs or len(set(paths)) != len(paths):
+        msg = f"Outputs need distinct paths, got {paths}"
+        raise ValueError(msg)
+    return specs
+
+
+def _save_timed(df: pd.DataFrame, spec: dict[str, Any]) -> dict[str, Any]:
+    """Save to one output, recording its outcome and the time it took."""
+    loader = DataLoader()
+    start = time.perf_counter()
+    success = save_to_destination(
+        df, spec["path"], spec["format"], loader=loader, **spec["options"]
+    )
+    result: dict[str, Any] = {
+        "format": spec["format"],
+        "status": "success" if success else "failed",
+        "rows": len(df),
+        "seconds": round(time.perf_counter() - start, 6),
+    }
+    if not success:
+        error = loader.load_summary.get(spec["path"], {}).get("error")
+        result["error"] = error or f"Invalid output path or format: {spec['format']}"
+    return result
 
 
 def create_data_summary(df: pd.DataFrame, output_path: str) -> bool:
     """Helper function to create a summary of the processed data.
 
+    The summary is gathered in one pass with SummaryStatistics. Quartiles of
+    columns with more than 10,000 distinct values are estimated.
+
     Args:
         df: DataFrame to summarise
         output_path: Path where to save the summary
@@ -187,25 +860,27 @@ def create_data_summary(df: pd.DataFrame, output_path: str) -> bool:
     Returns:
         True if successful, False otherwise
     """
+    statistics = SummaryStatistics()
     try:
-        # Convert datetime columns to string for JSON serialization
-        df_for_summary = df.copy()
-        for col in df_for_summary.columns:
-            if df_for_summary[col].dtype == "datetime64[ns]":
-                df_for_summary[col] = df_for_summary[col].astype(str)
-
-        summary = {
-            "total_rows": len(df),
-            "total_columns": len(df.columns),
-            "column_names": df.columns.tolist(),
-            "data_types": df.dtypes.astype(str).to_dict(),
-            "missing_values": df.isna().sum().to_dict(),
-            "numeric_summary": (
-                df_for_summary.describe().to_dict()
-                if len(df_for_summary.select_dtypes(include=["number"]).columns) > 0
-                else {}
-            ),
-        }
+        statistics.update(df)
+    except Exception:
+        logger.exception("Error creating data summary")
+        return False
+    return save_data_summary(statistics, output_path)
+
+
+def save_data_summary(statistics: SummaryStatistics, output_path: str) -> bool:
+    """Save a summary built from statistics gathered in one or more chunks.
+
+    Args:
+        statistics: Statistics of the processed data
+        output_path: Path where to save the summary
+
+    Returns:
+        True if successful, False otherwise
+    """
+    try:
+        summary = statistics.summary()
 
         # Ensure directory exists
         output_dir = Path(output_path).parent
@@ -0,0 +1,276 @@
+import contextlib
+import functools
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable, Iterable, Iterator
+from pathlib import Path
+from types import TracebackType
+from typing import Any, Self
+
+logger = logging.getLogger(__name__)
+
+# Prefix of every metric name in the Prometheus export
+METRIC_PREFIX = "etl"
+
+# Prometheus metrics exported for phases and for transform steps, with help text
+PHASE_METRICS = {
+    "wall_seconds": "Wall-clock time spent in each pipeline phase",
+    "cpu_seconds": "CPU time of the process spent in each pipeline phase",
+    "rows": "Rows processed by each pipeline phase",
+    "rows_per_second": "Rows processed per wall-clock second by each pipeline phase",
+    "peak_rss_bytes": "Peak resident memory of the process by the end of each phase",
+    "peak_traced_bytes": "Peak memory allocated by Python during each phase",
+}
+STEP_METRICS = {
+    "wall_seconds": "Wall-clock time spent in each transform step",
+    "cpu_seconds": "CPU time of the process spent in each transform step",
+    "rows": "Rows passed to each transform step",
+    "calls": "Number of times each transform step ran",
+}
+
+
+class MetricsRecorder:
+    """Record wall time, CPU time, memory and throughput of pipeline phases.
+
+    Each phase accumulates over every block timed under its name, so a
+    streamed run adds up the time spent on each chunk. Timing costs two
+    clock reads per block and the peak resident memory comes from one
+    getrusage call, so recording is cheap enough to leave on.
+    tracemalloc measures the memory each phase allocates more precisely
+    but slows allocation-heavy code down, so it is only used when
+    trace_memory is set.
+
+    Args:
+        trace_memory: Record each phase's peak Python allocations with
+            tracemalloc, which is started for the lifetime of the recorder
+    """
+
+    def __init__(self, trace_memory: bool = False) -> None:
+        self.trace_memory = trace_memory
+        self.phases: dict[str, dict[str, Any]] = {}
+        self._started_tracing = False
+
+    def __enter__(self) -> Self:
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    @contextlib.contextmanager
+    def phase(self, name: str, rows: int = 0) -> Iterator[dict[str, Any]]:
+        """Time a block of work as part of a phase.
+
+        Args:
+            name: Phase name, e.g. extract, transform or load
+            rows: Rows the block processes; more can be added to the
+                yielded entry's rows while the block runs
+
+        Yields:
+            The phase's accumulated entry
+        """
+        entry = self.phases.setdefault(name, _empty_entry())
+        entry["rows"] += rows
+        tracing = self.trace_memory and tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.reset_peak()
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield entry
+        finally:
+            entry["wall_seconds"] += time.perf_counter() - wall
+            entry["cpu_seconds"] += time.process_time() - cpu
+            entry["calls"] += 1
+            rss = peak_rss_bytes()
+            if rss is not None:
+                entry["peak_rss_bytes"] = max(entry.get("peak_rss_bytes", 0), rss)
+            if tracing:
+                traced = tracemalloc.get_traced_memory()[1]
+                entry["peak_traced_bytes"] = max(entry.get("peak_traced_bytes", 0), traced)
+
+    def timed_iter[T](self, items: Iterable[T], name: str) -> Iterator[T]:
+        """Yield from items, timing the production of each as part of a phase.
+
+        Args:
+            items: Iterable such as a generator of chunks. Items with a
+                length add it to the phase's rows.
+            name: Phase name
+
+        Yields:
+            The items, unchanged
+        """
+        iterator = iter(items)
+        while True:
+            with self.phase(name) as entry:
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+                entry["rows"] += len(item) if hasattr(item, "__len__") else 0
+            yield item
+
+    def summary(self, steps: dict[str, dict[str, Any]] | None = None) -> dict[str, Any]:
+        """Build the metrics recorded so far.
+
+        Args:
+            steps: Transform step timings, e.g. DataTransformer.step_timings
+
+        Returns:
+            Dictionary with a phases and a steps dictionary, each keyed by name
+        """
+        phases = {}
+        for name, entry in self.phases.items():
+            wall = entry["wall_seconds"]
+            phases[name] = {
+                **entry,
+                "wall_seconds": round(wall, 6),
+                "cpu_seconds": round(entry["cpu_seconds"], 6),
+                "rows_per_second": round(entry["rows"] / wall, 1) if wall > 0 else None,
+            }
+        rounded_steps = {
+            name: {
+                key: round(value, 6) if isinstance(value, float) else value
+                for key, value in entry.items()
+            }
+            for name, entry in (steps or {}).items()
+        }
+        return {"phases": phases, "steps": rounded_steps}
+
+
+def timed_step[T](method: Callable[..., T]) -> Callable[..., T]:
+    """Record the time a DataTransformer method takes in its step_timings.
+
+    The first argument after self must be the DataFrame being transformed.
+    """
+
+    @functools.wraps(method)
+    def wrapper(self: Any, df: Any, *args: Any, **kwargs: Any) -> T:
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            return method(self, df, *args, **kwargs)
+        finally:
+            record_step(
+                self.step_timings,
+                method.__name__,
+                wall_seconds=time.perf_counter() - wall,
+                cpu_seconds=time.process_time() - cpu,
+                rows=len(df),
+            )
+
+    return wrapper
+
+
+def record_step(
+    steps: dict[str, dict[str, Any]],
+    name: str,
+    *,
+    wall_seconds: float,
+    cpu_seconds: float = 0.0,
+    rows: int = 0,
+) -> None:
+    """Add one run of a step to accumulated step timings.
+
+    Args:
+        steps: Step timings to update, keyed by step name
+        name: Step name
+        wall_seconds: Wall-clock time the run took
+        cpu_seconds: CPU time the run took
+        rows: Rows the run processed
+    """
+    entry = steps.setdefault(name, {"wall_seconds": 0.0, "cpu_seconds": 0.0, "rows": 0, "calls": 0})
+    entry["wall_seconds"] += wall_seconds
+    entry["cpu_seconds"] += cpu_seconds
+    entry["rows"] += rows
+    entry["calls"] += 1
+
+
+def peak_rss_bytes() -> int | None:
+    """Peak resident memory of the process, or None where it is not available."""
+    try:
+        import resource  # noqa: PLC0415
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB and macOS bytes
+    return int(peak) if sys.platform == "darwin" else int(peak) * 1024
+
+
+def to_prometheus(metrics: dict[str, Any], prefix: str = METRIC_PREFIX) -> str:
+    """Format metrics in the Prometheus text exposition format.
+
+    Args:
+        metrics: Metrics from MetricsRecorder.summary
+        prefix: Prefix of every metric name
+
+    Returns:
+        Text with one gauge per metric, labelled by phase or step
+    """
+    lines = []
+    for group, label, names in (
+        ("phases", "phase", PHASE_METRICS),
+        ("steps", "step", STEP_METRICS),
+    ):
+        entries = metrics.get(group, {})
+        for metric, help_text in names.items():
+            samples = [
+                (name, entry[metric])
+                for name, entry in entries.items()
+                if entry.get(metric) is not None
+            ]
+            if not samples:
+                continue
+            full_name = f"{prefix}_{label}_{metric}"
+            lines.append(f"# HELP {full_name} {help_text}.")
+            lines.append(f"# TYPE {full_name} gauge")
+            lines += [
+                f'{full_name}{{{label}="{_escape_label(name)}"}} {value}' for name, value in samples
+            ]
+    return "\n".join(lines) + "\n"
+
+
+def write_metrics(metrics: dict[str, Any], output_path: str) -> None:
+    """Write metrics as Prometheus text (paths ending .prom) or JSON.
+
+    The file is replaced atomically, so a node exporter textfile collector
+    never reads a partly written file.
+
+    Args:
+        metrics: Metrics from MetricsRecorder.summary
+        output_path: Path of the metrics file
+    """
+    path = Path(output_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    text = to_prometheus(metrics) if path.suffix == ".prom" else json.dumps(metrics, indent=2)
+    fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(text)
+        # mkstemp creates files only the owner can read
+        os.chmod(temp_path, 0o644)
+        os.replace(temp_path, path)
+    except BaseException:
+        Path(temp_path).unlink(missing_ok=True)
+        raise
+    logger.info("Metrics written to %s", output_path)
+
+
+def _empty_entry() -> dict[str, Any]:
+    return {"wall_seconds": 0.0, "cpu_seconds": 0.0, "rows": 0, "calls": 0}
+
+
+def _escape_label(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
@@ -0,0 +1,128 @@
+import logging
+import queue
+import threading
+from collections.abc import Callable, Iterable, Sequence
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Items each queue between two stages holds. A full queue blocks the stage
+# feeding it, so at most this many chunks wait between any two stages.
+DEFAULT_QUEUE_CHUNKS = 2
+
+# Seconds a blocked stage waits before checking whether another stage failed
+POLL_SECONDS = 0.05
+
+# Marks the end of the items passed between stages
+_END = object()
+
+
+def run_pipelined(
+    items: Iterable[Any],
+    stages: Sequence[Callable[[Any], Any]],
+    sink: Callable[[Any], None],
+    *,
+    queue_size: int = DEFAULT_QUEUE_CHUNKS,
+) -> None:
+    """Pass items through stages and into a sink, running every stage at once.
+
+    Items are produced on one thread, each stage runs on a thread of its own
+    and the sink runs on the calling thread, linked by bounded queues. While
+    the sink writes item N-1, the stages can work on item N and the
+    producer can read item N+1, so the wall time approaches that of the
+    slowest stage rather than the sum of all of them. Every stage sees the
+    items in order, one at a time, so stages may keep state across items,
+    as RowDeduplicator does.
+
+    pandas parsing and writing and most numpy operations release the GIL,
+    which is what lets the threads overlap. When any stage, the producer or
+    the sink raises, the other threads stop after their current item and the
+    first exception is raised here.
+
+    Args:
+        items: Iterable producing the items, e.g. a generator of chunks
+        stages: Functions applied to each item in order
+        sink: Function consuming each item the last stage returns
+        queue_size: Items each queue between two stages holds
+    """
+    stop = threading.Event()
+    errors: list[BaseException] = []
+    queues: list[queue.Queue[Any]] = [
+        queue.Queue(maxsize=queue_size) for _ in range(len(stages) + 1)
+    ]
+
+    def fail(error: BaseException) -> None:
+        errors.append(error)
+        stop.set()
+
+    def produce() -> None:
+        try:
+            for item in items:
+                if not _put(queues[0], item, stop):
+                    return
+        except BaseException as e:
+            fail(e)
+        finally:
+            _put(queues[0], _END, stop)
+
+    def work(
+        stage: Callable[[Any], Any], inbox: queue.Queue[Any], outbox: queue.Queue[Any]
+    ) -> None:
+        try:
+            while (item := _get(inbox, stop)) is not _END:
+                if not _put(outbox, stage(item), stop):
+                    return
+        except BaseException as e:
+            fail(e)
+        finally:
+            _put(outbox, _END, stop)
+
+    threads = [threading.Thread(target=produce, name="etl-produce", daemon=True)]
+    threads += [
+        threading.Thread(
+            target=work, args=(stage, queues[i], queues[i + 1]), name=f"etl-stage-{i}", daemon=True
+        )
+        for i, stage in enumerate(stages)
+    ]
+    for thread in threads:
+        thread.start()
+
+    try:
+        while (item := _get(queues[-1], stop)) is not _END:
+            sink(item)
+    except BaseException as e:
+        fail(e)
+    finally:
+        # Stops the other threads if the sink failed; otherwise they are done
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+    if errors:
+        logger.error("Pipelined execution stopped after an error in one of its stages")
+        raise errors[0]
+
+
+def _put(target: "queue.Queue[Any]", item: Any, stop: threading.Event) -> bool:
+    """Put an item on a queue, blocking while it is full unless stopped.
+
+    Returns:
+        True if the item was queued, False if the pipeline was stopped
+    """
+    while not stop.is_set():
+        try:
+            target.put(item, timeout=POLL_SECONDS)
+        except queue.Full:
+            continue
+        return True
+    return False
+
+
+def _get(source: "queue.Queue[Any]", stop: threading.Event) -> Any:
+    """Take the next item from a queue, or _END once the pipeline is stopped."""
+    while not stop.is_set():
+        try:
+            return source.get(timeout=POLL_SECONDS)
+        except queue.Empty:
+            continue
+    return _END
@@ -0,0 +1,330 @@
+import logging
+import re
+from collections.abc import Iterable
+from typing import Any
+
+import pandas as pd
+
+from .transform import (
+    CALCULATED_COLUMNS,
+    DataTransformer,
+    compile_filters,
+    has_missing,
+    pushdown_mask,
+)
+
+logger = logging.getLogger(__name__)
+
+# Names that may refer to columns in a derive expression, bare or backquoted
+EXPRESSION_NAMES = re.compile(r"`([^`]+)`|([A-Za-z_]\w*)")
+
+
+class TransformPlan:
+    """Lazy sequence of transformations, optimised and run in a single pass.
+
+    Steps are recorded by the chainable methods and nothing is computed until
+    execute is called. The optimiser then rewrites the recorded (logical)
+    plan into the plan that is actually run:
+
+    - Filters on source columns move ahead of duplicate removal and filling,
+      so later steps only see rows that can survive. Filters recorded after
+      clean keep rows with missing values until the values are filled, then
+      check them again. They only move when the frame has no missing values
+      or the transformer has preset fill values, since fill statistics are
+      computed over every row. When the transformer's deduplicator compares
+      rows by key columns, filters recorded after clean stay after it:
+      dropping a row first could let another row with the same key survive
+      in its place.
+    - Column derivations are fused into one step writing into one copy.
+    - With a select step, columns nobody uses are dropped straight after
+      duplicate removal, and derivations whose columns are not selected are
+      skipped. Duplicates are still detected across every column.
+
+    Plans record clean before any derived columns and select, if used, last.
+
+    Args:
+        transformer: Transformer that runs the steps and keeps their log
+    """
+
+    def __init__(self, transformer: DataTransformer | None = None) -> None:
+        self.transformer = transformer or DataTransformer()
+        self.operations: list[dict[str, Any]] = []
+
+    def clean(self) -> "TransformPlan":
+        """Record duplicate removal followed by filling missing values."""
+        return self._record({"op": "clean"})
+
+    def add_calculated_columns(self, names: list[str] | None = None) -> "TransformPlan":
+        """Record the derivations made by DataTransformer.add_calculated_columns.
+
+        Args:
+            names: Keys of CALCULATED_COLUMNS to record, defaulting to all
+        """
+        for name in names or CALCULATED_COLUMNS:
+            derivation = CALCULATED_COLUMNS[name]
+            self._record({"op": "derive", "name": name, **derivation, "expression": None})
+        return self
+
+    def derive(
+        self, column: str, expression: str, inputs: list[str] | None = None
+    ) -> "TransformPlan":
+        """Record a column computed with DataFrame.eval.
+
+        Args:
+            column: Column to add or replace
+            expression: Expression over other columns, e.g. "quantity * price"
+            inputs: Columns the expression reads. If given, the derivation is
+                skipped when any of them is missing, as business rules are.
+        """
+        return self._record(
+            {
+                "op": "derive",
+                "name": column,
+                "inputs": None if inputs is None else tuple(inputs),
+                "outputs": (column,),
+                "expression": expression,
+            }
+        )
+
+    def filter(self, filters: dict[str, Any]) -> "TransformPlan":
+        """Record filter criteria, as taken by DataTransformer.filter_data."""
+        return self._record({"op": "filter", "predicates": compile_filters(filters)})
+
+    def select(self, columns: list[str]) -> "TransformPlan":
+        """Record the columns to return. This must be the last step."""
+        return self._record({"op": "select", "columns": list(columns)})
+
+    def optimise(
+        self, columns: Iterable[str] | None = None, *, missing: bool = False
+    ) -> list[dict[str, Any]]:
+        """Rewrite the recorded steps into the steps to run.
+
+        Args:
+            columns: Columns of the frame the plan will run on. None assumes
+                every column the plan mentions is present.
+            missing: The frame has missing values that will be filled from
+                its own rows, so filters recorded after clean stay after it
+
+        Returns:
+            List of physical steps, each a dictionary with an op key
+        """
+        source = None if columns is None else list(columns)
+        cleaned = any(operation["op"] == "clean" for operation in self.operations)
+        selection = next((o["columns"] for o in self.operations if o["op"] == "select"), None)
+        derivations, early, late = self._place(source, missing=missing)
+
+        steps: list[dict[str, Any]] = []
+        if early:
+            steps.append({"op": "prefilter", "predicates": early})
+        if cleaned:
+            steps.append({"op": "dedup"})
+        if selection is not None:
+            needed = set(selection) | {predicate["column"] for predicate in late}
+            derived = {column for derivation in derivations for column in derivation["outputs"]}
+            derivations, project = _prune(derivations, needed, derived, source)
+            steps.append({"op": "project", "columns": project})
+        if cleaned:
+            steps.append({"op": "fill"})
+        if derivations:
+            steps.append({"op": "derive", "derivations": derivations})
+        if late:
+            steps.append({"op": "filter", "predicates": late})
+        if selection is not None:
+            steps.append({"op": "select", "columns": selection})
+        return steps
+
+    def _place(
+        self, source: list[str] | None, *, missing: bool
+    ) -> tuple[list[dict[str, Any]], list[dict[str, Any]], list[dict[str, Any]]]:
+        """Split the recorded steps into derivations, early and late predicates.
+
+        Predicates on source columns run early, before cleaning. Those
+        recorded after clean keep missing values and are checked again late,
+        once the values are filled, or only run late if duplicates are
+        identified by key columns or missing values are filled from the
+        frame's rows. Predicates on derived columns run late.
+        """
+        deduplicator = self.transformer.deduplicator
+        keyed = deduplicator is not None and bool(deduplicator.key_columns)
+        # Dropping rows would change the statistics missing values are filled with
+        pinned = keyed or (missing and self.transformer.fill_values is None)
+        derivations: list[dict[str, Any]] = []
+        derived: set[str] = set()
+        early: list[dict[str, Any]] = []
+        late: list[dict[str, Any]] = []
+        cleaned = False
+
+        for operation in self.operations:
+            if operation["op"] == "clean":
+                cleaned = True
+            elif operation["op"] == "derive":
+                derivation = _resolve_inputs(operation, source, derived)
+                if derivation is not None:
+                    derivations.append(derivation)
+                    derived.update(derivation["outputs"])
+            elif operation["op"] == "filter":
+                for predicate in operation["predicates"]:
+                    if predicate["column"] in derived or (cleaned and pinned):
+                        late.append(predicate)
+                    elif source is None or predicate["column"] in source:
+                        early.append({**predicate, "keep_missing": cleaned})
+                        if cleaned:
+                            late.append(predicate)
+        return derivations, early, late
+
+    def explain(self, columns: Iterable[str] | None = None, *, missing: bool = False) -> str:
+        """Describe the recorded plan and the optimised plan that would run.
+
+        Args:
+            columns: Columns of the frame the plan will run on, if known
+            missing: The frame has missing values, as for optimise
+
+        Returns:
+            Multi-line description of both plans
+        """
+        lines = ["== Logical plan =="]
+        lines += [f"{i}. {_describe(step)}" for i, step in enumerate(self.operations, 1)]
+        lines.append("== Optimised plan ==")
+        lines += [
+            f"{i}. {step}" for i, step in enumerate(self.describe(columns, missing=missing), 1)
+        ]
+        return "\n".join(lines)
+
+    def describe(self, columns: Iterable[str] | None = None, *, missing: bool = False) -> list[str]:
+        """Describe each step of the optimised plan.
+
+        Args:
+            columns: Columns of the frame the plan will run on, if known
+            missing: The frame has missing values, as for optimise
+
+        Returns:
+            One description per physical step, in execution order
+        """
+        return [_describe(step) for step in self.optimise(columns, missing=missing)]
+
+    def execute(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Optimise the plan for df and run it.
+
+        Args:
+            df: Input DataFrame, which is left unchanged
+
+        Returns:
+            Transformed DataFrame
+        """
+        steps = self.optimise(df.columns, missing=has_missing(df))
+        for step in steps:
+            df = self._run(step, df)
+        logger.info("Executed transform plan with %d steps", len(steps))
+        return df
+
+    def _run(self, step: dict[str, Any], df: pd.DataFrame) -> pd.DataFrame:
+        runners = {
+            "prefilter": self._prefilter,
+            "dedup": lambda df, _: self.transformer.remove_duplicates(df),
+            "fill": lambda df, _: self.transformer.fill_missing_values(df),
+            "derive": self._derive,
+            "filter": lambda df, step: self.transformer.apply_predicates(df, step["predicates"]),
+        }
+        if step["op"] in runners:
+            return runners[step["op"]](df, step)
+        # project and select
+        return df.take(df.columns.get_indexer(step["columns"]), axis=1)
+
+    def _prefilter(self, df: pd.DataFrame, step: dict[str, Any]) -> pd.DataFrame:
+        mask = pushdown_mask(df, step["predicates"])
+        if mask.all():
+            return df
+        self.transformer.transformation_log.append(
+            f"Dropped {len(df) - int(mask.sum())} of {len(df)} rows before cleaning"
+        )
+        return df.take(mask.nonzero()[0])
+
+    def _derive(self, df: pd.DataFrame, step: dict[str, Any]) -> pd.DataFrame:
+        # Every derivation writes into the same shallow copy
+        df_derived = df.copy(deep=False)
+        for derivation in step["derivations"]:
+            if derivation["expression"] is None:
+                self.transformer.derive_columns(df_derived, derivation["name"])
+            else:
+                df_derived[derivation["name"]] = df_derived.eval(derivation["expression"])
+                self.transformer.transformation_log.append(f"Added {derivation['name']} column")
+        return df_derived
+
+    def _record(self, operation: dict[str, Any]) -> "TransformPlan":
+        if self.operations and self.operations[-1]["op"] == "select":
+            msg = "select must be the last step of a plan"
+            raise ValueError(msg)
+        if operation["op"] == "clean" and any(o["op"] == "derive" for o in self.operations):
+            msg = "clean must come before any derived columns in a plan"
+            raise ValueError(msg)
+        self.operations.append(operation)
+        return self
+
+
+def _resolve_inputs(
+    operation: dict[str, Any], source: list[str] | None, derived: set[str]
+) -> dict[str, Any] | None:
+    """Work out the columns a derivation reads, or None if it cannot run.
+
+    Derivations with known inputs are skipped when any is missing, as in
+    DataTransformer.add_calculated_columns. Otherwise the inputs of an
+    expression are the names in it that match a column.
+    """
+    available = derived if source is None else derived | set(source)
+    if operation["inputs"] is not None:
+        if source is not None and not set(operation["inputs"]) <= available:
+            return None
+        return operation
+    names = {quoted or bare for quoted, bare in EXPRESSION_NAMES.findall(operation["expression"])}
+    inputs = tuple(sorted(names if source is None else names & available))
+    return {**operation, "inputs": inputs}
+
+
+def _prune(
+    derivations: list[dict[str, Any]],
+    needed: set[str],
+    derived: set[str],
+    source: list[str] | None,
+) -> tuple[list[dict[str, Any]], list[str]]:
+    """Drop derivations and input columns that nothing downstream uses.
+
+    Args:
+        derivations: Derivations in plan order
+        needed: Columns selected or filtered on after the derivations
+        derived: Columns written by any of the derivations
+        source: Columns of the input frame, if known
+
+    Returns:
+        Tuple of the derivations still needed and the input columns to keep
+    """
+    kept = []
+    for derivation in reversed(derivations):
+        if needed & set(derivation["outputs"]):
+            kept.append(derivation)
+            needed |= set(derivation["inputs"])
+    # Columns that only exist once derived are not read from the input
+    read = {column for derivation in kept for column in derivation["inputs"]}
+    wanted = needed - (derived - read)
+    project = [c for c in source if c in wanted] if source is not None else sorted(wanted)
+    return kept[::-1], project
+
+
+def _describe(step: dict[str, Any]) -> str:
+    """Describe one logical or physical plan step."""
+    op = step["op"]
+    if op in ("filter", "prefilter"):
+        terms = [
+            f"{p['column']} {p['op']} {p['value']!r}"
+            + (" (missing kept)" if p.get("keep_missing") else "")
+            for p in step["predicates"]
+        ]
+        label = "filter before cleaning" if op == "prefilter" else "filter"
+        return f"{label}: {'; '.join(terms)}"
+    if op == "derive" and "derivations" in step:
+        return "derive (fused): " + ", ".join(d["name"] for d in step["derivations"])
+    if op == "derive":
+        source = step["expression"] or ", ".join(step["inputs"])
+        return f"derive {step['name']} from {source}"
+    if op in ("select", "project"):
+        return f"{op}: {', '.join(step['columns'])}"
+    return {"clean": "clean", "dedup": "remove duplicates", "fill": "fill missing values"}[op]
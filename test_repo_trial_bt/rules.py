@@ -0,0 +1,302 @@
+import json
+import logging
+import re
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+import pandas as pd
+
+from .plan import EXPRESSION_NAMES, TransformPlan
+from .transform import (
+    BUSINESS_RULE_FILTERS,
+    DataTransformer,
+    compile_filters,
+    date_features,
+    pushdown_mask,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+logger = logging.getLogger(__name__)
+
+# Kinds of rule a registry accepts, with the keys each one requires
+RULE_TYPES = {
+    "derive": ("column", "expression"),
+    "filter": (),
+    "lookup": ("column", "source", "mapping"),
+    "dates": ("column",),
+}
+
+# Words and tokens in an eval expression that do not name a column
+EXPRESSION_KEYWORDS = {"and", "or", "not", "in", "True", "False", "None"}
+STRING_LITERALS = re.compile(r"\"[^\"]*\"|'[^']*'")
+FUNCTION_CALLS = re.compile(r"[A-Za-z_]\w*\s*\(")
+
+# Columns written by a dates rule, after the parsed date column itself
+DATE_PARTS = ("year", "month", "day_of_week")
+
+
+class RuleRegistry:
+    """Ordered collection of declarative business rules.
+
+    Each rule is a dictionary with a unique name and a type:
+
+    - derive: adds or replaces column with the DataFrame.eval expression,
+      e.g. {"name": "total_value", "type": "derive", "column": "total_value",
+      "expression": "quantity * price"}
+    - filter: keeps rows passing criteria in the form taken by
+      DataTransformer.filter_data, e.g. {"criteria": {"quantity": {"min": 0}}},
+      or a boolean DataFrame.eval expression, e.g. {"expression": "price < 500"}
+    - lookup: maps the values of source through mapping into column, with an
+      optional default for values not in the mapping
+    - dates: parses column and adds year, month and day_of_week
+
+    Rules run in order over a single shallow copy of the frame; expressions
+    are evaluated with numexpr when it is installed. Filter masks are
+    combined and rows are selected once at the end. A rule whose input
+    columns are missing is skipped. Time spent in each rule is added up in
+    timings.
+
+    Args:
+        rules: Rules to register, in order
+    """
+
+    def __init__(self, rules: "Iterable[dict[str, Any]] | None" = None) -> None:
+        self.rules: list[dict[str, Any]] = []
+        self.timings: dict[str, float] = {}
+        for rule in rules or []:
+            self.register(rule)
+
+    @classmethod
+    def from_config(cls, config_path: str) -> "RuleRegistry":
+        """Load rules from a JSON file.
+
+        The file holds either a list of rules or an object with a "rules" list.
+
+        Args:
+            config_path: Path to the JSON file
+
+        Returns:
+            Registry holding the rules in file order
+        """
+        with open(Path(config_path)) as f:
+            config = json.load(f)
+        rules = config["rules"] if isinstance(config, dict) else config
+        logger.info("Loaded %d business rules from %s", len(rules), config_path)
+        return cls(rules)
+
+    def register(self, rule: dict[str, Any]) -> None:
+        """Validate a rule and add it after the rules already registered.
+
+        Args:
+            rule: Rule dictionary, see the class docstring
+        """
+        name, rule_type = rule.get("name"), rule.get("type")
+        if rule_type not in RULE_TYPES:
+            msg = f"Unknown rule type for {name}: {rule_type}. Use one of {list(RULE_TYPES)}"
+            raise ValueError(msg)
+        if not name or any(existing["name"] == name for existing in self.rules):
+            msg = f"Rules need a unique name, got {name!r}"
+            raise ValueError(msg)
+        missing = [key for key in RULE_TYPES[rule_type] if key not in rule]
+        if rule_type == "filter" and ("criteria" in rule) == ("expression" in rule):
+            missing.append("criteria or expression")
+        if missing:
+            msg = f"Rule {name} is missing {', '.join(missing)}"
+            raise ValueError(msg)
+        self.rules.append({**rule, "inputs": _inputs(rule), "outputs": _outputs(rule)})
+
+    def input_columns(self) -> list[str]:
+        """List the source columns the rules read.
+
+        Returns:
+            Column names read by a rule before any earlier rule writes them
+        """
+        columns: list[str] = []
+        written: set[str] = set()
+        for rule in self.rules:
+            columns += [column for column in rule["inputs"] if column not in written]
+            written.update(rule["outputs"])
+        return list(dict.fromkeys(columns))
+
+    def output_columns(self) -> list[str]:
+        """List the columns the rules add or overwrite."""
+        return list(dict.fromkeys(column for rule in self.rules for column in rule["outputs"]))
+
+    def pushdown_predicates(self) -> list[dict[str, Any]]:
+        """Collect the filter criteria that can be checked on the raw source.
+
+        Returns:
+            Predicates from compile_filters for criteria filters on columns
+            that no rule writes
+        """
+        written = set(self.output_columns())
+        return [
+            predicate
+            for rule in self.rules
+            if rule["type"] == "filter" and "criteria" in rule
+            for predicate in compile_filters(rule["criteria"])
+            if predicate["column"] not in written
+        ]
+
+    def plannable(self) -> bool:
+        """Check whether every rule can be recorded by to_plan.
+
+        Returns:
+            False if any rule is a lookup, an expression filter or parses a
+            column other than date
+        """
+        return all(_plannable(rule) for rule in self.rules)
+
+    def to_plan(self, plan: TransformPlan) -> TransformPlan:
+        """Record the rules as steps of a lazy transform plan.
+
+        Args:
+            plan: Plan to add the steps to
+
+        Returns:
+            The same plan, for chaining
+
+        Raises:
+            ValueError: If a rule cannot run in a plan, see plannable
+        """
+        for rule in self.rules:
+            if not _plannable(rule):
+                msg = f"Rule {rule['name']} cannot run in an optimised plan"
+                raise ValueError(msg)
+            if rule["type"] == "derive":
+                plan.derive(rule["column"], rule["expression"], rule["inputs"])
+            elif rule["type"] == "filter":
+                plan.filter(rule["criteria"])
+            else:
+                plan.add_calculated_columns(["date_columns"])
+        return plan
+
+    def apply(self, df: pd.DataFrame, transformer: DataTransformer | None = None) -> pd.DataFrame:
+        """Apply every rule to a frame in one pass.
+
+        Args:
+            df: Cleaned DataFrame, which is left unchanged
+            transformer: Transformer whose log records each rule and whose
+                date format is used by dates rules
+
+        Returns:
+            DataFrame with derived columns added and filtered rows removed
+        """
+        transformer = transformer or DataTransformer()
+        result = df.copy(deep=False)
+        keep = np.ones(len(result), dtype=bool)
+
+        for rule in self.rules:
+            if not set(rule["inputs"]) <= set(result.columns):
+                logger.info("Skipped rule %s: missing input columns", rule["name"])
+                continue
+            start = time.perf_counter()
+            description = self._apply_rule(rule, result, keep, transformer)
+            elapsed = time.perf_counter() - start
+            self.timings[rule["name"]] = self.timings.get(rule["name"], 0.0) + elapsed
+            transformer.transformation_log.append(f"{description} in {elapsed * 1000:.2f} ms")
+
+        logger.info("Business rules kept %d of %d rows", int(keep.sum()), len(result))
+        if keep.all():
+            return result
+        return result.take(np.flatnonzero(keep))
+
+    def _apply_rule(
+        self,
+        rule: dict[str, Any],
+        result: pd.DataFrame,
+        keep: np.ndarray,
+        transformer: DataTransformer,
+    ) -> str:
+        """Apply one rule, writing into result and keep in place."""
+        if rule["type"] == "derive":
+            # One eval per rule: a multi-line DataFrame.eval either copies the
+            # whole frame or, inplace, writes through .loc into arrays shared
+            # with the caller's frame
+            result[rule["column"]] = result.eval(rule["expression"])
+            return f"Added {rule['column']} column"
+        if rule["type"] == "lookup":
+            values = result[rule["source"]].map(rule["mapping"])
+            if rule.get("default") is not None:
+                values = values.fillna(rule["default"])
+            result[rule["column"]] = values
+            return f"Added {rule['column']} column from {rule['source']} lookup"
+        if rule["type"] == "dates":
+            features, transformer.date_format = date_features(
+                result[rule["column"]], transformer.date_format
+            )
+            for feature, output in zip(features.columns, rule["outputs"], strict=True):
+                result[output] = features[feature]
+            return "Added date-based columns"
+
+        if "criteria" in rule:
+            predicates = [
+                {**predicate, "keep_missing": False}
+                for predicate in compile_filters(rule["criteria"], result.columns)
+            ]
+            passed = pushdown_mask(result, predicates)
+        else:
+            passed = pd.Series(result.eval(rule["expression"])).to_numpy(dtype=bool, na_value=False)
+        before = int(keep.sum())
+        keep &= passed
+        return f"Applied rule {rule['name']} (kept {int(keep.sum())} of {before} rows)"
+
+
+def default_rules() -> RuleRegistry:
+    """Build the registry of the standard business rules.
+
+    Returns:
+        Registry adding total_value and the date columns, then dropping
+        negative quantities
+    """
+    return RuleRegistry(
+        [
+            {
+                "name": "total_value",
+                "type": "derive",
+                "column": "total_value",
+                "expression": "quantity * price",
+            },
+            {"name": "date_columns", "type": "dates", "column": "date"},
+            {"name": "non_negative_quantity", "type": "filter", "criteria": BUSINESS_RULE_FILTERS},
+        ]
+    )
+
+
+def _plannable(rule: dict[str, Any]) -> bool:
+    """Check whether a rule has an equivalent TransformPlan step."""
+    if rule["type"] == "filter":
+        return "criteria" in rule
+    if rule["type"] == "dates":
+        return bool(rule["column"] == "date")
+    return bool(rule["type"] == "derive")
+
+
+def _inputs(rule: dict[str, Any]) -> list[str]:
+    """Work out the columns a rule reads."""
+    if rule["type"] == "lookup":
+        return [rule["source"]]
+    if rule["type"] == "dates":
+        return [rule["column"]]
+    if "criteria" in rule:
+        return list(rule["criteria"])
+    # String literals and function calls do not name columns
+    expression = STRING_LITERALS.sub("", rule["expression"])
+    expression = FUNCTION_CALLS.sub("(", expression)
+    names = (quoted or bare for quoted, bare in EXPRESSION_NAMES.findall(expression))
+    return [name for name in dict.fromkeys(names) if name not in EXPRESSION_KEYWORDS]
+
+
+def _outputs(rule: dict[str, Any]) -> list[str]:
+    """Work out the columns a rule writes."""
+    if rule["type"] == "filter":
+        return []
+    if rule["type"] == "dates":
+        column = rule["column"]
+        prefix = "" if column == "date" else f"{column}_"
+        return [column, *(f"{prefix}{part}" for part in DATE_PARTS)]
+    return [rule["column"]]
@@ -0,0 +1,424 @@
+import logging
+import math
+from collections import Counter
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from .transform import is_fill_numeric
+
+logger = logging.getLogger(__name__)
+
+# Size parameter of the quantile sketch. The median found by the sketch is
+# within about 1% of the rows of the true median (rank error 1.7 / k).
+DEFAULT_SKETCH_SIZE = 200
+
+# Distinct values per numeric column counted exactly before falling back to
+# the sketch alone
+DEFAULT_EXACT_LIMIT = 10_000
+
+
+class QuantileSketch:
+    """Mergeable quantile sketch with bounded memory (KLL).
+
+    Values are kept in levels of sorted compactors. An item at level h
+    stands for 2**h of the original values. When a level is full it is
+    sorted and every other item moves up a level, so memory grows with
+    the log of the number of values rather than the number of values.
+    Compaction alternates its offset instead of picking one at random,
+    which keeps the sketch, and so the pipeline output, reproducible.
+
+    Args:
+        k: Capacity of the top level; larger is more accurate
+    """
+
+    def __init__(self, k: int = DEFAULT_SKETCH_SIZE) -> None:
+        self.k = k
+        self.levels: list[np.ndarray] = [np.empty(0)]
+        self.offsets: list[int] = [0]
+        self.count = 0
+
+    def update(self, values: np.ndarray) -> None:
+        """Add values to the sketch.
+
+        Args:
+            values: One-dimensional array of numbers without missing values
+        """
+        self.count += len(values)
+        self.levels[0] = np.concatenate([self.levels[0], np.asarray(values, dtype=float)])
+        self._compress()
+
+    def merge(self, other: "QuantileSketch") -> None:
+        """Fold another sketch into this one.
+
+        Args:
+            other: Sketch built over a different part of the data
+        """
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+            self.offsets.append(0)
+        for h, items in enumerate(other.levels):
+            self.levels[h] = np.concatenate([self.levels[h], items])
+        self.count += other.count
+        self._compress()
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile of the values added so far.
+
+        Args:
+            q: Quantile between 0 and 1
+
+        Returns:
+            Estimated quantile, or NaN if the sketch is empty
+        """
+        if self.count == 0:
+            return math.nan
+        values = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(items), 2**h) for h, items in enumerate(self.levels)])
+        order = np.argsort(values, kind="stable")
+        cumulative = np.cumsum(weights[order])
+        position = np.searchsorted(cumulative, q * cumulative[-1], side="left")
+        return float(values[order][min(position, len(values) - 1)])
+
+    def _capacity(self, h: int) -> int:
+        depth = len(self.levels) - h - 1
+        return max(math.ceil(self.k * (2 / 3) ** depth), 2)
+
+    def _compress(self) -> None:
+        h = 0
+        while h < len(self.levels):
+            if len(self.levels[h]) > self._capacity(h):
+                if h + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                    self.offsets.append(0)
+                items = np.sort(self.levels[h])
+                # An odd item out stays behind so no weight is lost
+                keep = items[-1:] if len(items) % 2 else items[:0]
+                paired = items[: len(items) - len(keep)]
+                promoted = paired[self.offsets[h] :: 2]
+                self.offsets[h] ^= 1
+                self.levels[h] = keep
+                self.levels[h + 1] = np.concatenate([self.levels[h + 1], promoted])
+            h += 1
+
+
+class FillStatistics:
+    """Mergeable statistics for the values clean_data fills missing data with.
+
+    Non-numeric columns keep exact value counts, so their mode is exact.
+    Numeric columns keep exact value counts while they have at most
+    exact_limit distinct values, giving the exact median, and a
+    QuantileSketch that takes over once there are more. The sketch's
+    median is within about 1.7 / k of the rows of the true median, which
+    is 1% with the default k.
+
+    Args:
+        k: Size of the quantile sketch for numeric columns
+        exact_limit: Distinct values per numeric column counted exactly.
+            None always counts exactly, at the cost of unbounded memory.
+    """
+
+    def __init__(
+        self, k: int = DEFAULT_SKETCH_SIZE, exact_limit: int | None = DEFAULT_EXACT_LIMIT
+    ) -> None:
+        self.k = k
+        self.exact_limit = exact_limit
+        self.columns: dict[Any, dict[str, Any]] = {}
+
+    def update(self, df: pd.DataFrame) -> None:
+        """Add the values of a frame, typically one chunk of a larger source.
+
+        Args:
+            df: Chunk with normalised column names
+        """
+        for column in df.columns:
+            values = df[column].dropna()
+            if values.empty:
+                continue
+            stats = self.columns.get(column)
+            numeric = is_fill_numeric(values.dtype)
+            if stats is None:
+                stats = self.columns[column] = self._empty(numeric=numeric)
+            elif stats["numeric"] != numeric:
+                msg = f"Column {column} changes between numeric and non-numeric values"
+                raise ValueError(msg)
+
+            if numeric:
+                stats["integer"] &= pd.api.types.is_integer_dtype(values.dtype)
+                stats["sketch"].update(values.to_numpy(dtype=float))
+            if stats["counts"] is not None:
+                counts = values.value_counts(sort=False)
+                stats["counts"].update(counts[counts > 0].to_dict())
+                self._limit(stats)
+
+    def merge(self, other: "FillStatistics") -> None:
+        """Fold statistics gathered over another part of the data into these.
+
+        Args:
+            other: Statistics built over a different part of the data
+        """
+        for column, theirs in other.columns.items():
+            ours = self.columns.get(column)
+            if ours is None:
+                ours = self.columns[column] = self._empty(numeric=theirs["numeric"])
+            elif ours["numeric"] != theirs["numeric"]:
+                msg = f"Column {column} changes between numeric and non-numeric values"
+                raise ValueError(msg)
+            if ours["numeric"]:
+                ours["integer"] &= theirs["integer"]
+                ours["sketch"].merge(theirs["sketch"])
+            if ours["counts"] is not None and theirs["counts"] is not None:
+                ours["counts"].update(theirs["counts"])
+                self._limit(ours)
+            else:
+                ours["counts"] = None
+
+    def fill_values(self) -> dict[Any, Any]:
+        """Compute the value each column's missing values are filled with.
+
+        Matches transform.fill_values: numeric columns get their median,
+        rounded for integer columns, and other columns their most frequent
+        value, the smallest one on ties.
+
+        Returns:
+            Dictionary of column name to fill value
+        """
+        values = {}
+        for column, stats in self.columns.items():
+            if not stats["numeric"]:
+                values[column] = _mode(stats["counts"])
+                continue
+            if stats["counts"] is not None:
+                median = _exact_median(stats["counts"])
+            else:
+                median = stats["sketch"].quantile(0.5)
+            values[column] = round(median) if stats["integer"] else median
+        return values
+
+    def _empty(self, *, numeric: bool) -> dict[str, Any]:
+        return {
+            "numeric": numeric,
+            "integer": numeric,
+            "counts": Counter(),
+            "sketch": QuantileSketch(self.k) if numeric else None,
+        }
+
+    def _limit(self, stats: dict[str, Any]) -> None:
+        # Past the limit numeric columns rely on the sketch alone
+        limit = self.exact_limit
+        if stats["numeric"] and limit is not None and len(stats["counts"]) > limit:
+            stats["counts"] = None
+
+
+class SummaryStatistics:
+    """Mergeable statistics for the data summary written with each output.
+
+    One update per chunk records the row count, dtypes and missing values of
+    every column and, for numeric columns, the count, mean, standard
+    deviation, minimum, maximum and quartiles that DataFrame.describe
+    reports. Means and variances are combined across chunks with Chan's
+    parallel algorithm. Quartiles are exact while a column has at most
+    exact_limit distinct values and come from a QuantileSketch after that.
+
+    Args:
+        k: Size of the quantile sketch for numeric columns
+        exact_limit: Distinct values per numeric column counted exactly.
+            None always counts exactly, at the cost of unbounded memory.
+    """
+
+    def __init__(
+        self, k: int = DEFAULT_SKETCH_SIZE, exact_limit: int | None = DEFAULT_EXACT_LIMIT
+    ) -> None:
+        self.k = k
+        self.exact_limit = exact_limit
+        self.rows = 0
+        self.data_types: dict[Any, Any] = {}
+        self.missing_values: dict[Any, int] = {}
+        self.numeric: dict[Any, dict[str, Any]] = {}
+
+    def update(self, df: pd.DataFrame) -> None:
+        """Add the rows of a frame, typically one chunk of a larger output.
+
+        Args:
+            df: DataFrame or chunk to summarise
+        """
+        self.rows += len(df)
+        for column, missing in df.isna().sum().items():
+            self.missing_values[column] = self.missing_values.get(column, 0) + int(missing)
+        for column, dtype in df.dtypes.items():
+            self._record_dtype(column, dtype)
+            if not is_summary_numeric(dtype):
+                continue
+            values = df[column].to_numpy(dtype=float, na_value=np.nan)
+            values = values[~np.isnan(values)]
+            stats = self._empty()
+            if len(values):
+                mean = float(values.mean())
+                stats.update(
+                    count=len(values),
+                    mean=mean,
+                    m2=float(((values - mean) ** 2).sum()),
+                    min=float(values.min()),
+                    max=float(values.max()),
+                )
+                stats["sketch"].update(values)
+                stats["counts"] = self._value_counts(column, values)
+            self._merge_numeric(column, stats)
+
+    def merge(self, other: "SummaryStatistics") -> None:
+        """Fold statistics gathered over another part of the data into these.
+
+        Args:
+            other: Statistics built over a different part of the data
+        """
+        self.rows += other.rows
+        for column, missing in other.missing_values.items():
+            self.missing_values[column] = self.missing_values.get(column, 0) + missing
+        for column, dtype in other.data_types.items():
+            self._record_dtype(column, dtype)
+        for column, stats in other.numeric.items():
+            self._merge_numeric(column, stats)
+
+    def summary(self) -> dict[str, Any]:
+        """Build the summary in the layout written by create_data_summary.
+
+        Returns:
+            Dictionary of row and column counts, dtypes, missing values and
+            a describe-style numeric summary per numeric column
+        """
+        numeric_summary = {}
+        for column, stats in self.numeric.items():
+            count = stats["count"]
+            quartiles = [self._quantile(stats, q) for q in (0.25, 0.5, 0.75)]
+            numeric_summary[column] = {
+                "count": float(count),
+                "mean": stats["mean"] if count else math.nan,
+                "std": math.sqrt(stats["m2"] / (count - 1)) if count > 1 else math.nan,
+                "min": stats["min"] if count else math.nan,
+                "25%": quartiles[0],
+                "50%": quartiles[1],
+                "75%": quartiles[2],
+                "max": stats["max"] if count else math.nan,
+            }
+        return {
+            "total_rows": self.rows,
+            "total_columns": len(self.data_types),
+            "column_names": list(self.data_types),
+            "data_types": {column: str(dtype) for column, dtype in self.data_types.items()},
+            "missing_values": dict(self.missing_values),
+            "numeric_summary": numeric_summary,
+        }
+
+    def _record_dtype(self, column: Any, dtype: Any) -> None:
+        # Chunks may disagree, e.g. integers in one and floats with missing
+        # values in another, so keep the type that holds both
+        known = self.data_types.setdefault(column, dtype)
+        if known != dtype:
+            numpy_types = isinstance(known, np.dtype) and isinstance(dtype, np.dtype)
+            self.data_types[column] = np.result_type(known, dtype) if numpy_types else "object"
+
+    def _value_counts(self, column: Any, values: np.ndarray) -> Counter | None:
+        # Columns already past the limit rely on the sketch alone
+        known = self.numeric.get(column)
+        if known is not None and known["counts"] is None:
+            return None
+        unique, counts = np.unique(values, return_counts=True)
+        if self.exact_limit is not None and len(unique) > self.exact_limit:
+            return None
+        return Counter(dict(zip(unique.tolist(), counts.tolist(), strict=True)))
+
+    def _empty(self) -> dict[str, Any]:
+        return {
+            "count": 0,
+            "mean": 0.0,
+            "m2": 0.0,
+            "min": math.inf,
+            "max": -math.inf,
+            "counts": Counter(),
+            "sketch": QuantileSketch(self.k),
+        }
+
+    def _merge_numeric(self, column: Any, theirs: dict[str, Any]) -> None:
+        ours = self.numeric.setdefault(column, self._empty())
+        count = ours["count"] + theirs["count"]
+        if theirs["count"]:
+            delta = theirs["mean"] - ours["mean"]
+            ours["m2"] += theirs["m2"] + delta**2 * ours["count"] * theirs["count"] / count
+            ours["mean"] += delta * theirs["count"] / count
+            ours["min"] = min(ours["min"], theirs["min"])
+            ours["max"] = max(ours["max"], theirs["max"])
+            ours["sketch"].merge(theirs["sketch"])
+        ours["count"] = count
+        if ours["counts"] is not None and theirs["counts"] is not None:
+            ours["counts"].update(theirs["counts"])
+            if self.exact_limit is not None and len(ours["counts"]) > self.exact_limit:
+                ours["counts"] = None
+        else:
+            ours["counts"] = None
+
+    def _quantile(self, stats: dict[str, Any], q: float) -> float:
+        if not stats["count"]:
+            return math.nan
+        if stats["counts"] is not None:
+            return _exact_quantile(stats["counts"], q)
+        return float(stats["sketch"].quantile(q))
+
+
+def is_summary_numeric(dtype: Any) -> bool:
+    """Whether DataFrame.describe summarises a column of this dtype as numeric."""
+    return pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype)
+
+
+def _exact_quantile(counts: Counter, q: float) -> float:
+    """Quantile from value counts, interpolating linearly like numpy."""
+    values = np.array(sorted(counts), dtype=float)
+    cumulative = np.cumsum([counts[value] for value in sorted(counts)])
+    position = q * (int(cumulative[-1]) - 1)
+    lower = values[np.searchsorted(cumulative, math.floor(position), side="right")]
+    upper = values[np.searchsorted(cumulative, math.ceil(position), side="right")]
+    # The same two-sided interpolation numpy uses, so results match exactly
+    fraction = position - math.floor(position)
+    difference = upper - lower
+    if fraction >= 0.5:  # noqa: PLR2004
+        return float(upper - difference * (1 - fraction))
+    return float(lower + difference * fraction)
+
+
+def _exact_median(counts: Counter) -> float:
+    """Median from value counts, averaging the middle pair like pandas."""
+    values = np.array(sorted(counts), dtype=float)
+    cumulative = np.cumsum([counts[value] for value in sorted(counts)])
+    total = int(cumulative[-1])
+    lower = values[np.searchsorted(cumulative, (total - 1) // 2, side="right")]
+    upper = values[np.searchsorted(cumulative, total // 2, side="right")]
+    return float((lower + upper) / 2)
+
+
+def _mode(counts: Counter) -> Any:
+    """Most frequent value, the smallest one on ties as Series.mode gives."""
+    top = max(counts.values())
+    tied = [value for value, count in counts.items() if count == top]
+    try:
+        return sorted(tied)[0]
+    except TypeError:
+        return tied[0]
+
+
+def fill_values_from_chunks(chunks: Any, **kwargs: Any) -> dict[Any, Any]:
+    """Compute global fill values in one pass over chunks of a source.
+
+    Args:
+        chunks: Iterable of DataFrames with normalised column names
+        **kwargs: Arguments for FillStatistics
+
+    Returns:
+        Dictionary of column name to fill value
+    """
+    statistics = FillStatistics(**kwargs)
+    rows = 0
+    for chunk in chunks:
+        statistics.update(chunk)
+        rows += len(chunk)
+    logger.info("Computed fill values over %d rows", rows)
+    return statistics.fill_values()
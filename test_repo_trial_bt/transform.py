@@ -1,16 +1,77 @@
 import logging
-from typing import Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any
 
+import numpy as np
 import pandas as pd
+from pandas.tseries.api import guess_datetime_format
+
+from .metrics import timed_step
+
+if TYPE_CHECKING:
+    from .dedup import RowDeduplicator
+    from .plan import TransformPlan
+    from .rules import RuleRegistry
 
 logger = logging.getLogger(__name__)
 
+# Filters applied by apply_business_rules after the calculated columns are added
+BUSINESS_RULE_FILTERS: dict[str, Any] = {"quantity": {"min": 0}}
+
+# Columns added by add_calculated_columns, with the source columns each one needs
+# and the columns it writes
+CALCULATED_COLUMNS: dict[str, dict[str, tuple[str, ...]]] = {
+    "total_value": {"inputs": ("quantity", "price"), "outputs": ("total_value",)},
+    "date_columns": {"inputs": ("date",), "outputs": ("date", "year", "month", "day_of_week")},
+}
+
+# Categories of the day_of_week column, in calendar order
+DAY_NAMES = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+
+# Incomplete columns whose fill values are computed together, and the unit of
+# work when filling on several threads
+FILL_BLOCK_COLUMNS = 64
+
+# Rows sampled to estimate how selective each filter predicate is
+SELECTIVITY_SAMPLE_ROWS = 1024
+
+# Relative cost of each predicate, used to break ties between equally selective ones
+PREDICATE_COSTS = {"==": 0, ">=": 1, "<=": 1, "in": 2}
+
 
 class DataTransformer:
-    """Class for transforming and cleaning data."""
+    """Class for transforming and cleaning data.
+
+    Args:
+        date_format: strftime format of the date column. If not given, it is
+            guessed from the first date and reused for later frames.
+        max_workers: Threads used to fill missing values in frames with more
+            than FILL_BLOCK_COLUMNS incomplete columns. None fills on the
+            calling thread.
+        fill_values: Values to fill missing data with, by column, instead of
+            the statistics of the frame being cleaned. Used to apply values
+            computed over a whole source to each chunk of it.
+        deduplicator: RowDeduplicator that remembers rows across calls, so
+            duplicates are removed across chunks and files. Without one,
+            duplicates are only found within each frame.
+    """
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        date_format: str | None = None,
+        max_workers: int | None = None,
+        fill_values: dict[Any, Any] | None = None,
+        deduplicator: "RowDeduplicator | None" = None,
+    ) -> None:
+        self.date_format = date_format
+        self.max_workers = max_workers
+        self.fill_values = fill_values
+        self.deduplicator = deduplicator
         self.transformation_log: list[str] = []
+        # Per-predicate row counts from the most recent filter_data call
+        self.filter_stats: list[dict[str, Any]] = []
+        # Wall and CPU time, rows and calls of each step, see metrics.timed_step
+        self.step_timings: dict[str, dict[str, Any]] = {}
 
     def clean_data(self, df: pd.DataFrame) -> pd.DataFrame:
         """Clean the data by removing duplicates and handling missing values.
@@ -22,29 +83,72 @@ class DataTransformer:
             Cleaned DataFrame
         """
         logger.info("Starting data cleaning process")
+        return self.fill_missing_values(self.remove_duplicates(df))
+
+    @timed_step
+    def remove_duplicates(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Remove duplicate rows, keeping the first occurrence.
+
+        Rows are only copied when some are dropped; otherwise a shallow copy
+        sharing column data with df is returned. With a deduplicator, rows
+        seen in earlier frames are dropped as well.
+
+        Args:
+            df: Input DataFrame
 
-        # Remove duplicates
-        initial_rows = len(df)
-        df_cleaned = df.drop_duplicates()
-        duplicates_removed = initial_rows - len(df_cleaned)
+        Returns:
+            DataFrame without duplicate rows
+        """
+        if self.deduplicator is not None:
+            duplicated = ~self.deduplicator.unique_mask(df)
+        else:
+            duplicated = df.duplicated().to_numpy()
+        duplicates_removed = int(duplicated.sum())
 
         if duplicates_removed > 0:
             logger.info("Removed %d duplicate rows", duplicates_removed)
             self.transformation_log.append(f"Removed {duplicates_removed} duplicates")
+            return df.take(np.flatnonzero(~duplicated))
+        return df.copy(deep=False)
 
-        # Handle missing values - fill numeric columns with median, categorical with mode
-        for column in df_cleaned.columns:
-            if df_cleaned[column].isna().any():
-                if df_cleaned[column].dtype in ["int64", "float64"]:
-                    df_cleaned[column] = df_cleaned[column].fillna(df_cleaned[column].median())
-                    logger.info("Filled missing values in %s with median", column)
-                else:
-                    mode_value = df_cleaned[column].mode()
-                    if not mode_value.empty:
-                        df_cleaned[column] = df_cleaned[column].fillna(mode_value[0])
-                        logger.info("Filled missing values in %s with mode", column)
+    @timed_step
+    def fill_missing_values(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Fill numeric columns with their median and other columns with their mode.
+
+        Only columns with missing values are touched. Fill values are computed
+        with one median and one mode aggregation per block of columns, and
+        blocks are filled in parallel when max_workers is set.
+
+        Args:
+            df: Input DataFrame
 
-        return df_cleaned
+        Returns:
+            DataFrame with missing values filled
+        """
+        # Filling replaces whole columns of a shallow copy rather than writing into them
+        df_filled = df.copy(deep=False)
+        preset = self.fill_values or {}
+        missing = df.isna()
+        incomplete = df.columns[missing.any().to_numpy()].tolist()
+        blocks = [
+            incomplete[i : i + FILL_BLOCK_COLUMNS]
+            for i in range(0, len(incomplete), FILL_BLOCK_COLUMNS)
+        ]
+
+        if self.max_workers is not None and len(blocks) > 1:
+            with ThreadPoolExecutor(self.max_workers) as pool:
+                filled_blocks = list(
+                    pool.map(lambda block: _fill_block(df, block, missing, preset), blocks)
+                )
+        else:
+            filled_blocks = [_fill_block(df, block, missing, preset) for block in blocks]
+
+        for filled in filled_blocks:
+            for column, (values, statistic) in filled.items():
+                df_filled[column] = values
+                logger.info("Filled missing values in %s with %s", column, statistic)
+
+        return df_filled
 
     def add_calculated_columns(self, df: pd.DataFrame) -> pd.DataFrame:
         """Add calculated columns based on existing data.
@@ -55,52 +159,120 @@ class DataTransformer:
         Returns:
             DataFrame with additional calculated columns
         """
-        df_transformed = df.copy()
+        # New and replaced columns go into a shallow copy, leaving df untouched
+        df_transformed = df.copy(deep=False)
 
         # Example transformations - adjust based on your data structure
-        if "quantity" in df.columns and "price" in df.columns:
-            df_transformed["total_value"] = df_transformed["quantity"] * df_transformed["price"]
+        for name, derivation in CALCULATED_COLUMNS.items():
+            if all(column in df.columns for column in derivation["inputs"]):
+                self.derive_columns(df_transformed, name)
+
+        return df_transformed
+
+    @timed_step
+    def derive_columns(self, df: pd.DataFrame, name: str) -> None:
+        """Add one of the CALCULATED_COLUMNS derivations to a frame in place.
+
+        Args:
+            df: DataFrame owned by the caller, typically a shallow copy
+            name: Key of the derivation in CALCULATED_COLUMNS
+        """
+        if name == "total_value":
+            df["total_value"] = df["quantity"] * df["price"]
             logger.info("Added total_value column")
             self.transformation_log.append("Added total_value column")
-
-        if "date" in df.columns:
-            df_transformed["date"] = pd.to_datetime(df_transformed["date"])
-            df_transformed["year"] = df_transformed["date"].dt.year
-            df_transformed["month"] = df_transformed["date"].dt.month
-            df_transformed["day_of_week"] = df_transformed["date"].dt.day_name()
+        elif name == "date_columns":
+            features, self.date_format = date_features(df["date"], self.date_format)
+            for column in features.columns:
+                df[column] = features[column]
             logger.info("Added date-based columns")
             self.transformation_log.append("Added date-based columns")
-
-        return df_transformed
-
-    def filter_data(self, df: pd.DataFrame, filters: dict[str, Any]) -> pd.DataFrame:
+        else:
+            msg = f"Unknown calculated column: {name}"
+            raise ValueError(msg)
+
+    @timed_step
+    def filter_data(
+        self, df: pd.DataFrame, filters: dict[str, Any], use_eval: bool = False
+    ) -> pd.DataFrame:
         """Filter data based on given criteria.
 
+        The criteria are compiled into a list of predicates. By default the
+        predicates are ordered most selective first, estimated on a sample of
+        rows, and each one is evaluated only on the rows that passed the ones
+        before it. Rows are selected from the frame once at the end.
+
         Args:
             df: Input DataFrame
             filters: Dictionary of column names and filter criteria
+            use_eval: Evaluate all predicates as one DataFrame.eval expression,
+                which uses numexpr when it is installed
 
         Returns:
             Filtered DataFrame
         """
-        df_filtered = df.copy()
+        predicates = compile_filters(filters, df.columns)
 
-        for column, criteria in filters.items():
-            if column in df_filtered.columns:
-                if isinstance(criteria, dict):
-                    if "min" in criteria:
-                        df_filtered = df_filtered[df_filtered[column] >= criteria["min"]]
-                    if "max" in criteria:
-                        df_filtered = df_filtered[df_filtered[column] <= criteria["max"]]
-                elif isinstance(criteria, list):
-                    df_filtered = df_filtered[df_filtered[column].isin(criteria)]
-                else:
-                    df_filtered = df_filtered[df_filtered[column] == criteria]
+        if use_eval and predicates:
+            positions = np.flatnonzero(_eval_mask(df, predicates))
+            self.filter_stats = [
+                {**predicate, "evaluated": len(df), "kept": None} for predicate in predicates
+            ]
+        else:
+            positions, self.filter_stats = _evaluate_in_order(df, predicates)
 
+        for column, criteria in filters.items():
+            if column in df.columns:
+                stats = [
+                    f"{stat['op']} kept {stat['kept']} of {stat['evaluated']} rows"
+                    for stat in self.filter_stats
+                    if stat["column"] == column and stat["kept"] is not None
+                ]
                 logger.info("Applied filter on %s: %s", column, criteria)
-                self.transformation_log.append(f"Applied filter on {column}")
+                self.transformation_log.append(
+                    f"Applied filter on {column} ({'; '.join(stats)})"
+                    if stats
+                    else f"Applied filter on {column}"
+                )
+
+        if use_eval and predicates:
+            logger.info("Filters kept %d of %d rows", len(positions), len(df))
+        if len(positions) == len(df):
+            return df.copy(deep=False)
+        return df.take(positions)
+
+    @timed_step
+    def apply_predicates(self, df: pd.DataFrame, predicates: list[dict[str, Any]]) -> pd.DataFrame:
+        """Keep the rows passing every predicate in a compiled list.
+
+        Unlike filter_data, a column may appear in several predicates, as
+        happens when a plan combines filters from more than one step.
+
+        Args:
+            df: Input DataFrame
+            predicates: Predicates from compile_filters
+
+        Returns:
+            Filtered DataFrame
+        """
+        positions, self.filter_stats = _evaluate_in_order(df, predicates)
+        logger.info("Predicates kept %d of %d rows", len(positions), len(df))
+        self.transformation_log.append(
+            f"Applied {len(predicates)} predicates (kept {len(positions)} of {len(df)} rows)"
+        )
+        if len(positions) == len(df):
+            return df.copy(deep=False)
+        return df.take(positions)
+
+    def lazy(self) -> "TransformPlan":
+        """Start a lazy plan whose steps are logged to this transformer.
+
+        Returns:
+            Empty TransformPlan; see test_repo_trial_bt.plan
+        """
+        from .plan import TransformPlan  # noqa: PLC0415
 
-        return df_filtered
+        return TransformPlan(self)
 
     def get_transformation_summary(self) -> list[str]:
         """Get summary of all transformations applied.
@@ -111,29 +283,294 @@ class DataTransformer:
         return self.transformation_log.copy()
 
 
-def apply_business_rules(df: pd.DataFrame) -> pd.DataFrame:
+def _as_mask(condition: pd.Series) -> np.ndarray:
+    """Convert a boolean Series to a NumPy mask, treating missing as False."""
+    return condition.to_numpy(dtype=bool, na_value=False)
+
+
+def compile_filters(
+    filters: dict[str, Any], columns: pd.Index | None = None
+) -> list[dict[str, Any]]:
+    """Turn a filter dictionary into a flat list of predicates.
+
+    Args:
+        filters: Dictionary of column names and filter criteria, as taken by
+            DataTransformer.filter_data
+        columns: Columns of the frame being filtered; criteria on other
+            columns are skipped. None keeps every criterion.
+
+    Returns:
+        List of predicates, each a dictionary with column, op and value keys
+    """
+    predicates: list[dict[str, Any]] = []
+    for column, criteria in filters.items():
+        if columns is not None and column not in columns:
+            continue
+        if isinstance(criteria, dict):
+            if "min" in criteria:
+                predicates.append({"column": column, "op": ">=", "value": criteria["min"]})
+            if "max" in criteria:
+                predicates.append({"column": column, "op": "<=", "value": criteria["max"]})
+        elif isinstance(criteria, list):
+            predicates.append({"column": column, "op": "in", "value": criteria})
+        else:
+            predicates.append({"column": column, "op": "==", "value": criteria})
+    return predicates
+
+
+def _evaluate_predicate(values: pd.Series, predicate: dict[str, Any]) -> np.ndarray:
+    """Evaluate a single predicate against a column."""
+    op, value = predicate["op"], predicate["value"]
+    if op == ">=":
+        return _as_mask(values >= value)
+    if op == "<=":
+        return _as_mask(values <= value)
+    if op == "in":
+        return _as_mask(values.isin(value))
+    return _as_mask(values == value)
+
+
+def pushdown_mask(df: pd.DataFrame, predicates: list[dict[str, Any]]) -> np.ndarray:
+    """Find the rows of a raw extract that could still pass the predicates.
+
+    Used to drop rows while extracting, before cleaning. Predicate columns
+    are matched against the normalised source column names. Missing values
+    are kept because clean_data may fill them with a value that passes,
+    unless the predicate sets keep_missing to False.
+
+    Args:
+        df: Extracted DataFrame, before normalise_column_names
+        predicates: Predicates from compile_filters
+
+    Returns:
+        Boolean mask of the rows to keep
+    """
+    lookup = column_lookup(df.columns)
+    mask = np.ones(len(df), dtype=bool)
+    for predicate in predicates:
+        column = lookup.get(predicate["column"])
+        if column is None:
+            continue
+        values = df[column]
+        passed = _evaluate_predicate(values, predicate)
+        if predicate.get("keep_missing", True):
+            passed |= values.isna().to_numpy()
+        mask &= passed
+    return mask
+
+
+def has_missing(df: pd.DataFrame) -> bool:
+    """Check whether a frame has any missing values.
+
+    Rows may only be dropped before cleaning when this is False, because
+    missing values are filled from statistics over every row.
+
+    Args:
+        df: DataFrame to check
+
+    Returns:
+        True if any value is missing
+    """
+    return bool(df.isna().to_numpy().any())
+
+
+def column_lookup(columns: pd.Index) -> dict[str, Any]:
+    """Map normalised column names back to the original names.
+
+    Args:
+        columns: Original column names
+
+    Returns:
+        Dictionary of normalised name to original name
+    """
+    return dict(zip(_normalise_index(columns), columns, strict=True))
+
+
+def _normalise_index(columns: pd.Index) -> pd.Index:
+    return columns.str.lower().str.replace(" ", "_").str.replace("-", "_")
+
+
+def _evaluate_in_order(
+    df: pd.DataFrame, predicates: list[dict[str, Any]]
+) -> tuple[np.ndarray, list[dict[str, Any]]]:
+    """Evaluate predicates most selective first, each on the surviving rows.
+
+    Args:
+        df: Input DataFrame
+        predicates: Predicates from compile_filters
+
+    Returns:
+        Tuple of the positions of rows passing every predicate and the
+        per-predicate row counts, in evaluation order
+    """
+    order = list(range(len(predicates)))
+    if len(predicates) > 1 and len(df) > 0:
+        sample = np.unique(np.linspace(0, len(df) - 1, SELECTIVITY_SAMPLE_ROWS).astype(int))
+        estimates = [
+            _evaluate_predicate(df[p["column"]].take(sample), p).mean() for p in predicates
+        ]
+        order.sort(key=lambda i: (estimates[i], PREDICATE_COSTS[predicates[i]["op"]]))
+
+    positions = np.arange(len(df))
+    stats = []
+    for i in order:
+        predicate = predicates[i]
+        column = df[predicate["column"]]
+        values = column if len(positions) == len(df) else column.take(positions)
+        evaluated = len(positions)
+        positions = positions[_evaluate_predicate(values, predicate)]
+        stats.append({**predicate, "evaluated": evaluated, "kept": len(positions)})
+    return positions, stats
+
+
+def _eval_mask(df: pd.DataFrame, predicates: list[dict[str, Any]]) -> np.ndarray:
+    """Evaluate all predicates as a single DataFrame.eval expression."""
+    values = {f"value_{i}": predicate["value"] for i, predicate in enumerate(predicates)}
+    expression = " & ".join(
+        f"(`{predicate['column']}` {predicate['op']} @value_{i})"
+        for i, predicate in enumerate(predicates)
+    )
+    return _as_mask(pd.Series(df.eval(expression, local_dict=values)))
+
+
+def is_fill_numeric(dtype: Any) -> bool:
+    """Check whether missing values of a dtype are filled with the median.
+
+    Every numeric dtype qualifies, including float32 and the nullable
+    integer and float dtypes. Booleans are filled with their mode.
+    """
+    return pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype)
+
+
+def fill_values(df: pd.DataFrame) -> dict[Any, Any]:
+    """Compute the value used to fill each column of a frame.
+
+    Numeric columns get their median, rounded for integer dtypes so the
+    dtype is kept, and other columns their most frequent value (the
+    smallest one on ties). Columns without any values are left out.
+
+    Args:
+        df: Columns to compute fill values for
+
+    Returns:
+        Dictionary of column name to fill value
+    """
+    numeric = [column for column, dtype in df.dtypes.items() if is_fill_numeric(dtype)]
+    others = [column for column in df.columns if column not in set(numeric)]
+    values: dict[Any, Any] = {}
+    if numeric:
+        for column, median in df[numeric].median().items():
+            integer = pd.api.types.is_integer_dtype(df[column].dtype)
+            values[column] = round(median) if integer and not pd.isna(median) else median
+    if others:
+        modes = df[others].mode()
+        if len(modes):
+            values.update(modes.iloc[0].items())
+    return {column: value for column, value in values.items() if not pd.isna(value)}
+
+
+def _fill_block(
+    df: pd.DataFrame, block: list[str], missing: pd.DataFrame, preset: dict[Any, Any]
+) -> dict[str, tuple[pd.Series, str]]:
+    """Fill one block of incomplete columns, returning the filled columns.
+
+    Columns in preset are filled with the given value; the fill values of
+    the others are computed from df. NumPy float and object columns are
+    filled by writing into a copy at the missing positions found earlier,
+    rather than searching for them again.
+    """
+    block_values = {column: preset[column] for column in block if column in preset}
+    if len(block_values) < len(block):
+        remaining = [column for column in block if column not in block_values]
+        block_values.update(fill_values(df[remaining]))
+
+    filled = {}
+    for column, value in block_values.items():
+        values = df[column]
+        if isinstance(values.dtype, np.dtype) and values.dtype.kind in "fO":
+            array = values.to_numpy(copy=True)
+            array[missing[column].to_numpy()] = value
+            filled_values = pd.Series(array, index=values.index, name=column)
+        else:
+            filled_values = values.fillna(value)
+        statistic = "median" if is_fill_numeric(values.dtype) else "mode"
+        filled[column] = (filled_values, statistic)
+    return filled
+
+
+def date_features(
+    values: pd.Series, date_format: str | None = None
+) -> tuple[pd.DataFrame, str | None]:
+    """Parse dates and derive year, month and day_of_week from the distinct values.
+
+    Each distinct value is parsed and broken down once and the results are
+    broadcast back to the rows, so the cost follows the number of distinct
+    dates rather than the number of rows. day_of_week is categorical.
+
+    Args:
+        values: Date strings, or dates that are already parsed
+        date_format: strftime format of the strings. If None, it is guessed
+            from the first distinct value.
+
+    Returns:
+        Tuple of a DataFrame with date, year, month and day_of_week columns,
+        and the format used, which can be passed back for the next frame
+    """
+    codes, uniques = pd.factorize(values)
+    if pd.api.types.is_datetime64_any_dtype(values):
+        parsed = pd.DatetimeIndex(uniques)
+    else:
+        if date_format is None and len(uniques) and isinstance(uniques[0], str):
+            date_format = guess_datetime_format(uniques[0])
+        parsed = pd.DatetimeIndex(pd.to_datetime(pd.Index(uniques), format=date_format))
+
+    # Missing dates point at a trailing NaT so one take covers every row
+    if (codes < 0).any():
+        parsed = pd.DatetimeIndex(parsed.insert(len(parsed), pd.NaT))
+        codes = np.where(codes < 0, len(parsed) - 1, codes)
+
+    weekdays = np.nan_to_num(parsed.dayofweek.to_numpy(dtype=float), nan=-1).astype(int)
+    features = pd.DataFrame(
+        {
+            "date": parsed.take(codes),
+            "year": parsed.year.take(codes),
+            "month": parsed.month.take(codes),
+            "day_of_week": pd.Categorical.from_codes(
+                weekdays.take(codes), dtype=pd.CategoricalDtype(list(DAY_NAMES), ordered=True)
+            ),
+        },
+        index=values.index,
+    )
+    return features, date_format
+
+
+def apply_business_rules(
+    df: pd.DataFrame,
+    transformer: DataTransformer | None = None,
+    rules: "RuleRegistry | None" = None,
+) -> pd.DataFrame:
     """Helper function to apply business-specific transformation rules.
 
     Args:
         df: Input DataFrame
+        transformer: Transformer to apply the rules with, for example one
+            holding fill values computed over a whole source. A new one is
+            used by default.
+        rules: Registry of business rules, defaulting to rules.default_rules
+            (total_value, date columns and no negative quantities)
 
     Returns:
         Transformed DataFrame
     """
-    transformer = DataTransformer()
+    from .rules import default_rules  # noqa: PLC0415
+
+    transformer = transformer or DataTransformer()
 
     # Clean the data
     df_cleaned = transformer.clean_data(df)
 
-    # Add calculated columns
-    df_enhanced = transformer.add_calculated_columns(df_cleaned)
-
-    # Apply any business-specific filters
-    # Example: filter out negative quantities
-    if "quantity" in df_enhanced.columns:
-        df_filtered = transformer.filter_data(df_enhanced, {"quantity": {"min": 0}})
-    else:
-        df_filtered = df_enhanced
+    # Add calculated columns and apply business-specific filters in one pass
+    df_filtered = (rules or default_rules()).apply(df_cleaned, transformer)
 
     logger.info("Business rules applied successfully")
     return df_filtered
@@ -148,9 +585,8 @@ def normalise_column_names(df: pd.DataFrame) -> pd.DataFrame:
     Returns:
         DataFrame with normalised column names
     """
-    df_normalised = df.copy()
-    df_normalised.columns = (
-        df_normalised.columns.str.lower().str.replace(" ", "_").str.replace("-", "_")
-    )
+    # Relabelling a shallow copy leaves df's labels and data untouched
+    df_normalised = df.copy(deep=False)
+    df_normalised.columns = _normalise_index(df_normalised.columns)
     logger.info("Column names normalised")
     return df_normalised
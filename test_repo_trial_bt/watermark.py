@@ -0,0 +1,108 @@
+import json
+import logging
+import os
+import pickle
+import tempfile
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .stats import SummaryStatistics
+
+logger = logging.getLogger(__name__)
+
+
+class WatermarkStore:
+    """Persist how far each append-only source has been processed.
+
+    Watermarks are kept in a small JSON file keyed by the resolved source
+    path. Each watermark records the byte offset just past the last complete
+    row that was loaded, together with hashes used to detect a source that
+    was rewritten rather than appended to. The statistics behind the data
+    summary of everything loaded so far are kept next to the JSON file, so
+    each run only has to add the rows it appends.
+
+    Args:
+        state_path: Path of the JSON file holding the watermarks
+    """
+
+    def __init__(self, state_path: str) -> None:
+        self.state_path = Path(state_path)
+
+    def get(self, source_path: str) -> dict[str, Any] | None:
+        """Get the watermark for a source.
+
+        Args:
+            source_path: Path to the source file
+
+        Returns:
+            The stored watermark, or None if the source has not been processed
+        """
+        return self._read().get(self._key(source_path))
+
+    def set(self, source_path: str, watermark: dict[str, Any]) -> None:
+        """Store the watermark for a source.
+
+        Args:
+            source_path: Path to the source file
+            watermark: Watermark to store
+        """
+        state = self._read()
+        state[self._key(source_path)] = watermark
+        self._write(self.state_path, json.dumps(state, indent=2).encode())
+        logger.info("Saved watermark for %s at byte %d", source_path, watermark["offset"])
+
+    def get_summary(self) -> "SummaryStatistics | None":
+        """Get the summary statistics of the rows loaded so far.
+
+        Returns:
+            The stored statistics, or None if none were stored
+        """
+        try:
+            with open(self.summary_path, "rb") as f:
+                statistics: SummaryStatistics = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        return statistics
+
+    def set_summary(self, statistics: "SummaryStatistics") -> None:
+        """Store the summary statistics of the rows loaded so far.
+
+        Args:
+            statistics: Statistics including the rows loaded by this run
+        """
+        self._write(self.summary_path, pickle.dumps(statistics))
+
+    @property
+    def summary_path(self) -> Path:
+        """Path of the file holding the summary statistics."""
+        return self.state_path.with_suffix(".summary.pkl")
+
+    def clear(self, source_path: str) -> None:
+        """Forget the watermark for a source so the next run starts over.
+
+        Args:
+            source_path: Path to the source file
+        """
+        state = self._read()
+        if state.pop(self._key(source_path), None) is not None:
+            self._write(self.state_path, json.dumps(state, indent=2).encode())
+
+    def _write(self, path: Path, data: bytes) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Replace the file atomically so a crash never leaves a torn file
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_name, path)
+
+    def _read(self) -> dict[str, Any]:
+        if not self.state_path.exists():
+            return {}
+        with open(self.state_path) as f:
+            state: dict[str, Any] = json.load(f)
+        return state
+
+    @staticmethod
+    def _key(source_path: str) -> str:
+        return str(Path(source_path).resolve())
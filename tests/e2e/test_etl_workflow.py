@@ -1,3 +1,16 @@
+import contextlib
+import json
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+
+import pandas as pd
+import pytest
+from pandas.tseries.api import guess_datetime_format
+
+from test_repo_trial_bt import ETLPipeline
+from test_repo_trial_bt.batch import run_batch
 from test_repo_trial_bt.extract import extract_from_source
 from test_repo_trial_bt.load import save_to_destination
 from test_repo_trial_bt.transform import apply_business_rules
@@ -27,3 +40,586 @@ def test_etl_workflow() -> None:
     transformed_data = apply_business_rules(raw_data)
     result = save_to_destination(transformed_data, "test_destination.csv")
     assert result is True
+
+
+def test_etl_workflow_chunked(tmp_path: Path) -> None:
+    # Every row in the example data is unique and complete, so streaming in
+    # chunks must give the same output as loading everything at once
+    full_path = tmp_path / "full.csv"
+    chunked_path = tmp_path / "chunked.csv"
+    filters = {"category": ["Electronics", "Furniture"]}
+    chunk_size = 4
+
+    assert ETLPipeline().run_pipeline("example_data.csv", str(full_path), filters=filters)
+    pipeline = ETLPipeline()
+    assert pipeline.run_pipeline(
+        "example_data.csv", str(chunked_path), filters=filters, chunk_size=chunk_size
+    )
+
+    pd.testing.assert_frame_equal(pd.read_csv(chunked_path), pd.read_csv(full_path))
+    summary = pipeline.get_pipeline_summary()
+    assert summary["extract"]["chunks"] == -(-len(raw_data) // chunk_size)
+    assert summary["load"]["final_rows"] == len(pd.read_csv(full_path))
+    # The data summary is gathered chunk by chunk to the same figures
+    with open(summary["load"]["summary_path"]) as f:
+        chunked_summary = json.load(f)
+    with open(tmp_path / "full_summary.json") as f:
+        full_summary = json.load(f)
+    assert chunked_summary.keys() == full_summary.keys()
+    assert chunked_summary["missing_values"] == full_summary["missing_values"]
+    pd.testing.assert_frame_equal(
+        pd.DataFrame(chunked_summary["numeric_summary"]),
+        pd.DataFrame(full_summary["numeric_summary"]),
+    )
+
+
+def test_etl_workflow_pipelined(tmp_path: Path) -> None:
+    chunked_path = tmp_path / "chunked.csv"
+    pipelined_path = tmp_path / "pipelined.csv"
+    filters = {"category": ["Electronics", "Furniture"]}
+    chunk_size = 3
+
+    assert ETLPipeline().run_pipeline(
+        "example_data.csv", str(chunked_path), filters=filters, chunk_size=chunk_size
+    )
+    pipeline = ETLPipeline()
+    assert pipeline.run_pipeline(
+        "example_data.csv",
+        str(pipelined_path),
+        filters=filters,
+        chunk_size=chunk_size,
+        pipelined=True,
+    )
+
+    pd.testing.assert_frame_equal(pd.read_csv(pipelined_path), pd.read_csv(chunked_path))
+    summary = pipeline.get_pipeline_summary()
+    assert summary["extract"]["pipelined"]
+    assert summary["extract"]["rows_extracted"] == len(raw_data)
+    # Pipelining needs chunks to overlap
+    assert not ETLPipeline().run_pipeline("example_data.csv", str(pipelined_path), pipelined=True)
+
+
+def test_etl_workflow_typed_and_pruned(tmp_path: Path) -> None:
+    plain_path = tmp_path / "plain.csv"
+    typed_path = tmp_path / "typed.csv"
+    filters = {"region": ["North", "East"]}
+    schema = {"category": "category", "region": "category", "date": "datetime"}
+
+    assert ETLPipeline().run_pipeline("example_data.csv", str(plain_path), filters=filters)
+    assert ETLPipeline().run_pipeline(
+        "example_data.csv",
+        str(typed_path),
+        filters=filters,
+        schema=schema,
+        columns=["product_id", "category"],
+    )
+
+    typed = pd.read_csv(typed_path)
+    plain = pd.read_csv(plain_path)
+    assert "sales_rep" not in typed.columns
+    pd.testing.assert_frame_equal(typed, plain[typed.columns])
+
+
+def test_etl_workflow_schema_only(tmp_path: Path) -> None:
+    # A schema without columns changes dtypes only, so the business rules,
+    # filters and duplicate removal still see every column
+    plain_path = tmp_path / "plain.csv"
+    typed_path = tmp_path / "typed.csv"
+    filters = {"quantity": {"min": 3}}
+
+    assert ETLPipeline().run_pipeline("example_data.csv", str(plain_path), filters=filters)
+    assert ETLPipeline().run_pipeline(
+        "example_data.csv",
+        str(typed_path),
+        filters=filters,
+        schema={"region": "category", "date": "datetime"},
+    )
+
+    pd.testing.assert_frame_equal(pd.read_csv(typed_path), pd.read_csv(plain_path))
+
+
+def test_etl_workflow_incremental(tmp_path: Path) -> None:
+    lines = Path("example_data.csv").read_text().splitlines(keepends=True)
+    lines[-1] = lines[-1].rstrip("\n") + "\n"
+    source = tmp_path / "log.csv"
+    source.write_text("".join(lines[:10]))
+    full_path = tmp_path / "full.csv"
+    incremental_path = tmp_path / "incremental.csv"
+
+    pipeline = ETLPipeline()
+    assert pipeline.run_pipeline(str(source), str(incremental_path), incremental=True)
+    with open(source, "a") as f:
+        f.writelines(lines[10:])
+    assert pipeline.run_pipeline(str(source), str(incremental_path), incremental=True)
+
+    load = pipeline.get_pipeline_summary()["load"]
+    assert load["rows_appended"] == len(lines) - 10
+    assert ETLPipeline().run_pipeline(str(source), str(full_path))
+    pd.testing.assert_frame_equal(pd.read_csv(incremental_path), pd.read_csv(full_path))
+    # The data summary covers the rows of both runs
+    with open(load["summary_path"]) as f:
+        incremental_summary = json.load(f)
+    with open(tmp_path / "full_summary.json") as f:
+        full_summary = json.load(f)
+    assert incremental_summary["total_rows"] == full_summary["total_rows"]
+    pd.testing.assert_frame_equal(
+        pd.DataFrame(incremental_summary["numeric_summary"]),
+        pd.DataFrame(full_summary["numeric_summary"]),
+    )
+
+
+def test_etl_workflow_incremental_without_final_newline(tmp_path: Path) -> None:
+    source = tmp_path / "log.csv"
+    source.write_text(Path("example_data.csv").read_text().rstrip("\n"))
+    full_path = tmp_path / "full.csv"
+    incremental_path = tmp_path / "incremental.csv"
+
+    # The last line may still be being written, so the first run leaves it
+    pipeline = ETLPipeline()
+    assert pipeline.run_pipeline(str(source), str(incremental_path), incremental=True)
+    assert pipeline.get_pipeline_summary()["extract"]["rows_extracted"] == len(raw_data) - 1
+    # Once the file is found unchanged it is read as the final row
+    assert pipeline.run_pipeline(str(source), str(incremental_path), incremental=True)
+    assert pipeline.get_pipeline_summary()["extract"]["rows_extracted"] == 1
+    assert pipeline.run_pipeline(str(source), str(incremental_path), incremental=True)
+    assert pipeline.get_pipeline_summary()["extract"]["rows_extracted"] == 0
+
+    assert ETLPipeline().run_pipeline(str(source), str(full_path))
+    pd.testing.assert_frame_equal(pd.read_csv(incremental_path), pd.read_csv(full_path))
+
+
+def test_etl_workflow_json_lines(tmp_path: Path) -> None:
+    json_path = tmp_path / "output.json"
+    lines_path = tmp_path / "output.jsonl.gz"
+
+    assert ETLPipeline().run_pipeline("example_data.csv", str(json_path), output_format="json")
+    assert ETLPipeline().run_pipeline(
+        "example_data.csv", str(lines_path), output_format="jsonl", chunk_size=6
+    )
+
+    pd.testing.assert_frame_equal(pd.read_json(lines_path, lines=True), pd.read_json(json_path))
+
+
+@pytest.mark.parametrize("chunk_size", [None, 6])
+def test_etl_workflow_pushdown(tmp_path: Path, chunk_size: int | None) -> None:
+    # The example data has no missing values, so pushing the filters into
+    # extraction must not change the output
+    plain_path = tmp_path / "plain.csv"
+    pushdown_path = tmp_path / "pushdown.csv"
+    filters = {"region": ["North", "West"], "quantity": {"min": 2}}
+
+    assert ETLPipeline().run_pipeline("example_data.csv", str(plain_path), filters=filters)
+    pipeline = ETLPipeline()
+    assert pipeline.run_pipeline(
+        "example_data.csv",
+        str(pushdown_path),
+        filters=filters,
+        chunk_size=chunk_size,
+        pushdown=True,
+    )
+
+    pd.testing.assert_frame_equal(pd.read_csv(pushdown_path), pd.read_csv(plain_path))
+    assert pipeline.get_pipeline_summary()["extract"]["rows_extracted"] < len(raw_data)
+
+
+@pytest.mark.parametrize("chunk_size", [None, 6])
+@pytest.mark.parametrize("source", ["source.csv", "part*.csv", "source.parquet"])
+def test_etl_workflow_pushdown_with_missing_values(
+    tmp_path: Path, chunk_size: int | None, source: str
+) -> None:
+    # The missing regions are filled with North, the mode over every row,
+    # and so fail the filter. Filling from the South rows alone would keep them.
+    data = raw_data.copy()
+    data.loc[[13, 17], "region"] = None
+    data.loc[21, "price"] = None
+    if source.endswith(".parquet"):
+        data.to_parquet(tmp_path / source, index=False)
+    else:
+        data.to_csv(tmp_path / "source.csv", index=False)
+        data.iloc[:12].to_csv(tmp_path / "part1.csv", index=False)
+        data.iloc[12:].to_csv(tmp_path / "part2.csv", index=False)
+    source_path = str(tmp_path / source)
+    source_type = Path(source).suffix.lstrip(".")
+    plain_path = tmp_path / "plain.csv"
+    pushdown_path = tmp_path / "pushdown.csv"
+    filters = {"region": ["South"]}
+
+    for path, pushdown in ((plain_path, False), (pushdown_path, True)):
+        assert ETLPipeline().run_pipeline(
+            source_path,
+            str(path),
+            source_type=source_type,
+            filters=filters,
+            chunk_size=chunk_size,
+            pushdown=pushdown,
+        )
+
+    pd.testing.assert_frame_equal(pd.read_csv(pushdown_path), pd.read_csv(plain_path))
+
+
+def test_etl_workflow_optimised(tmp_path: Path) -> None:
+    plain_path = tmp_path / "plain.csv"
+    optimised_path = tmp_path / "optimised.csv"
+    filters = {"region": ["North", "West"], "year": 2024}
+
+    assert ETLPipeline().run_pipeline("example_data.csv", str(plain_path), filters=filters)
+    pipeline = ETLPipeline()
+    assert pipeline.run_pipeline(
+        "example_data.csv", str(optimised_path), filters=filters, optimise=True
+    )
+
+    pd.testing.assert_frame_equal(pd.read_csv(optimised_path), pd.read_csv(plain_path))
+    applied = pipeline.get_pipeline_summary()["transform"]["transformations_applied"]
+    assert applied[0].startswith("Optimised plan: filter before cleaning")
+
+
+@pytest.mark.parametrize("chunk_size", [None, 6])
+def test_etl_workflow_optimised_with_missing_values(tmp_path: Path, chunk_size: int | None) -> None:
+    # As with pushdown, filtering before filling would fill the missing
+    # regions with South, the mode of the surviving rows, and keep them
+    source_path = tmp_path / "source.csv"
+    incomplete = raw_data.copy()
+    incomplete.loc[[13, 17], "region"] = None
+    incomplete.loc[21, "price"] = None
+    incomplete.to_csv(source_path, index=False)
+    plain_path = tmp_path / "plain.csv"
+    optimised_path = tmp_path / "optimised.csv"
+    filters = {"region": ["South"]}
+
+    for path, optimise in ((plain_path, False), (optimised_path, True)):
+        assert ETLPipeline().run_pipeline(
+            str(source_path), str(path), filters=filters, chunk_size=chunk_size, optimise=optimise
+        )
+
+    pd.testing.assert_frame_equal(pd.read_csv(optimised_path), pd.read_csv(plain_path))
+
+
+def test_etl_workflow_global_fill(tmp_path: Path) -> None:
+    # Missing values in different chunks are filled with statistics of the
+    # whole source, as they are when everything is loaded at once
+    source_path = tmp_path / "source.csv"
+    incomplete = raw_data.copy()
+    incomplete.loc[[1, 8, 17], "price"] = None
+    incomplete.loc[[3, 20], "region"] = None
+    incomplete.to_csv(source_path, index=False)
+    full_path = tmp_path / "full.csv"
+    chunked_path = tmp_path / "chunked.csv"
+
+    assert ETLPipeline().run_pipeline(str(source_path), str(full_path))
+    assert ETLPipeline().run_pipeline(
+        str(source_path), str(chunked_path), chunk_size=6, global_fill=True
+    )
+
+    pd.testing.assert_frame_equal(pd.read_csv(chunked_path), pd.read_csv(full_path))
+
+
+def test_etl_workflow_global_fill_with_duplicates(tmp_path: Path) -> None:
+    # Fill values are computed after duplicate removal, as they are when
+    # everything is loaded at once, however often a row is repeated
+    source_path = tmp_path / "source.csv"
+    incomplete = raw_data.copy()
+    incomplete.loc[[1, 8, 17], "price"] = None
+    repeated = incomplete.nlargest(3, "price")
+    pd.concat([incomplete, repeated, repeated, repeated]).to_csv(source_path, index=False)
+    full_path = tmp_path / "full.csv"
+    chunked_path = tmp_path / "chunked.csv"
+
+    assert ETLPipeline().run_pipeline(str(source_path), str(full_path))
+    assert ETLPipeline().run_pipeline(
+        str(source_path), str(chunked_path), chunk_size=6, global_fill=True
+    )
+
+    pd.testing.assert_frame_equal(pd.read_csv(chunked_path), pd.read_csv(full_path))
+
+
+def test_etl_workflow_fill_workers(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    source_path = tmp_path / "wide.csv"
+    wide = pd.DataFrame({f"measure_{i}": [float(i), None, 2.0 * i] for i in range(150)})
+    wide.to_csv(source_path, index=False)
+    serial_path = tmp_path / "serial.csv"
+    parallel_path = tmp_path / "parallel.csv"
+    pools: list[int | None] = []
+
+    class RecordingPool(ThreadPoolExecutor):
+        def __init__(self, max_workers: int | None = None) -> None:
+            pools.append(max_workers)
+            super().__init__(max_workers)
+
+    monkeypatch.setattr("test_repo_trial_bt.transform.ThreadPoolExecutor", RecordingPool)
+    fill_workers = 2
+
+    assert ETLPipeline().run_pipeline(str(source_path), str(serial_path))
+    assert not pools
+    assert ETLPipeline().run_pipeline(
+        str(source_path), str(parallel_path), fill_workers=fill_workers
+    )
+
+    assert pools == [fill_workers]
+    pd.testing.assert_frame_equal(pd.read_csv(parallel_path), pd.read_csv(serial_path))
+
+
+@pytest.mark.parametrize("optimise", [False, True])
+def test_etl_workflow_guesses_date_format_once(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, optimise: bool
+) -> None:
+    guessed: list[str] = []
+
+    def guess(value: str) -> str | None:
+        guessed.append(value)
+        return guess_datetime_format(value)
+
+    monkeypatch.setattr("test_repo_trial_bt.transform.guess_datetime_format", guess)
+    pipeline = ETLPipeline()
+
+    assert pipeline.run_pipeline(
+        "example_data.csv", str(tmp_path / "output.csv"), chunk_size=4, optimise=optimise
+    )
+
+    # Later chunks reuse the format guessed for the first one
+    assert len(guessed) == 1
+    assert pipeline.get_pipeline_summary()["extract"]["chunks"] > 1
+
+
+def test_etl_workflow_dedup_across_chunks(tmp_path: Path) -> None:
+    source_path = tmp_path / "source.csv"
+    repeated = raw_data.iloc[[2, 7, 11]]
+    pd.concat([raw_data, repeated]).to_csv(source_path, index=False)
+    full_path = tmp_path / "full.csv"
+    chunked_path = tmp_path / "chunked.csv"
+
+    assert ETLPipeline().run_pipeline(str(source_path), str(full_path))
+    pipeline = ETLPipeline()
+    assert pipeline.run_pipeline(str(source_path), str(chunked_path), chunk_size=6)
+
+    pd.testing.assert_frame_equal(pd.read_csv(chunked_path), pd.read_csv(full_path))
+    assert pipeline.get_pipeline_summary()["transform"]["duplicates_removed"] == len(repeated)
+
+
+@pytest.mark.parametrize(
+    "options", [{"pushdown": True}, {"optimise": True}, {"chunk_size": 2, "pushdown": True}]
+)
+def test_etl_workflow_dedup_keys_before_filters(tmp_path: Path, options: dict[str, Any]) -> None:
+    # P1 is kept from its first row, which the filter then drops. Filtering
+    # first would keep the second P1 row instead.
+    source_path = tmp_path / "source.csv"
+    source_path.write_text(
+        "product_id,region,quantity,price\nP1,South,2,1.0\nP1,North,5,1.0\nP2,North,3,1.0\n"
+    )
+    plain_path = tmp_path / "plain.csv"
+    options_path = tmp_path / "options.csv"
+    filters = {"region": ["North"]}
+    dedup_keys = ["product_id"]
+
+    assert ETLPipeline().run_pipeline(
+        str(source_path), str(plain_path), filters=filters, dedup_keys=dedup_keys
+    )
+    assert ETLPipeline().run_pipeline(
+        str(source_path), str(options_path), filters=filters, dedup_keys=dedup_keys, **options
+    )
+
+    plain = pd.read_csv(plain_path)
+    assert plain["product_id"].tolist() == ["P2"]
+    pd.testing.assert_frame_equal(pd.read_csv(options_path), plain)
+
+
+@pytest.mark.parametrize("optimise", [False, True])
+def test_etl_workflow_rules_config(tmp_path: Path, optimise: bool) -> None:
+    rules_path = tmp_path / "rules.json"
+    rules = [
+        {
+            "name": "total_value",
+            "type": "derive",
+            "column": "total_value",
+            "expression": "quantity * price",
+        },
+        {"name": "north_only", "type": "filter", "criteria": {"region": "North"}},
+    ]
+    rules_path.write_text(json.dumps(rules))
+    output_path = tmp_path / "output.csv"
+
+    pipeline = ETLPipeline(rules=str(rules_path))
+    assert pipeline.run_pipeline("example_data.csv", str(output_path), optimise=optimise)
+
+    output_data = pd.read_csv(output_path)
+    assert set(output_data["region"]) == {"North"}
+    assert "year" not in output_data.columns
+    assert output_data["total_value"].equals(output_data["quantity"] * output_data["price"])
+    assert "rule_timings" in pipeline.get_pipeline_summary()["transform"]
+
+
+def test_etl_workflow_optimise_falls_back_for_unplannable_rules(tmp_path: Path) -> None:
+    # Lookups and expression filters have no plan step, so the rules run in turn
+    rules_path = tmp_path / "rules.json"
+    rules = [
+        {
+            "name": "nation",
+            "type": "lookup",
+            "column": "nation",
+            "source": "region",
+            "mapping": {"North": "Scotland", "South": "England"},
+        },
+        {"name": "cheap", "type": "filter", "expression": "price < 200"},
+    ]
+    rules_path.write_text(json.dumps(rules))
+    plain_path = tmp_path / "plain.csv"
+    optimised_path = tmp_path / "optimised.csv"
+
+    for path, optimise in ((plain_path, False), (optimised_path, True)):
+        pipeline = ETLPipeline(rules=str(rules_path))
+        assert pipeline.run_pipeline("example_data.csv", str(path), optimise=optimise)
+
+    pd.testing.assert_frame_equal(pd.read_csv(optimised_path), pd.read_csv(plain_path))
+
+
+def test_etl_workflow_partitioned_parquet(tmp_path: Path) -> None:
+    pytest.importorskip("pyarrow")
+    csv_path = tmp_path / "output.csv"
+    dataset_path = tmp_path / "sales"
+    partition_cols = ["year", "month", "region"]
+
+    assert ETLPipeline().run_pipeline("example_data.csv", str(csv_path))
+    assert ETLPipeline().run_pipeline(
+        "example_data.csv",
+        str(dataset_path),
+        output_format="parquet",
+        parquet_options={"partition_cols": partition_cols, "row_group_size": 2},
+    )
+
+    expected = pd.read_csv(csv_path)
+    output_data = pd.read_parquet(dataset_path)
+    assert len(output_data) == len(expected)
+    assert set(output_data["region"].astype(str)) == set(expected["region"])
+    partitions = expected[partition_cols].drop_duplicates()
+    assert len(list(dataset_path.glob("year=*/month=*/region=*"))) == len(partitions)
+    assert Path(f"{dataset_path}_summary.json").exists()
+
+
+@pytest.mark.parametrize("chunk_size", [None, 6])
+def test_etl_workflow_fan_out(tmp_path: Path, chunk_size: int | None) -> None:
+    csv_path = tmp_path / "output.csv"
+    json_path = tmp_path / "output.json"
+    lines_path = tmp_path / "output.jsonl"
+    outputs = [
+        {"path": str(json_path), "format": "json"},
+        {"path": str(lines_path), "format": "jsonl"},
+    ]
+
+    pipeline = ETLPipeline()
+    assert pipeline.run_pipeline(
+        "example_data.csv", str(csv_path), chunk_size=chunk_size, outputs=outputs
+    )
+
+    expected = pd.read_json(json_path)
+    pd.testing.assert_frame_equal(pd.read_json(lines_path, lines=True), expected)
+    assert len(pd.read_csv(csv_path)) == len(expected)
+    results = pipeline.get_pipeline_summary()["load"]["outputs"]
+    assert {result["format"] for result in results.values()} == {"csv", "json", "jsonl"}
+    assert all(result["status"] == "success" for result in results.values())
+
+
+@pytest.mark.parametrize("chunk_size", [None, 6])
+def test_etl_workflow_sqlite(tmp_path: Path, chunk_size: int | None) -> None:
+    csv_path = tmp_path / "output.csv"
+    database = tmp_path / "sales.db"
+
+    assert ETLPipeline().run_pipeline("example_data.csv", str(csv_path))
+    assert ETLPipeline().run_pipeline(
+        "example_data.csv", str(database), output_format="sqlite", chunk_size=chunk_size
+    )
+
+    with contextlib.closing(sqlite3.connect(database)) as connection:
+        output_data = pd.read_sql("SELECT * FROM sales", connection)
+    expected = pd.read_csv(csv_path)
+    pd.testing.assert_frame_equal(
+        output_data.drop(columns="date"), expected.drop(columns="date"), check_dtype=False
+    )
+
+
+@pytest.mark.parametrize("chunk_size", [None, 6])
+def test_etl_workflow_metrics(tmp_path: Path, chunk_size: int | None) -> None:
+    output_path = tmp_path / "output.csv"
+    metrics_path = tmp_path / "metrics.prom"
+
+    pipeline = ETLPipeline()
+    assert pipeline.run_pipeline(
+        "example_data.csv", str(output_path), chunk_size=chunk_size, metrics_path=str(metrics_path)
+    )
+
+    metrics = pipeline.get_pipeline_summary()["metrics"]
+    extracted = pipeline.get_pipeline_summary()["extract"]["rows_extracted"]
+    assert {"extract", "transform", "load"} <= set(metrics["phases"])
+    assert metrics["phases"]["extract"]["rows"] == extracted
+    assert metrics["phases"]["load"]["rows"] == len(pd.read_csv(output_path))
+    assert "remove_duplicates" in metrics["steps"]
+    assert "rule:total_value" in metrics["steps"]
+    text = metrics_path.read_text()
+    assert 'etl_phase_wall_seconds{phase="transform"}' in text
+    assert 'etl_step_calls{step="fill_missing_values"}' in text
+
+
+def test_etl_workflow_batch(tmp_path: Path) -> None:
+    filters = {"category": ["Electronics", "Furniture"]}
+    manifest = {
+        "defaults": {"source_path": "example_data.csv"},
+        "jobs": [
+            {"name": "all", "output_path": str(tmp_path / "all.csv")},
+            {"name": "filtered", "output_path": str(tmp_path / "filtered.csv"), "filters": filters},
+            {"name": "streamed", "output_path": str(tmp_path / "streamed.csv"), "chunk_size": 6},
+            {
+                "name": "missing",
+                "source_path": "missing.csv",
+                "output_path": str(tmp_path / "x.csv"),
+            },
+        ],
+    }
+    report_path = tmp_path / "report.json"
+
+    report = run_batch(manifest, max_workers=2, report_path=str(report_path))
+
+    assert (report["succeeded"], report["failed"]) == (3, 1)
+    assert report["jobs"]["missing"]["status"] == "failed"
+    assert report["groups"][0]["jobs"] == ["all", "filtered"]
+    assert report["jobs"]["filtered"]["summary"]["extract"]["shared_with"] == ["all", "filtered"]
+    assert json.loads(report_path.read_text())["succeeded"] == report["succeeded"]
+    # Sharing the extraction gives the same outputs as separate runs
+    for name, job_filters in (("all", None), ("filtered", filters)):
+        expected_path = tmp_path / f"expected_{name}.csv"
+        assert ETLPipeline().run_pipeline(
+            "example_data.csv", str(expected_path), filters=job_filters
+        )
+        pd.testing.assert_frame_equal(
+            pd.read_csv(tmp_path / f"{name}.csv"), pd.read_csv(expected_path)
+        )
+
+
+def test_etl_workflow_resumes_from_checkpoint(tmp_path: Path) -> None:
+    pytest.importorskip("pyarrow")
+    output_path = tmp_path / "output.csv"
+    expected_path = tmp_path / "expected.csv"
+    checkpoint_dir = tmp_path / "checkpoints"
+    filters = {"region": ["North", "South"]}
+
+    pipeline = ETLPipeline()
+    # The load fails, leaving the extract and transform checkpoints behind
+    assert not pipeline.run_pipeline(
+        "example_data.csv",
+        str(output_path),
+        output_format="xml",
+        filters=filters,
+        checkpoint_dir=str(checkpoint_dir),
+    )
+    assert len(list(checkpoint_dir.glob("*/*.feather"))) == len(["extract", "transform"])
+
+    pipeline = ETLPipeline()
+    assert pipeline.run_pipeline(
+        "example_data.csv", str(output_path), filters=filters, checkpoint_dir=str(checkpoint_dir)
+    )
+
+    summary = pipeline.get_pipeline_summary()
+    assert summary["checkpoint"]["resumed_from"] == "transform"
+    assert "extract" not in summary["metrics"]["phases"]
+    assert summary["extract"]["rows_extracted"] == len(pd.read_csv("example_data.csv"))
+    assert ETLPipeline().run_pipeline("example_data.csv", str(expected_path), filters=filters)
+    pd.testing.assert_frame_equal(pd.read_csv(output_path), pd.read_csv(expected_path))
+    # Checkpoints of a successful run are removed
+    assert list(checkpoint_dir.iterdir()) == []
@@ -0,0 +1,63 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from test_repo_trial_bt.batch import build_jobs, estimate_memory, group_jobs, load_manifest
+
+
+def test_build_jobs_merges_defaults_and_checks_jobs(tmp_path: Path) -> None:
+    manifest_path = tmp_path / "manifest.json"
+    manifest_path.write_text(json.dumps([{"source_path": "a.csv", "output_path": "a_out.csv"}]))
+    manifest = {
+        "defaults": {"source_path": "example_data.csv", "output_format": "json"},
+        "jobs": [
+            {"output_path": "all.json"},
+            {"name": "csv", "output_path": "all.csv", "output_format": "csv"},
+        ],
+    }
+
+    jobs = build_jobs(manifest)
+
+    assert [job["name"] for job in jobs] == ["job-1", "csv"]
+    assert [job["output_format"] for job in jobs] == ["json", "csv"]
+    assert load_manifest(str(manifest_path))["jobs"][0]["output_path"] == "a_out.csv"
+    with pytest.raises(ValueError, match="unknown keys"):
+        build_jobs({"jobs": [{**manifest["defaults"], "output_path": "x.csv", "filter": {}}]})
+    with pytest.raises(ValueError, match="unique output_path"):
+        build_jobs({"defaults": manifest["defaults"], "jobs": [{"output_path": "x.csv"}] * 2})
+
+
+def test_group_jobs_shares_extraction_of_the_same_source() -> None:
+    source = {"source_path": "example_data.csv"}
+    jobs = build_jobs(
+        {
+            "defaults": source,
+            "jobs": [
+                {"name": "all", "output_path": "all.csv"},
+                {"name": "north", "output_path": "north.csv", "filters": {"region": ["North"]}},
+                {"name": "streamed", "output_path": "streamed.csv", "chunk_size": 5},
+                {"name": "pruned", "output_path": "pruned.csv", "columns": ["region"]},
+                {"name": "by_key", "output_path": "by_key.csv", "dedup_keys": ["product_id"]},
+                {"name": "resumable", "output_path": "resumable.csv", "checkpoint_dir": "ckpt"},
+                {"name": "resumable_too", "output_path": "too.csv", "checkpoint_dir": "ckpt"},
+            ],
+        }
+    )
+
+    groups = group_jobs(jobs)
+
+    assert [[job["name"] for job in group] for group in groups] == [
+        ["all", "north"],
+        ["streamed"],
+        ["pruned"],
+        ["by_key"],
+        ["resumable"],
+        ["resumable_too"],
+    ]
+    size = Path("example_data.csv").stat().st_size
+    assert estimate_memory(groups[1]) == 4 * size
+    # A shared group holds the source and one job's output at a time
+    assert estimate_memory(groups[0]) == 2 * 4 * size
+    memory_bytes = 10
+    assert estimate_memory([{**jobs[0], "memory_bytes": memory_bytes}]) == memory_bytes
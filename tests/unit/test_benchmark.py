@@ -0,0 +1,93 @@
+import json
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from test_repo_trial_bt.benchmark import (
+    EXIT_NO_BASELINE,
+    compare_to_baseline,
+    generate_sales_data,
+    load_baseline,
+    main,
+    run_benchmarks,
+    save_baseline,
+    write_sales_data,
+)
+
+
+def test_generate_sales_data_is_deterministic_and_injects_defects() -> None:
+    rows = 20_000
+    rate = 0.05
+    options = {"duplicate_rate": rate, "null_rate": rate, "negative_rate": rate, "products": 100}
+
+    df = generate_sales_data(rows, **options)
+
+    pd.testing.assert_frame_equal(df, generate_sales_data(rows, **options))
+    assert not df.equals(generate_sales_data(rows, seed=1, **options))
+    assert list(df.columns) == list(pd.read_csv("example_data.csv", nrows=0).columns)
+    assert df["product_id"].nunique() == options["products"]
+    assert df.duplicated().mean() == pytest.approx(rate, abs=0.01)
+    assert (df["quantity"] < 0).mean() == pytest.approx(rate, abs=0.01)
+    assert df["price"].isna().mean() == pytest.approx(rate, abs=0.01)
+    assert not df["date"].isna().any()
+
+
+def test_write_sales_data_in_chunks(tmp_path: Path) -> None:
+    rows = 250
+    chunk_rows = 100
+    source = write_sales_data(str(tmp_path / "sales.csv.gz"), rows, chunk_rows=chunk_rows)
+
+    df = pd.read_csv(source)
+
+    assert len(df) == rows
+    # Each chunk comes from its own part of the generator
+    expected = generate_sales_data(chunk_rows, part=1)
+    pd.testing.assert_series_equal(
+        df["customer_id"].iloc[chunk_rows : 2 * chunk_rows].reset_index(drop=True),
+        expected["customer_id"],
+    )
+
+
+def test_compare_to_baseline_reports_regressions() -> None:
+    baseline = {
+        "extract": {"seconds": 1.0},
+        "load:csv": {"seconds": 1.0},
+        "load:json": {"seconds": 0.001},
+    }
+    results = {
+        "extract": {"seconds": 1.1},
+        "load:csv": {"seconds": 1.5},
+        "load:json": {"seconds": 0.002},
+        "load:jsonl": {"seconds": 9.0},
+    }
+
+    regressions = compare_to_baseline(results, baseline, threshold=0.2)
+
+    # load:json doubled by under the minimum seconds; load:jsonl is new
+    assert regressions == [
+        {"benchmark": "load:csv", "baseline_seconds": 1.0, "seconds": 1.5, "ratio": 1.5}
+    ]
+
+
+def test_benchmarks_against_baseline(tmp_path: Path) -> None:
+    rows = 500
+    baseline_path = tmp_path / "baseline.json"
+    results = run_benchmarks(rows, str(tmp_path), repeats=1, groups=["transform", "load"])
+
+    assert "transform:fill_missing_values" in results
+    assert "load:sqlite" in results
+    assert all(result["rows"] == rows for result in results.values())
+
+    save_baseline(results, str(baseline_path), rows)
+    assert load_baseline(str(baseline_path), rows) == results
+    assert load_baseline(str(baseline_path), rows + 1) == {}
+
+    args = ["--rows", str(rows), "--groups", "extract", "--workdir", str(tmp_path)]
+    missing_path = tmp_path / "missing.json"
+    assert main([*args, "--baseline", str(missing_path)]) == EXIT_NO_BASELINE
+    assert main([*args, "--baseline", str(baseline_path), "--update-baseline"]) == 0
+    baselines = json.loads(baseline_path.read_text())
+    baselines["results"][str(rows)]["extract"]["seconds"] = 0.0
+    baseline_path.write_text(json.dumps(baselines))
+    assert main([*args, "--baseline", str(baseline_path), "--min-seconds", "0"]) == 1
@@ -0,0 +1,53 @@
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from test_repo_trial_bt.cache import FrameCache
+from test_repo_trial_bt.extract import DataExtractor
+
+pytest.importorskip("pyarrow")
+
+
+def test_extract_csv_uses_cache(tmp_path: Path) -> None:
+    source = tmp_path / "source.csv"
+    source.write_text(Path("example_data.csv").read_text())
+    extractor = DataExtractor(cache_dir=str(tmp_path / "cache"))
+    schema = {"region": "category", "date": "datetime"}
+
+    first = extractor.extract_csv(str(source), schema)
+    second = extractor.extract_csv(str(source), schema)
+
+    assert extractor.cache is not None
+    assert extractor.cache.hits == 1
+    pd.testing.assert_frame_equal(first, second)
+
+
+def test_cache_invalidated_by_content_and_options(tmp_path: Path) -> None:
+    source = tmp_path / "source.csv"
+    source.write_text("a,b\n1,x\n")
+    extractor = DataExtractor(cache_dir=str(tmp_path / "cache"))
+
+    extractor.extract_csv(str(source))
+    extractor.extract_csv(str(source), columns=["a"])
+    source.write_text("a,b\n2,y\n")
+    data = extractor.extract_csv(str(source))
+
+    assert extractor.cache is not None
+    assert extractor.cache.hits == 0
+    assert data["a"].tolist() == [2]
+
+
+def test_cache_evicts_least_recently_used(tmp_path: Path) -> None:
+    frame = pd.DataFrame({"value": range(1000)})
+    cache = FrameCache(str(tmp_path))
+
+    cache.put("old", frame)
+    cache.put("new", frame)
+    cache.get("old")
+    entry_size = (tmp_path / "old.feather").stat().st_size
+    cache.max_bytes = entry_size
+    cache.evict()
+
+    assert cache.get("old") is not None
+    assert cache.get("new") is None
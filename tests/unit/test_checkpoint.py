@@ -0,0 +1,48 @@
+import os
+import time
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from test_repo_trial_bt.checkpoint import CheckpointStore
+
+pytest.importorskip("pyarrow")
+
+
+def test_checkpoints_resume_the_last_phase(tmp_path: Path) -> None:
+    source = tmp_path / "sales.csv"
+    source.write_text("region,price\nNorth,1.5\n")
+    store = CheckpointStore(str(tmp_path / "checkpoints"))
+    key = store.make_key(str(source), filters={"price": {"min": 1}})
+    df = pd.DataFrame({"region": pd.Categorical(["North", "South"]), "price": [1.5, 0.5]})
+
+    assert store.latest(key) is None
+    store.save(key, "extract", df, {"extract": {"rows_extracted": 1}}, "out.csv")
+    store.save(key, "transform", df.iloc[:1], {"transform": {"final_rows": 1}}, "out.csv")
+
+    phase, resumed, summary = store.latest(key) or ("", None, {})
+    assert phase == "transform"
+    assert summary == {"transform": {"final_rows": 1}}
+    # Unused categories survive the round trip
+    pd.testing.assert_frame_equal(resumed, df.iloc[:1])
+    # Another configuration or changed contents give another key
+    assert store.make_key(str(source), filters=None) != key
+    source.write_text("region,price\nSouth,2.5\n")
+    assert store.make_key(str(source), filters={"price": {"min": 1}}) != key
+
+    store.discard(key)
+    assert store.latest(key) is None
+
+
+def test_collect_garbage_removes_stale_checkpoints(tmp_path: Path) -> None:
+    store = CheckpointStore(str(tmp_path), max_age=3600)
+    df = pd.DataFrame({"price": [1.5]})
+    for key, output_path in (("old", "a.csv"), ("current", "a.csv"), ("other", "b.csv")):
+        store.save(key, "extract", df, {}, output_path)
+    store.save("expired", "extract", df, {}, "c.csv")
+    day_ago = time.time() - 24 * 3600
+    os.utime(tmp_path / "expired" / "checkpoint.json", (day_ago, day_ago))
+
+    assert store.collect_garbage("a.csv", keep="current") == len(["old", "expired"])
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["current", "other"]
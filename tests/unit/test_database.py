@@ -0,0 +1,94 @@
+import contextlib
+import sqlite3
+from pathlib import Path
+
+import pandas as pd
+
+from test_repo_trial_bt.database import SQLitePool
+from test_repo_trial_bt.load import DataLoader, StreamingWriter
+
+
+def orders() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "order_id": [1, 2, 3],
+            "price": [9.5, None, 3.0],
+            "region": ["North", "South", None],
+            "date": pd.to_datetime(["2024-01-15", "2024-02-01", None]),
+        }
+    )
+
+
+def read_table(database: Path, table: str) -> list[tuple]:
+    with contextlib.closing(sqlite3.connect(database)) as connection:
+        return connection.execute(f"SELECT * FROM {table} ORDER BY order_id").fetchall()
+
+
+def test_load_to_sqlite_upserts_on_primary_key(tmp_path: Path) -> None:
+    database = tmp_path / "sales.db"
+    pool = SQLitePool()
+    loader = DataLoader(sqlite_pool=pool)
+
+    assert loader.load_to_sqlite(orders(), str(database), "orders", primary_key=["order_id"])
+    update = pd.DataFrame(
+        {"order_id": [3, 4], "price": [4.0, 1.0], "region": ["East", "West"], "date": pd.NaT}
+    )
+    assert loader.load_to_sqlite(
+        update, str(database), "orders", primary_key=["order_id"], if_exists="append", batch_size=1
+    )
+
+    assert read_table(database, "orders") == [
+        (1, 9.5, "North", "2024-01-15T00:00:00"),
+        (2, None, "South", "2024-02-01T00:00:00"),
+        (3, 4.0, "East", None),
+        (4, 1.0, "West", None),
+    ]
+    summary = loader.get_load_summary()[str(database)]
+    assert summary["batches"] == len(update)
+    assert summary["rows_per_second"] > 0
+    # Both loads borrowed the same pooled connection
+    assert pool.connections_opened == 1
+    pool.close()
+
+
+def test_load_to_sqlite_reports_failures(tmp_path: Path) -> None:
+    loader = DataLoader(sqlite_pool=SQLitePool())
+    database = str(tmp_path / "sales.db")
+
+    assert not loader.load_to_sqlite(orders(), database, primary_key=["customer_id"])
+    assert "customer_id" in loader.get_load_summary()[database]["error"]
+
+
+def test_streaming_writer_sqlite(tmp_path: Path) -> None:
+    database = tmp_path / "orders.db"
+    data = orders()
+
+    with StreamingWriter(str(database), "sqlite") as writer:
+        writer.write(data.iloc[:2])
+    with StreamingWriter(str(database), "sqlite", append=True) as writer:
+        writer.write(data.iloc[2:])
+
+    assert [row[0] for row in read_table(database, "orders")] == data["order_id"].tolist()
+
+
+def test_load_to_sqlite_keeps_the_table_when_replacing_fails(tmp_path: Path) -> None:
+    database = tmp_path / "orders.db"
+    loader = DataLoader(sqlite_pool=SQLitePool())
+    assert loader.load_to_sqlite(orders(), str(database))
+
+    unbindable = orders().assign(region=[{"name": "North"}, None, None])
+    assert not loader.load_to_sqlite(unbindable, str(database))
+
+    assert len(read_table(database, "orders")) == len(orders())
+
+
+def test_streaming_writer_sqlite_if_exists(tmp_path: Path) -> None:
+    database = tmp_path / "orders.db"
+    data = orders()
+
+    with StreamingWriter(str(database), "sqlite") as writer:
+        writer.write(data)
+    with StreamingWriter(str(database), "sqlite", sqlite_options={"if_exists": "append"}) as writer:
+        writer.write(data.iloc[:1])
+
+    assert len(read_table(database, "orders")) == len(data) + 1
@@ -0,0 +1,44 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from test_repo_trial_bt.dedup import RowDeduplicator
+
+
+def test_duplicates_removed_across_frames() -> None:
+    first = pd.DataFrame({"id": [1, 2, 2], "value": ["a", "b", "b"]})
+    second = pd.DataFrame({"id": [2.0, 3.0, None], "value": ["b", "c", "d"]})
+
+    with RowDeduplicator() as deduplicator:
+        kept = [deduplicator.drop_duplicates(frame) for frame in (first, second)]
+
+    assert kept[0]["id"].tolist() == [1, 2]
+    assert kept[1]["value"].tolist() == ["c", "d"]
+    assert deduplicator.duplicates_removed == len(first) + len(second) - 4
+
+
+def test_duplicates_by_key_columns() -> None:
+    data = pd.DataFrame({"id": [1, 1, 2], "loaded": ["mon", "tue", "tue"]})
+
+    mask = RowDeduplicator(key_columns=["id"]).unique_mask(data)
+
+    assert mask.tolist() == [True, False, True]
+
+
+def test_spilled_hashes_still_match(tmp_path: Path) -> None:
+    rng = np.random.default_rng(0)
+    data = pd.DataFrame({"id": rng.integers(0, 5000, 20_000)})
+    deduplicator = RowDeduplicator(memory_budget=8 * 500, spill_dir=str(tmp_path))
+
+    chunk_size = 500
+    kept = pd.concat(
+        deduplicator.drop_duplicates(data.iloc[start : start + chunk_size])
+        for start in range(0, len(data), chunk_size)
+    )
+
+    assert deduplicator.spills > 0
+    assert list(tmp_path.glob("*.npy"))
+    pd.testing.assert_frame_equal(kept, data.drop_duplicates())
+    deduplicator.close()
+    assert not list(tmp_path.glob("*.npy"))
@@ -1,6 +1,17 @@
+from pathlib import Path
+from typing import Any
+
+import pandas as pd
 import pytest
 
-from test_repo_trial_bt.extract import extract_from_source
+from test_repo_trial_bt.extract import (
+    SOURCE_FILE_COLUMN,
+    DataExtractor,
+    extract_chunks_from_source,
+    extract_from_source,
+    extract_increment_from_source,
+)
+from test_repo_trial_bt.transform import compile_filters
 
 
 def test_extract_data_success() -> None:
@@ -26,3 +37,199 @@ def test_extract_data_invalid_source_type() -> None:
     # Test for handling of invalid data source type
     with pytest.raises(ValueError, match="Unsupported source type"):
         extract_from_source("example_data.csv", source_type="invalid")
+
+
+def test_extract_chunks_covers_all_rows() -> None:
+    chunk_size = 7
+    chunks = list(extract_chunks_from_source("example_data.csv", chunk_size=chunk_size))
+    assert all(len(chunk) <= chunk_size for chunk in chunks)
+    assert sum(len(chunk) for chunk in chunks) == len(extract_from_source("example_data.csv"))
+
+
+def test_extract_chunks_file_not_found() -> None:
+    # Missing files are reported before iteration starts
+    with pytest.raises(FileNotFoundError):
+        extract_chunks_from_source("non_existent_file.csv", chunk_size=10)
+
+
+def test_extract_with_schema() -> None:
+    schema = {"category": "category", "quantity": "int32", "date": "datetime"}
+    data = extract_from_source("example_data.csv", schema=schema)
+
+    # The schema sets dtypes without dropping the other columns
+    assert data.columns.tolist() == extract_from_source("example_data.csv").columns.tolist()
+    assert isinstance(data["category"].dtype, pd.CategoricalDtype)
+    assert data["quantity"].dtype == "int32"
+    assert pd.api.types.is_datetime64_any_dtype(data["date"])
+
+
+def test_extract_columns_prunes_unknown_and_unused() -> None:
+    data = extract_from_source("example_data.csv", columns=["region", "not_a_column"])
+    assert data.columns.tolist() == ["region"]
+
+
+def _write_shards(tmp_path: Path) -> list[str]:
+    data = extract_from_source("example_data.csv")
+    paths = []
+    for index, start in enumerate(range(0, len(data), 10)):
+        path = tmp_path / f"shard_{index}.csv"
+        data.iloc[start : start + 10].to_csv(path, index=False)
+        paths.append(str(path))
+    return paths
+
+
+@pytest.mark.parametrize("use_processes", [False, True])
+def test_extract_glob_in_parallel(tmp_path: Path, use_processes: bool) -> None:
+    paths = _write_shards(tmp_path)
+    data = extract_from_source(
+        str(tmp_path / "shard_*.csv"),
+        schema={"product_id": "string", "region": "category"},
+        max_workers=2,
+        use_processes=use_processes,
+    )
+
+    assert data[SOURCE_FILE_COLUMN].unique().tolist() == paths
+    assert isinstance(data["region"].dtype, pd.CategoricalDtype)
+    pd.testing.assert_series_equal(
+        data["product_id"],
+        extract_from_source("example_data.csv")["product_id"].astype("string"),
+    )
+
+
+def test_extract_chunks_from_file_list(tmp_path: Path) -> None:
+    paths = _write_shards(tmp_path)
+    chunks = list(extract_chunks_from_source(paths, chunk_size=4))
+    combined = pd.concat(chunks, ignore_index=True)
+
+    assert combined[SOURCE_FILE_COLUMN].unique().tolist() == paths
+    assert len(combined) == len(extract_from_source("example_data.csv"))
+
+
+def test_extract_glob_without_matches(tmp_path: Path) -> None:
+    with pytest.raises(FileNotFoundError):
+        extract_from_source(str(tmp_path / "missing_*.csv"))
+
+
+def test_extract_increment_reads_only_new_rows(tmp_path: Path) -> None:
+    source = tmp_path / "log.csv"
+    source.write_text("id,value\n1,a\n2,b\n")
+
+    first, watermark = extract_increment_from_source(str(source))
+    with open(source, "a") as f:
+        f.write("3,c\n4,")  # the second row is still being written
+    second, watermark = extract_increment_from_source(str(source), watermark=watermark)
+
+    assert first["id"].tolist() == [1, 2]
+    assert second["id"].tolist() == [3]
+    assert watermark["is_delta"] is True
+    assert watermark["rows"] == len(first) + len(second)
+
+
+@pytest.mark.parametrize("engine", ["c", "python", "pyarrow"])
+def test_extract_increment_streams_new_bytes(tmp_path: Path, engine: str) -> None:
+    if engine == "pyarrow":
+        pytest.importorskip("pyarrow")
+    source = tmp_path / "log.csv"
+    source.write_text("id,value\n1,a\n")
+    extractor = DataExtractor(engine=engine)
+    _, watermark = extractor.extract_csv_incremental(str(source))
+    # A partial line longer than the blocks searched for its start
+    partial = "4," + "x" * 5000
+    with open(source, "a") as f:
+        f.write(f"2,b\n3,c\n{partial}")
+
+    data, watermark = extractor.extract_csv_incremental(str(source), watermark)
+
+    assert data["id"].tolist() == [2, 3]
+    assert watermark["offset"] == source.stat().st_size - len(partial)
+
+
+def test_extract_increment_rereads_rewritten_source(tmp_path: Path) -> None:
+    source = tmp_path / "log.csv"
+    source.write_text("id,value\n1,a\n2,b\n")
+    _, watermark = extract_increment_from_source(str(source))
+
+    source.write_text("id,value\n9,z\n8,y\n7,x\n")
+    data, watermark = extract_increment_from_source(str(source), watermark=watermark)
+
+    assert data["id"].tolist() == [9, 8, 7]
+    assert watermark["is_delta"] is False
+
+
+@pytest.mark.parametrize("suffix", [".gz", ".bz2", ".xz"])
+def test_extract_compressed_source(tmp_path: Path, suffix: str) -> None:
+    expected = extract_from_source("example_data.csv")
+    source = tmp_path / f"example_data.csv{suffix}"
+    expected.to_csv(source, index=False)
+
+    pd.testing.assert_frame_equal(extract_from_source(str(source)), expected)
+    chunks = list(extract_chunks_from_source(str(source), chunk_size=10))
+    pd.testing.assert_frame_equal(pd.concat(chunks), expected)
+    with pytest.raises(ValueError, match="uncompressed"):
+        extract_increment_from_source(str(source))
+
+
+@pytest.mark.parametrize(("engine", "memory_map"), [("c", True), ("pyarrow", False)])
+def test_extract_with_configured_engine(engine: str, memory_map: bool) -> None:
+    if engine == "pyarrow":
+        pytest.importorskip("pyarrow")
+    extractor = DataExtractor(engine=engine, memory_map=memory_map)
+
+    data = extractor.extract_csv("example_data.csv", columns=["region", "quantity", "missing"])
+
+    expected = extract_from_source("example_data.csv")[["quantity", "region"]]
+    pd.testing.assert_frame_equal(data, expected)
+
+
+def test_extract_with_pushdown_keeps_configured_engine(monkeypatch: pytest.MonkeyPatch) -> None:
+    pytest.importorskip("pyarrow")
+    engines = []
+    read_csv = pd.read_csv
+
+    def recording_read_csv(*args: Any, **kwargs: Any) -> Any:
+        engines.append(kwargs.get("engine"))
+        return read_csv(*args, **kwargs)
+
+    monkeypatch.setattr(pd, "read_csv", recording_read_csv)
+    predicates = compile_filters({"region": "North"})
+
+    extractor = DataExtractor(engine="pyarrow")
+    data = extractor.extract_csv("example_data.csv", predicates=predicates)
+
+    assert set(engines) == {"pyarrow"}
+    expected = extractor.extract_csv("example_data.csv")
+    pd.testing.assert_frame_equal(data, expected[expected["region"] == "North"])
+
+
+def test_extract_unknown_engine() -> None:
+    with pytest.raises(ValueError, match="Unsupported parse engine"):
+        DataExtractor(engine="fast")
+
+
+def test_extract_with_pushdown_keeps_missing_values(tmp_path: Path) -> None:
+    # Missing values are filled from every row, so a file or chunk that has
+    # them is read whole
+    source = tmp_path / "source.csv"
+    source.write_text("Quantity,Region\n-1,North\n,South\n4,East\n2,West\n")
+    predicates = compile_filters({"quantity": {"min": 0}, "region": ["South", "East"]})
+
+    data = extract_from_source(str(source), predicates=predicates)
+
+    assert data.index.tolist() == [0, 1, 2, 3]
+    chunks = list(extract_chunks_from_source(str(source), chunk_size=2, predicates=predicates))
+    assert pd.concat(chunks).index.tolist() == [0, 1, 2]
+
+
+def test_extract_parquet_with_pushdown(tmp_path: Path) -> None:
+    pytest.importorskip("pyarrow")
+    source = tmp_path / "source.parquet"
+    expected = extract_from_source("example_data.csv")
+    expected.to_parquet(source, index=False, row_group_size=5)
+    predicates = compile_filters({"region": ["North"], "quantity": {"max": 1}})
+
+    data = extract_from_source(str(source), "parquet", predicates=predicates)
+
+    expected = expected[(expected["region"] == "North") & (expected["quantity"] <= 1)]
+    pd.testing.assert_frame_equal(data, expected.reset_index(drop=True))
+    chunks = extract_chunks_from_source(str(source), "parquet", 2, predicates=predicates)
+    pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), data)
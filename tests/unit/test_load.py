@@ -1,6 +1,16 @@
+import gzip
+from pathlib import Path
+
 import pandas as pd
+import pytest
 
-from test_repo_trial_bt.load import save_to_destination
+from test_repo_trial_bt.load import (
+    DataLoader,
+    MultiWriter,
+    StreamingWriter,
+    save_to_destination,
+    save_to_destinations,
+)
 
 
 def test_load_data_success() -> None:
@@ -21,3 +31,177 @@ def test_load_data_failure() -> None:
     # Assuming load_data raises an exception on failure
     result = save_to_destination(data, destination)
     assert result is False
+
+
+@pytest.mark.parametrize("format_type", ["csv", "json", "jsonl"])
+def test_streaming_writer_matches_single_write(tmp_path: Path, format_type: str) -> None:
+    data = pd.DataFrame({"id": [1, 2, 3, 4, 5], "name": ["a", "b", "c", "d", "e"]})
+    expected_path = tmp_path / f"expected.{format_type}"
+    streamed_path = tmp_path / f"streamed.{format_type}"
+
+    assert save_to_destination(data, str(expected_path), format_type) is True
+    with StreamingWriter(str(streamed_path), format_type) as writer:
+        writer.write(data.iloc[:2])
+        writer.write(data.iloc[2:2])
+        writer.write(data.iloc[2:])
+
+    assert writer.rows_written == len(data)
+    assert streamed_path.read_text() == expected_path.read_text()
+
+
+def test_load_to_json_lines_gzip(tmp_path: Path) -> None:
+    data = pd.DataFrame({"id": range(25), "name": [f"row {i}" for i in range(25)]})
+    output_path = tmp_path / "output.jsonl.gz"
+    loader = DataLoader()
+
+    assert loader.load_to_json(data, str(output_path), lines=True, batch_size=10)
+
+    with gzip.open(output_path, "rt") as f:
+        lines = f.read().splitlines()
+    assert len(lines) == len(data)
+    assert loader.get_load_summary()[str(output_path)]["format"] == "jsonl"
+    pd.testing.assert_frame_equal(pd.read_json(output_path, lines=True), data)
+
+
+def test_streaming_writer_appends_json_lines(tmp_path: Path) -> None:
+    data = pd.DataFrame({"id": [1, 2, 3], "name": ["a", "b", "c"]})
+    output_path = tmp_path / "output.jsonl.gz"
+    save_to_destination(data.iloc[:2], str(output_path), "jsonl")
+
+    with StreamingWriter(str(output_path), "jsonl", append=True) as writer:
+        writer.write(data.iloc[2:])
+
+    pd.testing.assert_frame_equal(pd.read_json(output_path, lines=True), data)
+    with (
+        pytest.raises(ValueError, match="Columns do not match"),
+        StreamingWriter(str(output_path), "jsonl", append=True) as writer,
+    ):
+        writer.write(data[["name", "id"]])
+
+
+def test_streaming_writer_parquet(tmp_path: Path) -> None:
+    pytest.importorskip("pyarrow")
+    data = pd.DataFrame({"id": [1, 2, 3], "name": ["a", None, "c"]})
+    output_path = tmp_path / "streamed.parquet"
+
+    with StreamingWriter(str(output_path), "parquet") as writer:
+        writer.write(data.iloc[:1])
+        writer.write(data.iloc[1:2])
+        writer.write(data.iloc[2:])
+
+    pd.testing.assert_frame_equal(pd.read_parquet(output_path), data)
+
+
+def sales_partitions() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "year": [2024, 2024, 2024, 2025],
+            "region": ["North", "South", "North", "North"],
+            "total_value": [10.0, 20.0, 30.0, 40.0],
+        }
+    )
+
+
+def read_dataset(path: Path) -> pd.DataFrame:
+    data = pd.read_parquet(path)
+    data = data.astype({"year": "int64", "region": "object"})
+    return data.sort_values("total_value", ignore_index=True)[["year", "region", "total_value"]]
+
+
+def test_load_to_parquet_partitioned(tmp_path: Path) -> None:
+    pq = pytest.importorskip("pyarrow.parquet")
+    data = sales_partitions()
+    output_path = tmp_path / "sales"
+    loader = DataLoader()
+    row_group_size = 1
+    partitions = 3
+
+    assert loader.load_to_parquet(
+        data,
+        str(output_path),
+        partition_cols=["year", "region"],
+        row_group_size=row_group_size,
+        compression="zstd",
+    )
+
+    north = list((output_path / "year=2024" / "region=North").glob("*.parquet"))
+    metadata = pq.ParquetFile(north[0]).metadata
+    assert len(north) == 1
+    assert metadata.num_row_groups == len(data.query("year == 2024 and region == 'North'"))
+    assert metadata.row_group(0).column(0).compression == "ZSTD"
+    assert metadata.row_group(0).column(0).statistics.has_min_max
+    assert loader.get_load_summary()[str(output_path)]["partitions"] == partitions
+    pd.testing.assert_frame_equal(read_dataset(output_path), data)
+
+
+def test_load_to_parquet_appends_partitions(tmp_path: Path) -> None:
+    pytest.importorskip("pyarrow")
+    data = sales_partitions()
+    output_path = tmp_path / "sales"
+    loader = DataLoader()
+    loader.load_to_parquet(data.iloc[:3], str(output_path), partition_cols=["year"])
+    old_files = {path: path.stat().st_mtime_ns for path in output_path.rglob("*.parquet")}
+
+    assert loader.load_to_parquet(
+        data.iloc[3:], str(output_path), partition_cols=["year"], append=True
+    )
+
+    assert {path: path.stat().st_mtime_ns for path in old_files} == old_files
+    assert (output_path / "year=2025").is_dir()
+    pd.testing.assert_frame_equal(read_dataset(output_path), data)
+    # Appending needs a partitioned dataset
+    assert not loader.load_to_parquet(data, str(tmp_path / "flat.parquet"), append=True)
+
+
+def test_streaming_writer_partitioned_parquet(tmp_path: Path) -> None:
+    pytest.importorskip("pyarrow")
+    data = sales_partitions()
+    output_path = tmp_path / "sales"
+    options = {"partition_cols": ["year", "region"], "compression": "gzip"}
+
+    with StreamingWriter(str(output_path), "parquet", parquet_options=options) as writer:
+        writer.write(data.iloc[:2])
+        writer.write(data.iloc[2:])
+
+    pd.testing.assert_frame_equal(read_dataset(output_path), data)
+
+
+def test_save_to_destinations_records_each_output(tmp_path: Path) -> None:
+    data = pd.DataFrame({"id": [1, 2, 3], "name": ["a", "b", "c"]})
+    outputs = [
+        {"path": str(tmp_path / "output.csv"), "format": "csv"},
+        {"path": str(tmp_path / "output.jsonl"), "format": "jsonl"},
+        {"path": str(tmp_path / "output.xml"), "format": "xml"},
+    ]
+
+    results = save_to_destinations(data, outputs)
+
+    assert [results[output["path"]]["status"] for output in outputs] == [
+        "success",
+        "success",
+        "failed",
+    ]
+    assert "xml" in results[outputs[2]["path"]]["error"]
+    assert all(result["seconds"] >= 0 for result in results.values())
+    pd.testing.assert_frame_equal(pd.read_csv(outputs[0]["path"]), data)
+    pd.testing.assert_frame_equal(pd.read_json(outputs[1]["path"], lines=True), data)
+
+
+def test_multi_writer_keeps_writing_after_a_failure(tmp_path: Path) -> None:
+    data = pd.DataFrame({"id": [1, 2, 3], "name": ["a", "b", "c"]})
+    csv_path = tmp_path / "output.csv"
+    blocked_path = tmp_path / "blocked.jsonl"
+    blocked_path.mkdir()
+    outputs = [
+        {"path": str(csv_path), "format": "csv"},
+        {"path": str(blocked_path), "format": "jsonl"},
+    ]
+
+    with MultiWriter(outputs) as writer:
+        writer.write(data.iloc[:2])
+        writer.write(data.iloc[2:])
+
+    assert not writer.succeeded
+    assert writer.results[str(csv_path)]["rows"] == len(data)
+    assert writer.results[str(blocked_path)]["status"] == "failed"
+    pd.testing.assert_frame_equal(pd.read_csv(csv_path), data)
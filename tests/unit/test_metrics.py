@@ -0,0 +1,61 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from test_repo_trial_bt.metrics import MetricsRecorder, to_prometheus, write_metrics
+
+
+def fail_in_phase(metrics: MetricsRecorder, name: str) -> None:
+    with metrics.phase(name):
+        msg = "failed"
+        raise ValueError(msg)
+
+
+def test_phases_accumulate_across_blocks() -> None:
+    chunks = [[1, 2, 3], [4, 5]]
+
+    with MetricsRecorder(trace_memory=True) as metrics:
+        for chunk in metrics.timed_iter(chunks, "extract"):
+            with metrics.phase("transform", len(chunk)):
+                _ = [value * 2 for value in chunk]
+        with pytest.raises(ValueError, match="failed"):
+            fail_in_phase(metrics, "load")
+
+    phases = metrics.summary()["phases"]
+    assert phases["extract"]["rows"] == phases["transform"]["rows"] == len([1, 2, 3, 4, 5])
+    # The extract phase also times the final, empty call to the iterator
+    assert phases["extract"]["calls"] == len(chunks) + 1
+    assert phases["transform"]["calls"] == len(chunks)
+    assert phases["load"]["calls"] == 1
+    assert phases["transform"]["peak_traced_bytes"] > 0
+    assert phases["transform"]["rows_per_second"] > 0
+
+
+def test_to_prometheus_labels_phases_and_steps() -> None:
+    metrics = {
+        "phases": {"load": {"wall_seconds": 1.5, "rows": 10, "rows_per_second": None}},
+        "steps": {'rule:"odd"': {"wall_seconds": 0.25}},
+    }
+
+    lines = to_prometheus(metrics).splitlines()
+
+    assert "# TYPE etl_phase_wall_seconds gauge" in lines
+    assert 'etl_phase_wall_seconds{phase="load"} 1.5' in lines
+    assert 'etl_phase_rows{phase="load"} 10' in lines
+    assert 'etl_step_wall_seconds{step="rule:\\"odd\\""} 0.25' in lines
+    # Metrics without a value are left out rather than exported as None
+    assert not any("rows_per_second" in line for line in lines)
+
+
+def test_write_metrics_replaces_file(tmp_path: Path) -> None:
+    metrics = {"phases": {"load": {"wall_seconds": 1.0}}, "steps": {}}
+    json_path = tmp_path / "metrics.json"
+    json_path.write_text("stale")
+
+    write_metrics(metrics, str(json_path))
+    write_metrics(metrics, str(tmp_path / "metrics.prom"))
+
+    assert json.loads(json_path.read_text()) == metrics
+    assert (tmp_path / "metrics.prom").read_text().startswith("# HELP etl_phase_wall_seconds")
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["metrics.json", "metrics.prom"]
@@ -0,0 +1,79 @@
+import threading
+import time
+from collections.abc import Iterator
+
+import pytest
+
+from test_repo_trial_bt.pipelined import run_pipelined
+
+
+def test_stages_overlap_and_keep_order() -> None:
+    count = 8
+    started = [threading.Event() for _ in range(count)]
+    overlapped: list[bool] = []
+    results: list[int] = []
+
+    def stage(value: int) -> int:
+        started[value].set()
+        return value
+
+    def sink(value: int) -> None:
+        # The stage takes the next item while the sink is still busy with
+        # this one, which could never happen if they ran one after the other
+        if value + 1 < count:
+            overlapped.append(started[value + 1].wait(timeout=5))
+        results.append(value * 2)
+
+    run_pipelined(iter(range(count)), [stage], sink)
+
+    assert results == [value * 2 for value in range(count)]
+    assert all(overlapped)
+
+
+def test_bounded_queues_hold_back_the_producer() -> None:
+    queue_size = 1
+    produced = 0
+    ahead: list[int] = []
+    consumed = 0
+
+    def items() -> Iterator[int]:
+        nonlocal produced
+        for value in range(20):
+            produced += 1
+            yield value
+
+    def sink(_: int) -> None:
+        nonlocal consumed
+        time.sleep(0.005)
+        consumed += 1
+        ahead.append(produced - consumed)
+
+    run_pipelined(items(), [lambda value: value], sink, queue_size=queue_size)
+
+    # Two queues of one item, one item in the stage and one being read
+    assert max(ahead) <= 2 * queue_size + 2
+
+
+def test_errors_stop_every_stage() -> None:
+    sunk: list[int] = []
+    bad_value = 3
+
+    def fail_on_bad_value(value: int) -> int:
+        if value == bad_value:
+            msg = "bad chunk"
+            raise ValueError(msg)
+        return value
+
+    with pytest.raises(ValueError, match="bad chunk"):
+        run_pipelined(iter(range(1000)), [fail_on_bad_value], sunk.append)
+
+    assert sunk == list(range(bad_value))
+    # The producer and stage threads have been joined
+    assert not [t for t in threading.enumerate() if t.name.startswith("etl-")]
+
+    def fail_in_sink(_: int) -> None:
+        msg = "disk full"
+        raise OSError(msg)
+
+    with pytest.raises(OSError, match="disk full"):
+        run_pipelined(iter(range(1000)), [], fail_in_sink)
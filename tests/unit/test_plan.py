@@ -0,0 +1,74 @@
+import pandas as pd
+import pytest
+
+from test_repo_trial_bt.plan import TransformPlan
+from test_repo_trial_bt.transform import (
+    DataTransformer,
+    apply_business_rules,
+    normalise_column_names,
+)
+
+
+def sales_data() -> pd.DataFrame:
+    return normalise_column_names(pd.read_csv("example_data.csv"))
+
+
+def test_plan_matches_eager_transforms() -> None:
+    data = sales_data()
+    filters = {"region": ["North", "South"], "year": 2024}
+    selected = ["region", "total_value", "year"]
+
+    plan = (
+        DataTransformer()
+        .lazy()
+        .clean()
+        .add_calculated_columns()
+        .filter({"quantity": {"min": 0}})
+        .filter(filters)
+        .select(selected)
+    )
+    output_data = plan.execute(data)
+    expected = DataTransformer().filter_data(apply_business_rules(data), filters)[selected]
+
+    pd.testing.assert_frame_equal(output_data, expected)
+
+
+def test_optimiser_reorders_fuses_and_prunes() -> None:
+    plan = (
+        TransformPlan()
+        .clean()
+        .add_calculated_columns()
+        .filter({"region": "North"})
+        .select(["region", "total_value"])
+    )
+
+    steps = [step["op"] for step in plan.optimise(sales_data().columns)]
+    derive = next(step for step in plan.optimise(sales_data().columns) if step["op"] == "derive")
+    project = next(step for step in plan.optimise(sales_data().columns) if step["op"] == "project")
+
+    assert steps == ["prefilter", "dedup", "project", "fill", "derive", "filter", "select"]
+    assert [d["name"] for d in derive["derivations"]] == ["total_value"]
+    assert project["columns"] == ["quantity", "price", "region"]
+    assert "filter before cleaning: region == 'North' (missing kept)" in plan.explain()
+
+
+def test_plan_keeps_missing_values_until_filled() -> None:
+    data = pd.DataFrame({"quantity": [4.0, None, -1.0, 2.0], "price": [1.0, 2.0, 3.0, 4.0]})
+
+    plan = (
+        TransformPlan().clean().derive("total", "quantity * price").filter({"quantity": {"min": 0}})
+    )
+    output_data = plan.execute(data)
+
+    # The missing quantity is filled with the median of every row (2.0), so
+    # the filter is only checked once it is filled
+    assert output_data["quantity"].tolist() == [4.0, 2.0, 2.0]
+    assert output_data["total"].tolist() == [4.0, 4.0, 8.0]
+    assert "prefilter" not in [step["op"] for step in plan.optimise(data.columns, missing=True)]
+
+
+def test_plan_rejects_steps_after_select() -> None:
+    plan = TransformPlan().select(["region"])
+
+    with pytest.raises(ValueError, match="last step"):
+        plan.filter({"region": "North"})
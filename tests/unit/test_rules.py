@@ -0,0 +1,113 @@
+import json
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from test_repo_trial_bt.plan import TransformPlan
+from test_repo_trial_bt.rules import RuleRegistry, default_rules
+from test_repo_trial_bt.transform import (
+    DataTransformer,
+    apply_business_rules,
+    normalise_column_names,
+)
+
+
+def sales_data() -> pd.DataFrame:
+    return normalise_column_names(pd.read_csv("example_data.csv"))
+
+
+def test_default_rules_match_eager_transforms() -> None:
+    data = sales_data()
+    cleaned = DataTransformer().clean_data(data)
+
+    expected = DataTransformer().add_calculated_columns(cleaned)
+    expected = expected[expected["quantity"] >= 0]
+    output_data = default_rules().apply(cleaned)
+
+    pd.testing.assert_frame_equal(output_data, expected)
+
+
+def test_rules_derive_lookup_and_filter() -> None:
+    data = pd.DataFrame(
+        {
+            "quantity": [1, 2, 3, 4],
+            "price": [10.0, 20.0, 30.0, 40.0],
+            "region": ["North", "South", "East", "Mars"],
+        }
+    )
+    registry = RuleRegistry(
+        [
+            {
+                "name": "total",
+                "type": "derive",
+                "column": "total",
+                "expression": "quantity * price",
+            },
+            {
+                "name": "nation",
+                "type": "lookup",
+                "column": "nation",
+                "source": "region",
+                "mapping": {"North": "Scotland", "South": "England"},
+                "default": "Unknown",
+            },
+            {"name": "small_orders", "type": "filter", "expression": "total < 100"},
+        ]
+    )
+    output_data = registry.apply(data)
+    expected_rows = 3
+
+    assert len(output_data) == expected_rows
+    assert output_data["total"].tolist() == [10.0, 40.0, 90.0]
+    assert output_data["nation"].tolist() == ["Scotland", "England", "Unknown"]
+    assert registry.input_columns() == ["quantity", "price", "region"]
+    assert set(registry.timings) == {"total", "nation", "small_orders"}
+    # The input frame is left unchanged
+    assert "total" not in data.columns
+
+
+def test_rules_derive_replaces_column_in_copy() -> None:
+    data = pd.DataFrame({"quantity": [1, 2], "price": [10, 20]})
+    registry = RuleRegistry(
+        [
+            {"name": "discount", "type": "derive", "column": "price", "expression": "price * 0.5"},
+            {
+                "name": "total",
+                "type": "derive",
+                "column": "total",
+                "expression": "quantity * price",
+            },
+        ]
+    )
+
+    output_data = registry.apply(data)
+
+    assert output_data["total"].tolist() == [5.0, 20.0]
+    assert data["price"].tolist() == [10, 20]
+    assert registry.plannable()
+    registry.register({"name": "cheap", "type": "filter", "expression": "price < 10"})
+    assert not registry.plannable()
+    with pytest.raises(ValueError, match="cannot run in an optimised plan"):
+        registry.to_plan(TransformPlan())
+
+
+def test_rules_from_config(tmp_path: Path) -> None:
+    config_path = tmp_path / "rules.json"
+    minimum = 10
+    rules = [{"name": "big", "type": "filter", "criteria": {"quantity": {"min": minimum}}}]
+    config_path.write_text(json.dumps({"rules": rules}))
+
+    registry = RuleRegistry.from_config(str(config_path))
+    output_data = apply_business_rules(sales_data(), rules=registry)
+
+    assert (output_data["quantity"] >= minimum).all()
+    assert "total_value" not in output_data.columns
+    assert registry.pushdown_predicates() == [{"column": "quantity", "op": ">=", "value": minimum}]
+
+
+def test_rules_reject_invalid_rules() -> None:
+    with pytest.raises(ValueError, match="Unknown rule type"):
+        RuleRegistry([{"name": "bad", "type": "pivot"}])
+    with pytest.raises(ValueError, match="missing expression"):
+        RuleRegistry([{"name": "bad", "type": "derive", "column": "total"}])
@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+
+from test_repo_trial_bt.stats import FillStatistics, QuantileSketch, SummaryStatistics
+from test_repo_trial_bt.transform import fill_values
+
+
+def survey_data() -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    rows = 1000
+    missing_share = 0.05
+    data = pd.DataFrame(
+        {
+            "count": rng.integers(0, 50, rows),
+            "score": rng.normal(size=rows).round(2),
+            "region": rng.choice(["North", "South", "East"], rows),
+        }
+    )
+    return data.mask(rng.random(data.shape) < missing_share)
+
+
+def test_chunked_statistics_match_in_memory_fill_values() -> None:
+    data = survey_data()
+    first, second = FillStatistics(), FillStatistics()
+
+    first.update(data.iloc[:300])
+    second.update(data.iloc[300:600])
+    second.update(data.iloc[600:])
+    first.merge(second)
+
+    assert first.fill_values() == fill_values(data)
+
+
+def test_sketch_median_within_stated_tolerance() -> None:
+    rng = np.random.default_rng(1)
+    values = rng.lognormal(size=200_000)
+    sketch, other = QuantileSketch(), QuantileSketch()
+
+    for chunk in np.array_split(values[:100_000], 10):
+        sketch.update(chunk)
+    other.update(values[100_000:])
+    sketch.merge(other)
+
+    tolerance = 1.7 / sketch.k
+    rank = (values < sketch.quantile(0.5)).mean()
+    assert sketch.count == len(values)
+    assert abs(rank - 0.5) <= tolerance
+    assert sum(len(level) for level in sketch.levels) < 4 * sketch.k
+
+
+def test_numeric_statistics_fall_back_to_sketch() -> None:
+    values = pd.DataFrame({"value": np.arange(10_001, dtype=float)})
+    statistics = FillStatistics(exact_limit=100)
+
+    statistics.update(values)
+
+    assert statistics.columns["value"]["counts"] is None
+    assert abs(statistics.fill_values()["value"] - 5000) <= 1.7 / statistics.k * len(values)
+
+
+def test_summary_statistics_match_describe() -> None:
+    data = survey_data()
+    whole, first, second = SummaryStatistics(), SummaryStatistics(), SummaryStatistics()
+
+    whole.update(data)
+    first.update(data.iloc[:400])
+    second.update(data.iloc[400:])
+    first.merge(second)
+
+    # Sums are accumulated in a different order to pandas, so compare closely
+    expected = data.describe()
+    for statistics in (whole, first):
+        summary = pd.DataFrame(statistics.summary()["numeric_summary"])
+        pd.testing.assert_frame_equal(summary, expected, rtol=1e-12)
+    assert whole.summary()["missing_values"] == data.isna().sum().to_dict()
+    assert first.summary()["data_types"] == data.dtypes.astype(str).to_dict()
@@ -1,6 +1,14 @@
+import numpy as np
 import pandas as pd
+import pytest
 
-from test_repo_trial_bt.transform import apply_business_rules
+from test_repo_trial_bt.extract import extract_from_source
+from test_repo_trial_bt.transform import (
+    DataTransformer,
+    apply_business_rules,
+    date_features,
+    normalise_column_names,
+)
 
 
 def test_transform_data() -> None:
@@ -27,3 +35,118 @@ def test_transform_data() -> None:
 
     # Assert that the output matches the expected output
     pd.testing.assert_frame_equal(output_data, expected_output)
+
+
+def test_transform_chain_leaves_input_unchanged() -> None:
+    input_data = pd.DataFrame(
+        {
+            "Quantity": [2, 2, -1, 3, None],
+            "Price": [1.5, 1.5, 2.0, 4.0, 1.0],
+            "Region": ["North", "North", None, "South", "South"],
+            "Date": ["2024-01-15", "2024-01-15", "2024-01-16", "2024-01-17", "2024-01-18"],
+        }
+    )
+    original = input_data.copy()
+
+    normalised = normalise_column_names(input_data)
+    output_data = DataTransformer().filter_data(
+        apply_business_rules(normalised), {"region": ["South"]}
+    )
+
+    pd.testing.assert_frame_equal(input_data, original)
+    assert np.shares_memory(normalised["price"].to_numpy(), input_data["Price"].to_numpy())
+    assert output_data.index.tolist() == [3, 4]
+    assert output_data["quantity"].tolist() == [3.0, 2.0]
+    assert output_data["total_value"].tolist() == [12.0, 2.0]
+    assert output_data["day_of_week"].tolist() == ["Wednesday", "Thursday"]
+
+
+def test_filter_data_combines_criteria() -> None:
+    input_data = pd.DataFrame({"value": [1, 5, 10, None], "label": ["a", "b", "a", "a"]})
+
+    output_data = DataTransformer().filter_data(
+        input_data, {"value": {"min": 2, "max": 10}, "label": "a", "missing": 1}
+    )
+
+    pd.testing.assert_frame_equal(output_data, input_data.iloc[[2]])
+
+
+@pytest.mark.parametrize("use_eval", [False, True])
+def test_filter_data_matches_sequential_filtering(use_eval: bool) -> None:
+    data = extract_from_source("example_data.csv")
+    data["region"] = data["region"].astype("category")
+    low, high = 1, 5
+    filters = {
+        "quantity": {"min": low, "max": high},
+        "region": ["North", "East"],
+        "category": "Electronics",
+    }
+    expected = data[(data["quantity"] >= low) & (data["quantity"] <= high)]
+    expected = expected[expected["region"].isin(["North", "East"])]
+    expected = expected[expected["category"] == "Electronics"]
+
+    transformer = DataTransformer()
+    output_data = transformer.filter_data(data, filters, use_eval=use_eval)
+
+    pd.testing.assert_frame_equal(output_data, expected)
+    assert len(transformer.filter_stats) == len(filters) + 1
+    if not use_eval:
+        # The most selective predicate runs first, on every row
+        assert transformer.filter_stats[0]["op"] == "=="
+        assert transformer.filter_stats[0]["evaluated"] == len(data)
+        assert transformer.filter_stats[-1]["kept"] == len(expected)
+        assert "kept" in transformer.get_transformation_summary()[0]
+
+
+def test_date_features_match_row_wise_derivation() -> None:
+    dates = pd.Series(["2024/01/15", "2024/01/16", None, "2024/01/15"], index=[5, 6, 7, 8])
+
+    features, date_format = date_features(dates)
+    parsed = pd.to_datetime(dates, format="%Y/%m/%d")
+
+    assert date_format == "%Y/%m/%d"
+    pd.testing.assert_series_equal(features["date"], parsed, check_names=False)
+    pd.testing.assert_series_equal(features["year"], parsed.dt.year, check_names=False)
+    assert features["day_of_week"].dtype == "category"
+    assert features["day_of_week"].tolist()[:2] == ["Monday", "Tuesday"]
+    assert pd.isna(features["day_of_week"].iloc[2])
+
+
+def test_add_calculated_columns_reuses_date_format() -> None:
+    transformer = DataTransformer()
+
+    transformer.add_calculated_columns(pd.DataFrame({"date": ["2024-01-15"]}))
+    output_data = transformer.add_calculated_columns(pd.DataFrame({"date": ["2024-02-01"]}))
+
+    assert transformer.date_format == "%Y-%m-%d"
+    assert output_data["month"].tolist() == [2]
+
+
+def test_fill_missing_values_covers_numeric_dtypes() -> None:
+    data = pd.DataFrame(
+        {
+            "single": pd.Series([1.0, None, 4.0], dtype="float32"),
+            "nullable": pd.Series([1, None, 4], dtype="Int64"),
+            "flag": pd.Series([True, None, True], dtype="boolean"),
+            "label": ["a", None, "a"],
+        }
+    )
+
+    output_data = DataTransformer().fill_missing_values(data)
+
+    pd.testing.assert_series_equal(output_data.dtypes, data.dtypes)
+    assert output_data.iloc[1].tolist() == [2.5, 2, True, "a"]
+
+
+def test_fill_missing_values_in_parallel_blocks() -> None:
+    rng = np.random.default_rng(0)
+    missing_share = 0.1
+    values = rng.normal(size=(50, 150))
+    values[rng.random(values.shape) < missing_share] = np.nan
+    data = pd.DataFrame(values).add_prefix("column_")
+
+    serial = DataTransformer().fill_missing_values(data)
+    parallel = DataTransformer(max_workers=4).fill_missing_values(data)
+
+    pd.testing.assert_frame_equal(parallel, serial)
+    assert not parallel.isna().any().any()